@@ -0,0 +1,202 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from src.entity.config_entity import BatchInferenceConfig, ServingConfig
+from src.components.model_serving import DenoisingService
+from src.utils.common import save_json
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def read_image(path: Path) -> np.ndarray:
+    """Read an image file as RGB uint8 (None if it cannot be decoded)."""
+    image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    return None if image is None else cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def write_image(path: Path, image: np.ndarray) -> None:
+    """
+    Write an RGB uint8 image atomically.
+
+    The image is written to a temporary file renamed into place, so an interrupted run
+    never leaves a truncated output that a resumed run would take as done.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.stem}.partial{path.suffix}")
+    if not cv2.imwrite(str(partial), cv2.cvtColor(image, cv2.COLOR_RGB2BGR)):
+        raise ValueError(f"Failed to write {path}.")
+    os.replace(partial, path)
+
+
+@dataclass
+class BatchInference:
+    """
+    Class for denoising every image of a folder with the trained model.
+
+    The three stages overlap: images are decoded by a thread pool ahead of the model (at
+    most `queue_size` in flight), the main thread groups decoded images of the same model
+    input shape into batches of `batch_size` and runs the model, and a second thread pool
+    postprocesses, encodes and writes the outputs while the next batch runs. OpenCV and
+    TensorFlow release the GIL, so the threads run in parallel with the inference.
+
+    Preprocessing is the one of the serving API (`DenoisingService`): native resolution
+    with a fully-convolutional model, tiled inference for large images.
+
+    Outputs mirror the input folder structure; images whose output already exists are
+    skipped, so an interrupted run can be resumed.
+
+    Attributes:
+        config (BatchInferenceConfig): Configuration of the batch inference.
+        serving_config (ServingConfig): Configuration of the model and its preprocessing.
+    """
+
+    config: BatchInferenceConfig
+    serving_config: ServingConfig
+
+    def list_images(self, input_dir: Path, output_dir: Path, overwrite: bool = False) -> tuple:
+        """
+        List the images to denoise and their output paths.
+
+        The output of `img.jpg` is `img<output_extension>`; images that would share an
+        output (e.g. `img.jpg` and `img.png` of the same folder) keep their extension in
+        the name instead (`img.jpg.png`, `img.png.png`), so none overwrites another.
+
+        Returns:
+            tuple: ([(input_path, output_path), ...] still to do, number of skipped images).
+
+        Raises:
+            ValueError: If two images still share an output.
+        """
+        extensions = {extension.lower() for extension in self.config.extensions}
+        images = [path for path in sorted(input_dir.rglob("*"))
+                  if path.is_file() and path.suffix.lower() in extensions]
+        outputs = [(output_dir / path.relative_to(input_dir)).with_suffix(self.config.output_extension)
+                   for path in images]
+        counts = Counter(outputs)
+        outputs = [output_path.with_name(path.name + self.config.output_extension) if counts[output_path] > 1
+                   else output_path for path, output_path in zip(images, outputs)]
+        collisions = sorted(str(output_path) for output_path, count in Counter(outputs).items() if count > 1)
+        if collisions:
+            raise ValueError(f"Several images would be written to the same output: {collisions}")
+        jobs, skipped = [], 0
+        for path, output_path in zip(images, outputs):
+            if output_path.exists() and not overwrite:
+                skipped += 1
+                continue
+            jobs.append((path, output_path))
+        return jobs, skipped
+
+    def run(self, input_dir: Path, output_dir: Path, overwrite: bool = False) -> dict:
+        """
+        Denoise every image of `input_dir` into `output_dir`.
+
+        Args:
+            input_dir (Path): Folder of noisy images (searched recursively).
+            output_dir (Path): Folder the denoised images are written to.
+            overwrite (bool): Denoise images whose output already exists.
+
+        Returns:
+            dict: Report with the number of processed/skipped/failed images and the
+            end-to-end throughput.
+
+        Raises:
+            CustomException: If any error occurs outside the per-image processing.
+        """
+        try:
+            input_dir, output_dir = Path(input_dir), Path(output_dir)
+            jobs, skipped = self.list_images(input_dir, output_dir, overwrite)
+            logging.info(f"{len(jobs)} images to denoise in {input_dir} ({skipped} already done).")
+
+            service = DenoisingService(self.serving_config)
+            service.load()
+
+            start = time.perf_counter()
+            failed = []
+            writes = deque()
+            pending = {}
+
+            def wait_writes(limit: int) -> None:
+                while len(writes) > limit:
+                    path, future = writes.popleft()
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"Failed to write {path}: {e}")
+                        failed.append(str(path))
+
+            def write(output, shape, output_path) -> None:
+                write_image(output_path, service.postprocess(output, shape))
+
+            def run_batch(group: list) -> None:
+                outputs = service.predict(np.stack([model_input for model_input, _, _ in group]))
+                for output, (_, shape, output_path) in zip(outputs, group):
+                    writes.append((output_path, write_pool.submit(write, output, shape, output_path)))
+                wait_writes(self.config.queue_size)
+
+            with ThreadPoolExecutor(self.config.decode_workers, thread_name_prefix="decode") as decode_pool, \
+                    ThreadPoolExecutor(self.config.write_workers, thread_name_prefix="write") as write_pool:
+                decodes = deque()
+                jobs_iter = iter(jobs)
+
+                def fill_decodes() -> None:
+                    for input_path, output_path in jobs_iter:
+                        decodes.append((input_path, output_path, decode_pool.submit(read_image, input_path)))
+                        if len(decodes) >= self.config.queue_size:
+                            break
+
+                fill_decodes()
+                while decodes:
+                    input_path, output_path, future = decodes.popleft()
+                    fill_decodes()
+                    image = future.result()
+                    if image is None:
+                        logging.error(f"Cannot decode {input_path}, skipped.")
+                        failed.append(str(input_path))
+                        continue
+
+                    if service.is_tiled(image):
+                        # Large images are already batched tile by tile.
+                        writes.append((output_path, write_pool.submit(write_image, output_path, service.denoise(image))))
+                        wait_writes(self.config.queue_size)
+                        continue
+
+                    model_input = service.preprocess(image)
+                    group = pending.setdefault(model_input.shape, [])
+                    group.append((model_input, image.shape, output_path))
+                    if len(group) == self.config.batch_size:
+                        run_batch(pending.pop(model_input.shape))
+                    elif sum(len(group) for group in pending.values()) >= self.config.queue_size:
+                        # Many distinct sizes: bound the memory by running the largest partial batch.
+                        run_batch(pending.pop(max(pending, key=lambda shape: len(pending[shape]))))
+
+                for group in pending.values():
+                    run_batch(group)
+                wait_writes(0)
+
+            elapsed = time.perf_counter() - start
+            processed = len(jobs) - len(failed)
+            report = {
+                "input_dir": str(input_dir),
+                "output_dir": str(output_dir),
+                "processed": processed,
+                "skipped": skipped,
+                "failed": failed,
+                "seconds": elapsed,
+                "images_per_second": processed / elapsed if elapsed > 0 else 0.0,
+                "batch_size": self.config.batch_size,
+                "decode_workers": self.config.decode_workers,
+                "write_workers": self.config.write_workers,
+            }
+            save_json(path=Path(self.config.report_path), data=report)
+            logging.info(f"Denoised {processed} images in {elapsed:.1f}s ({report['images_per_second']:.1f} images/s), "
+                         f"{len(failed)} failed, {skipped} skipped.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the batch inference: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from glob import glob
+from pathlib import Path
+import tensorflow as tf
+from src.entity.config_entity import CheckpointEvaluationConfig, ModelEvaluationConfig
+from src.components.model_evaluation import ModelEvaluation
+from src.utils.common import load_model, read_numpy_file, save_json
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+LEADERBOARD_COLUMNS = ("rank", "model", "psnr", "ssim", "mse", "params", "seconds")
+
+
+def evaluate_checkpoint(evaluation_config: ModelEvaluationConfig, test_data_path: str, x_test_noisy_path: str,
+                        threads: int) -> dict:
+    """
+    Process-pool entry point: evaluate one model artifact.
+
+    The test arrays are memory-mapped, so every worker reads the same page-cache copy
+    instead of loading its own. The evaluation is the single-pass `ModelEvaluation` one,
+    without MLflow logging nor figures.
+
+    Args:
+        evaluation_config (ModelEvaluationConfig): Configuration of the evaluation, with the
+            model and report paths of this checkpoint (its arrays are not used).
+        test_data_path (str): Clean test images (.npy).
+        x_test_noisy_path (str): Noisy test images (.npy).
+        threads (int): Intra-op threads given to TensorFlow in this worker.
+
+    Returns:
+        dict: Summary of the evaluation (model, MSE/PSNR/SSIM, params, time).
+    """
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    start = time.perf_counter()
+    config = replace(
+        evaluation_config,
+        X_test=read_numpy_file(Path(test_data_path), mmap_mode="r"),
+        x_test_noisy=read_numpy_file(Path(x_test_noisy_path), mmap_mode="r")
+    )
+    model = load_model(path=Path(config.path_of_model), compile=False)
+    report = ModelEvaluation(config).evaluate_model(model, config.X_test, config.x_test_noisy)
+    save_json(path=Path(config.evaluation_report_path), data=report)
+    return {
+        "model": str(config.path_of_model),
+        "psnr": report["psnr"],
+        "ssim": report["ssim"],
+        "mse": report["mse"],
+        "params": int(model.count_params()),
+        "seconds": time.perf_counter() - start,
+        "report_path": str(config.evaluation_report_path),
+    }
+
+
+def format_leaderboard(rows: list) -> str:
+    """Markdown table of the leaderboard rows."""
+    lines = ["| " + " | ".join(LEADERBOARD_COLUMNS) + " |", "|" + "---|" * len(LEADERBOARD_COLUMNS)]
+    for row in rows:
+        cells = [f"{row[column]:.6f}" if column == "mse" else f"{row[column]:.4f}" if column == "ssim"
+                 else f"{row[column]:.2f}" if isinstance(row[column], float) else str(row[column])
+                 for column in LEADERBOARD_COLUMNS]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class CheckpointEvaluation:
+    """
+    Class for evaluating many model artifacts (e.g. the checkpoints of a sweep) at once.
+
+    The models are evaluated concurrently in a pool of spawned processes, each with its
+    share of the CPU cores; TensorFlow is imported once per worker rather than once per
+    model, and the test set is a single memory-mapped copy shared by all workers. Every
+    model gets its own evaluation report; the leaderboard ranks them by PSNR.
+
+    Attributes:
+        config (CheckpointEvaluationConfig): Configuration of the checkpoint evaluation.
+        evaluation_config (ModelEvaluationConfig): Configuration of the evaluation itself.
+    """
+
+    config: CheckpointEvaluationConfig
+    evaluation_config: ModelEvaluationConfig
+
+    def list_models(self, patterns: list = None) -> list:
+        """Model artifacts matching the glob patterns (default: `model_patterns`), in order."""
+        models = []
+        for pattern in patterns or self.config.model_patterns:
+            # glob() rather than Path().glob(), which rejects absolute patterns.
+            matches = sorted(Path(path) for path in glob(pattern, recursive=True)) if any(char in pattern for char in "*?[") \
+                else [Path(pattern)]
+            models.extend(path for path in matches if path.exists() and path not in models)
+        return models
+
+    def run(self, model_paths: list = None) -> list:
+        """
+        Evaluate the model artifacts and write the leaderboard.
+
+        Args:
+            model_paths (list, optional): Paths or glob patterns of the models
+                (.keras files or inference artifact directories); default `model_patterns`.
+
+        Returns:
+            list: Leaderboard rows, best PSNR first.
+
+        Raises:
+            CustomException: If no model is found or an evaluation fails.
+        """
+        try:
+            models = self.list_models([str(path) for path in model_paths] if model_paths else None)
+            if not models:
+                raise ValueError("No model artifact to evaluate.")
+            num_workers = min(len(models), self.config.max_workers or (os.cpu_count() or 1))
+            threads = max(1, (os.cpu_count() or 1) // num_workers)
+            logging.info(f"Evaluating {len(models)} models with {num_workers} workers ({threads} threads each).")
+
+            # The arrays are re-opened by the workers: a pickled memmap would be copied.
+            base_config = replace(self.evaluation_config, X_test=None, x_test_noisy=None)
+            rows = []
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp.get_context("spawn")) as pool:
+                futures = {}
+                for i, model_path in enumerate(models):
+                    report_path = Path(self.config.root_dir) / f"{i:03d}_{model_path.parent.name}_{model_path.stem}.json"
+                    config = replace(base_config, path_of_model=model_path, evaluation_report_path=report_path)
+                    futures[pool.submit(evaluate_checkpoint, config, str(self.config.test_data_path),
+                                        str(self.config.x_test_noisy_path), threads)] = model_path
+                for future in as_completed(futures):
+                    rows.append(future.result())
+                    logging.info(f"{futures[future]}: PSNR {rows[-1]['psnr']:.2f} dB, SSIM {rows[-1]['ssim']:.4f}.")
+
+            rows.sort(key=lambda row: row["psnr"], reverse=True)
+            for rank, row in enumerate(rows, start=1):
+                row["rank"] = rank
+            save_json(path=Path(self.config.leaderboard_path), data={"leaderboard": rows})
+            table = format_leaderboard(rows)
+            Path(self.config.leaderboard_path).with_suffix(".md").write_text(table)
+            logging.info(f"Leaderboard saved at {self.config.leaderboard_path}:\n{table}")
+            return rows
+        except Exception as e:
+            logging.error(f"Error occurred during the checkpoint evaluation: {e}")
+            raise CustomException(e, sys)
@@ -46,13 +46,16 @@ class DataIngestion:
             logging.error(f"An error occurred while saving {data_desc}: {e}")
             raise CustomException(e, sys)
 
-    def initiate_data_ingestion(self) -> None:
+    def initiate_data_ingestion(self) -> tuple:
         """
         Executes the data ingestion process.
 
         This method reads image data from the specified directory, splits it into
         training and testing datasets, and saves the resulting datasets to disk.
 
+        Returns:
+            tuple: The training and testing images, for a caller that hands them on in memory.
+
         Raises:
             CustomException: If any errors occur during the data ingestion process.
         """
@@ -75,6 +78,7 @@ class DataIngestion:
             self.save_data(self.config.test_data_path, test_images, "testing image data")
 
             logging.info("Ingestion of the data is completed")
+            return train_images, test_images
 
         except Exception as e:
             logging.error(f"An error occurred during data ingestion: {e}")
@@ -9,6 +9,69 @@ from src.utils.logger import logging
 from src.utils.exception import CustomException
 from dataclasses import dataclass
 from pathlib import Path
+
+
+def add_gaussian_noise(data: np.ndarray, noise_factor: float, seed: int = None) -> np.ndarray:
+    """
+    Add Gaussian noise to images in [0, 1] and clip the result back to [0, 1].
+
+    Args:
+        data (np.ndarray): Clean images scaled to [0, 1].
+        noise_factor (float): Standard deviation of the noise.
+        seed (int, optional): Seed of the noise generator.
+
+    Returns:
+        np.ndarray: Noisy float32 images.
+    """
+    rng = np.random.default_rng(seed)
+    noisy = data + noise_factor * rng.standard_normal(size=data.shape, dtype=np.float32)
+    return np.clip(noisy, 0.0, 1.0).astype(np.float32)
+
+
+NOISE_TYPES = ("gaussian", "salt_and_pepper", "poisson", "speckle")
+
+
+def add_noise(data: np.ndarray, noise_type: str, level: float, seed: int = None) -> np.ndarray:
+    """
+    Corrupt images in [0, 1] with one of `NOISE_TYPES` and clip the result back to [0, 1].
+
+    `level` is the strength of the noise:
+        - gaussian: standard deviation of the additive noise (as `add_gaussian_noise`);
+        - salt_and_pepper: fraction of the pixels set to black or white;
+        - poisson: shot noise whose standard deviation is `level` at intensity 1
+          (photon count 1 / level**2 at full white);
+        - speckle: standard deviation of the multiplicative noise (x + x * level * n).
+
+    Args:
+        data (np.ndarray): Clean images scaled to [0, 1], (..., height, width, channels).
+        noise_type (str): One of `NOISE_TYPES`.
+        level (float): Strength of the noise.
+        seed (int or tuple, optional): Seed of the noise generator.
+
+    Returns:
+        np.ndarray: Noisy float32 images.
+
+    Raises:
+        ValueError: If the noise type is unknown.
+    """
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+    if noise_type == "gaussian":
+        noisy = data + level * rng.standard_normal(size=data.shape, dtype=np.float32)
+    elif noise_type == "salt_and_pepper":
+        noisy = data.copy()
+        corrupted = rng.random(size=data.shape[:-1], dtype=np.float32) < level
+        noisy[corrupted] = rng.integers(0, 2, size=(int(corrupted.sum()), 1)).astype(np.float32)
+    elif noise_type == "poisson":
+        peak = 1.0 / max(level, 1e-6) ** 2
+        noisy = rng.poisson(data * peak).astype(np.float32) / peak
+    elif noise_type == "speckle":
+        noisy = data + data * level * rng.standard_normal(size=data.shape, dtype=np.float32)
+    else:
+        raise ValueError(f"Unknown noise type '{noise_type}', expected one of {NOISE_TYPES}.")
+    return np.clip(noisy, 0.0, 1.0).astype(np.float32)
+
+
 @dataclass
 class DataPreprocessing:
     """
@@ -19,8 +82,14 @@ class DataPreprocessing:
 
     Attributes:
         config (DataPreprocessingConfig): Configuration for the data preprocessing process
+        train_data (np.ndarray, optional): Training images already in memory (read from
+            `train_data_path` otherwise).
+        test_data (np.ndarray, optional): Testing images already in memory (read from
+            `test_data_path` otherwise).
     """
     config: DataPreprocessingConfig
+    train_data: np.ndarray = None
+    test_data: np.ndarray = None
  
 
     def __post_init__(self):
@@ -30,8 +99,10 @@ class DataPreprocessing:
         This method is called automatically after the class is initialized and
         it triggers the data normalization and noise addition processes.
         """
-        self.train_data =read_numpy_file(self.config.train_data_path)
-        self.test_data=read_numpy_file(self.config.test_data_path)
+        if self.train_data is None:
+            self.train_data = read_numpy_file(self.config.train_data_path)
+        if self.test_data is None:
+            self.test_data = read_numpy_file(self.config.test_data_path)
 
         self._normalize_data()
         self._add_noise()
@@ -41,18 +112,23 @@ class DataPreprocessing:
         ormalize the image data by scaling pixel values to the range [0, 1].
 
         This method converts the image data from integer format to float32, 
-        and scales the pixel values to be within the range [0, 1].
+        and scales the pixel values to be within the range [0, 1]. The ingested
+        arrays are left untouched: the normalized ones get their own files.
 
         Raises:
             CustomException: If any errors occur during the normalization process.
         """
         try:
             logging.info("Normalizing the data by scaling it to the range [0, 1].")
+            for data in (self.train_data, self.test_data):
+                if np.issubdtype(data.dtype, np.floating):
+                    raise ValueError(f"Expected the ingested integer images, got {data.dtype} data (already normalized?): "
+                                     f"re-run the data ingestion.")
             self.train_data = self.train_data.astype("float32") / 255.0
             self.test_data = self.test_data.astype("float32") / 255.0
             logging.info(f"Data normalization completed. Training data shape: {self.train_data.shape}, Testing data shape: {self.test_data.shape}")
-            self.save_data(self.config.train_data_path, self.train_data, "training image with normalization")
-            self.save_data(self.config.test_data_path, self.test_data, "testing image data with normalization")
+            self.save_data(self.config.train_normalized_path, self.train_data, "training image with normalization")
+            self.save_data(self.config.test_normalized_path, self.test_data, "testing image data with normalization")
         except Exception as e:
             logging.error(f"An error occurred while normalizing the data: {e}")
             raise CustomException(e, sys)
@@ -73,8 +149,9 @@ class DataPreprocessing:
             x_train_noisy = self.train_data + self.config.noise_factor * tf.random.normal(shape=self.train_data.shape)
             x_test_noisy = self.test_data + self.config.noise_factor * tf.random.normal(shape=self.test_data.shape)
             # Clipping to maintain pixel values in the range [0, 1]
-            x_train_noisy = tf.clip_by_value(x_train_noisy, clip_value_min=0.0, clip_value_max=1.0)
-            x_test_noisy = tf.clip_by_value(x_test_noisy, clip_value_min=0.0, clip_value_max=1.0)
+            x_train_noisy = tf.clip_by_value(x_train_noisy, clip_value_min=0.0, clip_value_max=1.0).numpy()
+            x_test_noisy = tf.clip_by_value(x_test_noisy, clip_value_min=0.0, clip_value_max=1.0).numpy()
+            self.x_train_noisy, self.x_test_noisy = x_train_noisy, x_test_noisy
 
 
             
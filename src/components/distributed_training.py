@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import time
+import multiprocessing as mp
+import tensorflow as tf
+from dataclasses import dataclass
+from src.config.configurtion import Configuration
+from src.components.model_training import ModelTraining
+from src.components.model_callbacks import ModelCallback
+from src.entity.config_entity import DistributedTrainingConfig
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def build_tf_config(num_workers: int, worker_index: int, base_port: int) -> dict:
+    """
+    Build the TF_CONFIG of one worker of a local (localhost) cluster.
+
+    Args:
+        num_workers (int): Number of workers in the cluster.
+        worker_index (int): Index of the worker the TF_CONFIG is built for (0 is the chief).
+        base_port (int): Port of worker 0; worker i listens on base_port + i.
+
+    Returns:
+        dict: TF_CONFIG content, to be serialized with json.dumps.
+    """
+    return {
+        "cluster": {"worker": [f"localhost:{base_port + i}" for i in range(num_workers)]},
+        "task": {"type": "worker", "index": worker_index},
+    }
+
+
+def run_worker(config: DistributedTrainingConfig, worker_index: int, num_workers: int,
+               num_epochs: int = None, save_model: bool = True, report_queue=None) -> None:
+    """
+    Entry point of one training worker process.
+
+    Sets TF_CONFIG and the per-worker thread budget before TensorFlow starts its runtime,
+    reads the datasets memory-mapped (all workers share the page cache) and trains its shard.
+    When the model is saved, the chief also exports the inference artifact, as the
+    single-process training stage does.
+
+    Args:
+        config (DistributedTrainingConfig): Configuration of the distributed run.
+        worker_index (int): Index of this worker (0 is the chief).
+        num_workers (int): Number of workers in the cluster.
+        num_epochs (int, optional): Overrides `num_epochs` from params.yaml.
+        save_model (bool): Save the trained model at the end of training.
+        report_queue (multiprocessing.Queue, optional): Queue receiving the chief's report.
+    """
+    os.environ["TF_CONFIG"] = json.dumps(build_tf_config(num_workers, worker_index, config.base_port))
+    threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(2)
+
+    configuration = Configuration(config.config_file_path, config.params_file_path)
+    training_config = configuration.get_training_config(mmap_mode="r")
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+
+    model_training = ModelTraining(training_config)
+    callbacks_list = ModelCallback(configuration.get_callback_config())._get_callbacks()
+    report = model_training.train_distributed(strategy, callbacks_list, num_epochs=num_epochs, save_model=save_model)
+    if save_model and worker_index == 0:
+        # The evaluation stages load the inference artifact, not the .keras model.
+        model_training.export_inference_model()
+    if report_queue is not None and worker_index == 0:
+        report_queue.put(report)
+
+
+@dataclass
+class DistributedTraining:
+    """
+    Class for launching multi-worker data-parallel training on a single host.
+
+    Each worker is a separate Python process (spawned, never forked, since TensorFlow is
+    not fork-safe) with its own TF_CONFIG; the processes form a localhost cluster driven by
+    MultiWorkerMirroredStrategy. The intra-op thread pool is split evenly between workers.
+
+    Attributes:
+        config (DistributedTrainingConfig): Configuration of the distributed run.
+    """
+
+    config: DistributedTrainingConfig
+
+    def launch(self, num_workers: int = None, num_epochs: int = None, save_model: bool = True) -> dict:
+        """
+        Start the worker processes, wait for them and return the chief's report.
+
+        Args:
+            num_workers (int, optional): Overrides `num_workers` from the configuration.
+            num_epochs (int, optional): Overrides `num_epochs` from params.yaml.
+            save_model (bool): Save the trained model at the end of training.
+
+        Returns:
+            dict: Timing and throughput reported by the chief worker.
+
+        Raises:
+            CustomException: If a worker fails or does not report.
+        """
+        try:
+            num_workers = num_workers or self.config.num_workers
+            logging.info(f"Launching {num_workers} training workers on localhost:{self.config.base_port}+.")
+            context = mp.get_context("spawn")
+            report_queue = context.Queue()
+            processes = [
+                context.Process(
+                    target=run_worker,
+                    args=(self.config, index, num_workers, num_epochs, save_model, report_queue),
+                    name=f"training-worker-{index}"
+                )
+                for index in range(num_workers)
+            ]
+            start = time.perf_counter()
+            for process in processes:
+                process.start()
+            self._wait(processes)
+            wall_seconds = time.perf_counter() - start
+
+            report = report_queue.get(timeout=60)
+            report["wall_seconds"] = wall_seconds
+            logging.info(f"Distributed training with {num_workers} workers completed in {wall_seconds:.1f}s.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during distributed training: {e}")
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _wait(processes: list) -> None:
+        """
+        Wait for all workers; if one fails, kill the others instead of letting them
+        block forever on a collective operation. SIGKILL is used because the strategy
+        installs a preemption handler that swallows SIGTERM.
+        """
+        while any(p.is_alive() for p in processes):
+            failed = [p for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                for p in processes:
+                    if p.is_alive():
+                        p.kill()
+                break
+            time.sleep(1)
+        for p in processes:
+            p.join()
+        failed = [p.name for p in processes if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Training workers failed: {failed}")
+
+    def benchmark_scaling(self) -> list:
+        """
+        Train for `benchmark_epochs` with each worker count of `benchmark_workers` and report
+        throughput and speedup relative to the smallest worker count.
+
+        Returns:
+            list: One result dict per worker count, also saved to `scaling_report_path`.
+
+        Raises:
+            CustomException: If any benchmark run fails.
+        """
+        try:
+            results = []
+            for num_workers in self.config.benchmark_workers:
+                report = self.launch(num_workers=num_workers, num_epochs=self.config.benchmark_epochs, save_model=False)
+                results.append(report)
+                logging.info(f"{num_workers} workers: {report['samples_per_second']:.1f} samples/s.")
+
+            baseline = results[0]["samples_per_second"] / results[0]["num_workers"]
+            for result in results:
+                result["speedup"] = result["samples_per_second"] / results[0]["samples_per_second"]
+                result["scaling_efficiency"] = result["samples_per_second"] / (baseline * result["num_workers"])
+
+            with open(self.config.scaling_report_path, "w") as f:
+                json.dump(results, f, indent=4)
+            logging.info(f"Scaling benchmark saved at {self.config.scaling_report_path}.")
+            return results
+        except Exception as e:
+            logging.error(f"Error occurred during the scaling benchmark: {e}")
+            raise CustomException(e, sys)
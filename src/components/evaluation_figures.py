@@ -0,0 +1,86 @@
+import math
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+
+
+SAMPLE_ROWS = (("noisy", "Noisy Input"), ("denoised", "Reconstruction"), ("clean", "Original"))
+
+
+def init_worker() -> None:
+    """Pool initializer: select the non-interactive backend in the worker only."""
+    matplotlib.use("Agg")
+
+
+def warm_up() -> None:
+    """
+    No-op task: starts a worker before the figures are ready.
+
+    This module only needs numpy and matplotlib, but a spawned worker also re-imports the
+    parent's `__main__` (the stage script or the pipeline runner, which import TensorFlow),
+    i.e. a few seconds per worker; starting the workers early overlaps this with the
+    evaluation.
+    """
+
+
+def render_samples(entries: list, path: str, columns: int = 8) -> str:
+    """
+    Render a grid of selected test images and save it as PNG.
+
+    Every image is a column of three panels (noisy input, reconstruction, original); the
+    images wrap onto a new block of three rows every `columns` images, so large selections
+    stay readable.
+
+    Args:
+        entries (list): {"index", "mse", "noisy", "denoised", "clean"} dicts (see `SampleSelector`).
+        path (str): Output PNG.
+        columns (int): Images per block.
+
+    Returns:
+        str: The output path.
+    """
+    columns = max(1, min(columns, len(entries)))
+    blocks = math.ceil(len(entries) / columns)
+    fig = Figure(figsize=(2.5 * columns, 2.5 * len(SAMPLE_ROWS) * blocks))
+    axes = fig.subplots(len(SAMPLE_ROWS) * blocks, columns, squeeze=False)
+    for ax in axes.flat:
+        ax.axis("off")
+    for i, entry in enumerate(entries):
+        block, column = divmod(i, columns)
+        for row, (key, title) in enumerate(SAMPLE_ROWS):
+            ax = axes[block * len(SAMPLE_ROWS) + row, column]
+            image = np.clip(entry[key], 0.0, 1.0)
+            if image.ndim == 3 and image.shape[-1] == 1:
+                # Handle grayscale images
+                ax.imshow(image[..., 0], cmap="gray")
+            else:
+                ax.imshow(image)
+            ax.set_title(f"{title}\n#{entry['index']} MSE {entry['mse']:.4f}" if row == 1 else title, fontsize=8)
+    fig.tight_layout()
+    fig.savefig(path)
+    return str(path)
+
+
+def render_histograms(histograms: dict, bin_edges: np.ndarray, path: str) -> str:
+    """
+    Render the histograms of the per-image PSNR and SSIM and of the pixel absolute error.
+
+    Args:
+        histograms (dict): {"psnr", "ssim"} per-image values and "error_counts" per bin.
+        bin_edges (np.ndarray): Edges of the absolute-error bins.
+        path (str): Output PNG.
+
+    Returns:
+        str: The output path.
+    """
+    fig = Figure(figsize=(15, 4))
+    axes = fig.subplots(1, 3)
+    axes[0].hist(histograms["psnr"], bins=30)
+    axes[0].set_title("PSNR per image (dB)")
+    axes[1].hist(histograms["ssim"], bins=30)
+    axes[1].set_title("SSIM per image")
+    axes[2].bar(bin_edges[:-1], histograms["error_counts"], width=np.diff(bin_edges), align="edge", log=True)
+    axes[2].set_title("Pixel absolute error")
+    fig.tight_layout()
+    fig.savefig(path)
+    return str(path)
@@ -0,0 +1,99 @@
+import tensorflow as tf
+
+
+class GradientAccumulationModel(tf.keras.Model):
+    """
+    Keras model wrapper that accumulates gradients over several micro-batches.
+
+    Each call to `train_step` computes the gradients of one micro-batch and adds them to
+    non-trainable accumulators; the optimizer is only applied every `accumulation_steps`
+    micro-batches, with the averaged gradients. Training with `batch_size=b` therefore
+    behaves like training with an effective batch of `b * accumulation_steps` while only
+    holding the activations of `b` images in memory.
+
+    When the number of steps per epoch is not a multiple of `accumulation_steps`, the
+    leftover micro-batches are applied as a partial update (their mean gradient) at the
+    end of the epoch, before validation, instead of leaking into the next epoch.
+
+    The wrapped model is the one that must be saved: the wrapper only adds the
+    accumulators and the custom train step.
+
+    Attributes:
+        inner_model (tf.keras.Model): The model being trained.
+        accumulation_steps (int): Number of micro-batches per optimizer update.
+    """
+
+    def __init__(self, inner_model: tf.keras.Model, accumulation_steps: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.inner_model = inner_model
+        self.accumulation_steps = accumulation_steps
+        self.accumulated_gradients = [
+            self.add_weight(shape=variable.shape, initializer="zeros", trainable=False,
+                            name=f"accumulated_gradient_{i}")
+            for i, variable in enumerate(inner_model.trainable_variables)
+        ]
+        self.micro_step = self.add_weight(shape=(), dtype="int64", initializer="zeros",
+                                          trainable=False, name="micro_step")
+
+    def call(self, inputs, training=False):
+        return self.inner_model(inputs, training=training)
+
+    def _apply_accumulated_gradients(self) -> None:
+        """Apply the averaged gradients and reset the accumulators."""
+        self.optimizer.apply_gradients(zip(
+            [tf.convert_to_tensor(gradient) for gradient in self.accumulated_gradients],
+            self.inner_model.trainable_variables
+        ))
+        for gradient in self.accumulated_gradients:
+            gradient.assign(tf.zeros_like(gradient))
+
+    def apply_pending_gradients(self) -> None:
+        """Apply the mean gradient of the micro-batches accumulated since the last update."""
+        pending = int(self.micro_step.numpy()) % self.accumulation_steps
+        if pending:
+            for gradient in self.accumulated_gradients:
+                gradient.assign(gradient * (self.accumulation_steps / pending))
+            self._apply_accumulated_gradients()
+        self.micro_step.assign(0)
+
+    def fit(self, *args, callbacks=None, **kwargs):
+        callbacks = [FlushAccumulatedGradients()] + list(callbacks or [])
+        return super().fit(*args, callbacks=callbacks, **kwargs)
+
+    def train_step(self, data):
+        x, y = data
+        with tf.GradientTape() as tape:
+            y_pred = self(x, training=True)
+            loss = self.compute_loss(y=y, y_pred=y_pred)
+        gradients = tape.gradient(loss, self.inner_model.trainable_variables)
+        for accumulated, gradient in zip(self.accumulated_gradients, gradients):
+            accumulated.assign_add(gradient / self.accumulation_steps)
+        self.micro_step.assign_add(1)
+
+        tf.cond(
+            tf.equal(self.micro_step % self.accumulation_steps, 0),
+            self._apply_accumulated_gradients,
+            lambda: None
+        )
+
+        for metric in self.metrics:
+            if metric.name == "loss":
+                metric.update_state(loss)
+            else:
+                metric.update_state(y, y_pred)
+        return {metric.name: metric.result() for metric in self.metrics}
+
+
+class FlushAccumulatedGradients(tf.keras.callbacks.Callback):
+    """
+    Apply the leftover micro-batches of an epoch (see `GradientAccumulationModel`).
+
+    Runs before the validation of the epoch (`fit` passes its callbacks to the validation
+    `evaluate`) and at its end, for a `fit` without validation data.
+    """
+
+    def on_test_begin(self, logs=None):
+        self.model.apply_pending_gradients()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.model.apply_pending_gradients()
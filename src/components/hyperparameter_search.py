@@ -0,0 +1,215 @@
+import os
+import sys
+import math
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+import mlflow
+from mlflow.tracking import MlflowClient
+from src.entity.config_entity import BaseModelConfig, HyperparameterSearchConfig
+from src.components.model_base import BaseModel
+from src.components.model_training import ModelTraining
+from src.components.data_preprocessing import add_gaussian_noise
+from src.utils.common import read_numpy_file, save_json
+from src.utils.mlflow_logger import set_tracking_store
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+class MlflowEpochLogger(tf.keras.callbacks.Callback):
+    """Log the epoch logs of a trial to the active MLflow run."""
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs:
+            mlflow.log_metrics({key: float(value) for key, value in logs.items()}, step=epoch)
+
+
+def run_trial(config: HyperparameterSearchConfig, trial: dict, epochs: int, threads: int) -> dict:
+    """
+    Process-pool entry point: train one trial up to `epochs` epochs.
+
+    A trial that already ran in a previous rung is resumed from its checkpoint (model and
+    optimizer state) and its MLflow run, so successive halving never retrains from scratch.
+    Training inputs are noised per batch, so no noisy copy of the training set is held.
+
+    Args:
+        config (HyperparameterSearchConfig): Configuration of the sweep.
+        trial (dict): Hyperparameters and state of the trial.
+        epochs (int): Total number of epochs the trial must have run at the end of the call.
+        threads (int): Intra-op threads given to TensorFlow in this worker.
+
+    Returns:
+        dict: Updated trial state with the validation loss reached at `epochs`.
+    """
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    trial_dir = Path(config.root_dir) / trial["trial_id"]
+    trial_dir.mkdir(parents=True, exist_ok=True)
+    model_path = trial_dir / "model.keras"
+
+    train_data = read_numpy_file(Path(config.train_data_path), mmap_mode="r")
+    test_data = read_numpy_file(Path(config.test_data_path), mmap_mode="r")
+    test_noisy = add_gaussian_noise(test_data, trial["noise_factor"], seed=config.random_state)
+
+    if trial["epochs_done"] > 0:
+        model = tf.keras.models.load_model(model_path)
+    else:
+        model_base = BaseModel(BaseModelConfig(
+            root_dir=trial_dir,
+            base_model_path=model_path,
+            updated_base_model_path=model_path,
+            base_learning_rate=trial["learning_rate"],
+            input_shape=tuple(config.input_shape),
+            width_multiplier=trial["width_multiplier"],
+            architecture=config.architecture,
+            architecture_report_path=trial_dir / "architecture_report.json"
+        ))
+        model = model_base.build_model()
+        # No latency: the trials share the cores, their timings would not be comparable.
+        model_base.save_architecture_report(model, with_latency=False)
+
+    noise_factor = trial["noise_factor"]
+
+    def add_noise(clean, target):
+        noisy = clean + noise_factor * tf.random.normal(tf.shape(clean))
+        return tf.clip_by_value(noisy, 0.0, 1.0), target
+
+    train_dataset = ModelTraining.make_dataset(
+        train_data, train_data, trial["batch_size"], shuffle=True,
+        seed=config.random_state + trial["epochs_done"]
+    ).map(add_noise, num_parallel_calls=tf.data.AUTOTUNE)
+
+    set_tracking_store(config.tracking_uri, config.experiment_name)
+    run_name = None if trial.get("run_id") else trial["trial_id"]
+    with mlflow.start_run(run_id=trial.get("run_id"), run_name=run_name) as run:
+        if trial.get("run_id") is None:
+            mlflow.log_params({key: trial[key] for key in ("learning_rate", "batch_size", "noise_factor", "width_multiplier")})
+            mlflow.log_param("num_params", model.count_params())
+        history = model.fit(
+            train_dataset,
+            initial_epoch=trial["epochs_done"],
+            epochs=epochs,
+            validation_data=(test_noisy, np.asarray(test_data)),
+            validation_batch_size=trial["batch_size"],
+            callbacks=[MlflowEpochLogger()],
+            verbose=0
+        )
+        model.save(model_path)
+        run_id = run.info.run_id
+
+    val_loss = float(history.history["val_loss"][-1])
+    return {**trial, "run_id": run_id, "epochs_done": epochs, "val_loss": val_loss,
+            "rung_losses": trial["rung_losses"] + [val_loss], "model_path": str(model_path)}
+
+
+@dataclass
+class HyperparameterSearch:
+    """
+    Class for running a parallel hyperparameter sweep with successive-halving pruning.
+
+    Trials are sampled from the grid of learning rate, batch size, noise factor and width
+    multiplier. Every rung trains all surviving trials concurrently in a process pool (one
+    spawned TensorFlow process per worker, each with its share of the CPU cores) up to the
+    rung's epoch budget, then keeps the best 1/reduction_factor of them on validation loss.
+    Every trial is an MLflow run in a local file store; pruned runs are tagged.
+
+    Attributes:
+        config (HyperparameterSearchConfig): Configuration of the sweep.
+    """
+
+    config: HyperparameterSearchConfig
+
+    def sample_trials(self) -> list:
+        """
+        Sample the trials from the hyperparameter grid.
+
+        Returns:
+            list: Trial dicts (hyperparameters plus an empty state).
+        """
+        grid = list(itertools.product(
+            self.config.learning_rates, self.config.batch_sizes,
+            self.config.noise_factors, self.config.width_multipliers
+        ))
+        if 0 < self.config.num_trials < len(grid):
+            rng = np.random.default_rng(self.config.random_state)
+            grid = [grid[i] for i in sorted(rng.choice(len(grid), size=self.config.num_trials, replace=False))]
+
+        return [
+            {"trial_id": f"trial_{i:03d}", "learning_rate": lr, "batch_size": int(bs), "noise_factor": nf,
+             "width_multiplier": w, "run_id": None, "epochs_done": 0, "rung_losses": [], "status": "running"}
+            for i, (lr, bs, nf, w) in enumerate(grid)
+        ]
+
+    def rung_budgets(self) -> list:
+        """
+        Epoch budget of every rung: min_epochs * reduction_factor ** rung, capped by max_epochs.
+
+        Returns:
+            list: Increasing epoch budgets, the last one being `max_epochs`.
+        """
+        budgets = []
+        budget = self.config.min_epochs
+        while budget < self.config.max_epochs:
+            budgets.append(budget)
+            budget *= self.config.reduction_factor
+        budgets.append(self.config.max_epochs)
+        return budgets
+
+    def run(self) -> dict:
+        """
+        Run the sweep and save the report.
+
+        Returns:
+            dict: Report with every trial, its rung losses and status, and the best trial.
+
+        Raises:
+            CustomException: If any error occurs during the sweep.
+        """
+        try:
+            trials = self.sample_trials()
+            budgets = self.rung_budgets()
+            num_workers = self.config.max_workers or (os.cpu_count() or 1)
+            num_workers = max(1, min(num_workers, len(trials)))
+            threads = max(1, (os.cpu_count() or 1) // num_workers)
+            logging.info(f"Sweep of {len(trials)} trials, rungs {budgets}, "
+                         f"{num_workers} workers x {threads} threads.")
+
+            set_tracking_store(self.config.tracking_uri, self.config.experiment_name)
+            client = MlflowClient(tracking_uri=self.config.tracking_uri)
+
+            active = trials
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp.get_context("spawn")) as pool:
+                for rung, budget in enumerate(budgets):
+                    futures = [pool.submit(run_trial, self.config, trial, budget, threads) for trial in active]
+                    results = {result["trial_id"]: result for result in (future.result() for future in futures)}
+                    trials = [results.get(trial["trial_id"], trial) for trial in trials]
+                    active = sorted((results[trial["trial_id"]] for trial in active), key=lambda t: t["val_loss"])
+                    logging.info(f"Rung {rung} ({budget} epochs): best val_loss {active[0]['val_loss']:.6f} "
+                                 f"({active[0]['trial_id']}).")
+
+                    if rung == len(budgets) - 1:
+                        break
+                    keep = max(1, math.ceil(len(active) / self.config.reduction_factor))
+                    for pruned in active[keep:]:
+                        pruned["status"] = f"pruned_at_rung_{rung}"
+                        client.set_tag(pruned["run_id"], "pruned_at_rung", rung)
+                    active = active[:keep]
+
+            for trial in active:
+                trial["status"] = "completed"
+            best = active[0]
+            client.set_tag(best["run_id"], "best_trial", "true")
+
+            report = {"rung_budgets": budgets, "best_trial": best, "trials": trials}
+            save_json(path=Path(self.config.report_path), data=report)
+            logging.info(f"Best trial {best['trial_id']} (val_loss {best['val_loss']:.6f}), "
+                         f"model at {best['model_path']}.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the hyperparameter search: {e}")
+            raise CustomException(e, sys)
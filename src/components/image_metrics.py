@@ -0,0 +1,181 @@
+import heapq
+import numpy as np
+import tensorflow as tf
+
+
+# PSNR of a perfect reconstruction is infinite; the MSE is floored so the report stays finite.
+MIN_MSE = 1e-10
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@tf.function(reduce_retracing=True)
+def batch_metrics(clean: tf.Tensor, denoised: tf.Tensor) -> dict:
+    """
+    Per-image MSE, PSNR and SSIM of a batch of images in [0, 1].
+
+    SSIM uses the 11x11 Gaussian window (sigma 1.5) of the original definition, i.e. the
+    value of scikit-image's `structural_similarity(..., gaussian_weights=True,
+    use_sample_covariance=False)`, computed for the whole batch at once.
+
+    Args:
+        clean (tf.Tensor): Reference images, (batch, height, width, channels).
+        denoised (tf.Tensor): Model outputs, same shape.
+
+    Returns:
+        dict: "mse", "psnr" (dB) and "ssim" tensors of shape (batch,).
+    """
+    clean = tf.cast(clean, tf.float32)
+    denoised = tf.clip_by_value(tf.cast(denoised, tf.float32), 0.0, 1.0)
+    mse = tf.reduce_mean(tf.square(clean - denoised), axis=[1, 2, 3])
+    psnr = 10.0 * tf.math.log(1.0 / tf.maximum(mse, MIN_MSE)) / tf.math.log(10.0)
+    ssim = tf.image.ssim(clean, denoised, max_val=1.0)
+    return {"mse": mse, "psnr": psnr, "ssim": ssim}
+
+
+class MetricsAccumulator:
+    """
+    Streaming accumulator of per-image image-quality metrics.
+
+    Batches are scored as they are predicted (`update`), so only one scalar per image and
+    metric is kept, never the predictions. `result` aggregates the mean, standard deviation
+    and percentiles of every metric, and the `worst_k` images by MSE.
+
+    Attributes:
+        worst_k (int): Number of worst images kept in the report.
+    """
+
+    def __init__(self, worst_k: int = 10) -> None:
+        self.worst_k = worst_k
+        self.values = {"mse": [], "psnr": [], "ssim": []}
+        self.count = 0
+        self._worst = []  # min-heap of (mse, index, position): the K largest MSEs seen so far
+
+    def update(self, clean: np.ndarray, denoised: np.ndarray, indices: np.ndarray) -> dict:
+        """
+        Score one batch.
+
+        Args:
+            clean (np.ndarray): Reference images of the batch.
+            denoised (np.ndarray): Model outputs of the batch.
+            indices (np.ndarray): Test-set index of every image of the batch.
+
+        Returns:
+            dict: Per-image metrics of the batch (numpy arrays).
+        """
+        return self.add(batch_metrics(clean, denoised), indices)
+
+    def add(self, metrics: dict, indices: np.ndarray) -> dict:
+        """
+        Record per-image metrics already computed by `batch_metrics` (e.g. for a larger
+        batch holding several evaluation conditions, scored in one call and split).
+        """
+        metrics = {name: np.asarray(value) for name, value in metrics.items()}
+        for name, value in metrics.items():
+            self.values[name].append(value)
+        for i, index in enumerate(indices):
+            item = (float(metrics["mse"][i]), int(index), self.count + i)
+            if len(self._worst) < self.worst_k:
+                heapq.heappush(self._worst, item)
+            elif self._worst and item > self._worst[0]:
+                heapq.heapreplace(self._worst, item)
+        self.count += len(indices)
+        return metrics
+
+    def per_image(self) -> dict:
+        """Per-image values of every metric, in update order."""
+        return {name: np.concatenate(values) if values else np.zeros(0, dtype=np.float32)
+                for name, values in self.values.items()}
+
+    def result(self) -> dict:
+        """
+        Aggregate the metrics of all the images seen.
+
+        Returns:
+            dict: {"count", "mse"/"psnr"/"ssim": {"mean", "std", "p5", ..., "p95"},
+            "worst": [{"index", "mse", "psnr", "ssim"}, ...] from the worst image}.
+        """
+        values = self.per_image()
+        report = {"count": int(len(values["mse"]))}
+        for name, value in values.items():
+            report[name] = {"mean": float(np.mean(value)), "std": float(np.std(value)),
+                            **{f"p{q}": float(np.percentile(value, q)) for q in PERCENTILES}}
+        report["worst"] = [
+            {"index": index, **{name: float(values[name][position]) for name in values}}
+            for _, index, position in sorted(self._worst, reverse=True)
+        ]
+        return report
+
+
+class SampleSelector:
+    """
+    Streaming selection of the images shown in the evaluation figures.
+
+    Keeps the first `k` images of the test set and the `extreme_k` best and worst ones by
+    MSE, each as (noisy input, model output, clean image). Only the rows entering a
+    selection are copied out of the batch, so the predictions of the other images are
+    never kept.
+
+    Attributes:
+        k (int): Number of first images.
+        extreme_k (int): Number of best and of worst images (default `k`).
+    """
+
+    def __init__(self, k: int = 5, extreme_k: int = None) -> None:
+        self.k = k
+        self.extreme_k = k if extreme_k is None else extreme_k
+        self.first = []
+        self._best = []   # min-heap of (-mse, index, images): the K smallest MSEs
+        self._worst = []  # min-heap of (mse, index, images): the K largest MSEs
+
+    @staticmethod
+    def _offer(heap: list, k: int, key: float, index: int) -> bool:
+        """Whether an image of score `key` enters a K-largest heap."""
+        return len(heap) < k or (bool(heap) and (key, index) > heap[0][:2])
+
+    @staticmethod
+    def _push(heap: list, k: int, item: tuple) -> None:
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heapreplace(heap, item)
+
+    def add(self, mse: np.ndarray, indices: np.ndarray, noisy, denoised, clean) -> None:
+        """
+        Offer one batch to the selections.
+
+        Args:
+            mse (np.ndarray): Per-image MSE of the batch.
+            indices (np.ndarray): Test-set index of every image of the batch.
+            noisy, denoised, clean: Batch of inputs, outputs and references (arrays or tensors).
+        """
+        mse = np.asarray(mse)
+        for row, index in enumerate(indices):
+            index, value = int(index), float(mse[row])
+            take_first = len(self.first) < self.k
+            take_best = self._offer(self._best, self.extreme_k, -value, index)
+            take_worst = self._offer(self._worst, self.extreme_k, value, index)
+            if not (take_first or take_best or take_worst):
+                continue
+            images = tuple(np.asarray(batch[row], dtype=np.float32) for batch in (noisy, denoised, clean))
+            if take_first:
+                self.first.append((value, index, images))
+            if take_best:
+                self._push(self._best, self.extreme_k, (-value, index, images))
+            if take_worst:
+                self._push(self._worst, self.extreme_k, (value, index, images))
+
+    def result(self) -> dict:
+        """
+        Returns:
+            dict: {"first", "best", "worst"} lists of {"index", "mse", "noisy", "denoised",
+            "clean"}, best and worst ordered from the most extreme image.
+        """
+        def entries(items):
+            return [{"index": index, "mse": abs(key), "noisy": images[0], "denoised": images[1], "clean": images[2]}
+                    for key, index, images in items]
+
+        return {
+            "first": entries(self.first),
+            "best": entries(sorted(self._best, key=lambda item: item[:2], reverse=True)),
+            "worst": entries(sorted(self._worst, key=lambda item: item[:2], reverse=True)),
+        }
@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from src.entity.config_entity import InferenceBenchmarkConfig
+from src.utils.common import load_model, save_json, memory_usage_mb, weights_hash
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+BACKENDS = ("eager", "tf_function", "xla", "tflite")
+
+
+def make_predict_fn(backend: str, model_path: str, tflite_model_path: str, threads: int):
+    """
+    Load the model for a backend and return its predict function (batch in, numpy out).
+
+    Args:
+        backend (str): One of `BACKENDS`.
+        model_path (str): Keras model (.keras file or inference artifact).
+        tflite_model_path (str): float32 TFLite model with a dynamic input shape.
+        threads (int): CPU threads of the TFLite interpreter.
+    """
+    if backend == "tflite":
+        interpreter = tf.lite.Interpreter(model_path=tflite_model_path, num_threads=threads)
+        input_index = interpreter.get_input_details()[0]["index"]
+        output_index = interpreter.get_output_details()[0]["index"]
+        shapes = {}
+
+        def predict(batch: np.ndarray) -> np.ndarray:
+            if shapes.get("input") != batch.shape:
+                interpreter.resize_tensor_input(input_index, batch.shape)
+                interpreter.allocate_tensors()
+                shapes["input"] = batch.shape
+            interpreter.set_tensor(input_index, batch)
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)
+        return predict
+
+    model = load_model(path=Path(model_path), compile=False)
+    if backend == "eager":
+        return lambda batch: model(batch, training=False).numpy()
+    if backend in ("tf_function", "xla"):
+        forward = tf.function(lambda x: model(x, training=False), jit_compile=backend == "xla")
+        return lambda batch: forward(tf.convert_to_tensor(batch)).numpy()
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}.")
+
+
+def benchmark_worker(backend: str, model_path: str, tflite_model_path: str, threads: int,
+                     cases: list, runs: int, warmup: int) -> list:
+    """
+    Process-pool entry point: benchmark one backend at one thread count.
+
+    Every (backend, threads) pair runs in a fresh process, because TensorFlow's thread pools
+    are fixed at initialization and because the first load and call are the cold start a
+    stage pays. The first call at every input shape is reported separately (tracing, XLA
+    compilation or TFLite tensor allocation); the warm latency follows `warmup` more calls.
+
+    Args:
+        backend (str): One of `BACKENDS`.
+        model_path (str): Keras model (.keras file or inference artifact).
+        tflite_model_path (str): float32 TFLite model with a dynamic input shape.
+        threads (int): CPU threads of the runtime.
+        cases (list): (batch_size, height, width, channels) input shapes.
+        runs (int): Number of timed warm calls per case.
+        warmup (int): Number of untimed calls after the first one.
+
+    Returns:
+        list: One row per case.
+    """
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    start = time.perf_counter()
+    predict = make_predict_fn(backend, model_path, tflite_model_path, threads)
+    load_seconds = time.perf_counter() - start
+
+    rows = []
+    rng = np.random.default_rng(0)
+    for batch_size, height, width, channels in cases:
+        batch = rng.random((batch_size, height, width, channels), dtype=np.float32)
+        start = time.perf_counter()
+        predict(batch)
+        first_call_ms = (time.perf_counter() - start) * 1000.0
+        for _ in range(warmup):
+            predict(batch)
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            predict(batch)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        latencies = np.asarray(latencies)
+        mean_seconds = latencies.mean() / 1000.0
+        rows.append({
+            "backend": backend,
+            "threads": threads,
+            "batch_size": batch_size,
+            "input_size": [height, width],
+            "load_seconds": load_seconds,
+            "first_call_ms": first_call_ms,
+            "cold_start_ms": load_seconds * 1000.0 + first_call_ms if not rows else None,
+            "latency_ms": {"mean": float(latencies.mean()), "p50": float(np.percentile(latencies, 50)),
+                           "p99": float(np.percentile(latencies, 99))},
+            "images_per_second": batch_size / mean_seconds,
+            "megapixels_per_second": batch_size * height * width / mean_seconds / 1e6,
+        })
+    if rows:
+        rows[0]["peak_rss_mb"] = memory_usage_mb()["peak_rss_mb"]
+    return rows
+
+
+@dataclass
+class InferenceBenchmark:
+    """
+    Class for benchmarking the inference speed of the trained model.
+
+    Latency and throughput are measured for every backend (Keras eager, `tf.function`,
+    XLA-compiled `tf.function`, float32 TFLite), thread count, batch size (at the training
+    input size) and input size (at batch size 1, and at larger batches while the call stays
+    under `max_pixels_per_call`). The model must be fully convolutional (the exported model)
+    for input sizes other than its own; sizes it cannot take are skipped.
+
+    Every (backend, threads) pair runs in its own fresh process, one at a time so the
+    measurements do not compete for the cores; each reports its cold start (load and first
+    call) and warm numbers.
+
+    Attributes:
+        config (InferenceBenchmarkConfig): Configuration of the benchmark.
+    """
+
+    config: InferenceBenchmarkConfig
+
+    def cases(self, model_input_shape: tuple) -> list:
+        """Input shapes (batch, height, width, channels) benchmarked for a model input shape."""
+        channels = model_input_shape[-1]
+        if model_input_shape[0] is None:
+            base = tuple(self.config.im_size)
+            sizes = [base] + [(size, size) for size in self.config.input_sizes]
+        else:
+            base = tuple(model_input_shape[:2])
+            sizes = [base]
+            logging.info(f"Fixed-size model: input size limited to {base}.")
+        cases = []
+        for height, width in sizes:
+            for batch_size in self.config.batch_sizes:
+                case = (batch_size, height, width, channels)
+                # Batch size 1 at every size, larger batches while the call fits.
+                fits = batch_size * height * width <= self.config.max_pixels_per_call
+                if case not in cases and (batch_size == 1 or fits):
+                    cases.append(case)
+        return cases
+
+    def convert_tflite(self) -> Path:
+        """Convert the model to a float32 TFLite model keeping its dynamic input size."""
+        model = load_model(path=Path(self.config.model_path), compile=False)
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        tflite_path = Path(self.config.tflite_model_path)
+        tflite_path.parent.mkdir(parents=True, exist_ok=True)
+        tflite_path.write_bytes(converter.convert())
+        return tflite_path
+
+    def run(self) -> dict:
+        """
+        Run the benchmark and save the report.
+
+        Returns:
+            dict: {"model_path", "model_hash", "model_size_mb", "cases", "results": [rows], "fastest": {case: backend}}.
+
+        Raises:
+            CustomException: If the benchmark fails.
+        """
+        try:
+            model = load_model(path=Path(self.config.model_path), compile=False)
+            cases = self.cases(tuple(model.input_shape[1:]))
+            model_hash = weights_hash(model)
+            del model
+            backends = list(self.config.backends)
+            if "tflite" in backends:
+                try:
+                    self.convert_tflite()
+                except Exception as e:
+                    logging.error(f"TFLite conversion failed, backend skipped: {e}")
+                    backends.remove("tflite")
+
+            results = []
+            for backend in backends:
+                for setting in sorted(set(self.config.threads)):
+                    count = setting or (os.cpu_count() or 1)
+                    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                        rows = pool.submit(benchmark_worker, backend, str(self.config.model_path),
+                                           str(self.config.tflite_model_path), count, cases,
+                                           self.config.runs, self.config.warmup).result()
+                    # The configured value ("all" for 0) names the case the same on every machine.
+                    for row in rows:
+                        row["threads_setting"] = setting or "all"
+                    results.extend(rows)
+                    logging.info(f"{backend} ({count} threads): cold start {rows[0]['cold_start_ms']:.0f} ms, "
+                                 f"batch 1 p50 {rows[0]['latency_ms']['p50']:.2f} ms.")
+
+            fastest = {}
+            for row in results:
+                key = f"b{row['batch_size']}_{row['input_size'][0]}x{row['input_size'][1]}_t{row['threads']}"
+                if key not in fastest or row["latency_ms"]["p50"] < fastest[key]["latency_ms_p50"]:
+                    fastest[key] = {"backend": row["backend"], "latency_ms_p50": row["latency_ms"]["p50"]}
+            model_path = Path(self.config.model_path)
+            model_size = sum(p.stat().st_size for p in model_path.rglob("*") if p.is_file()) \
+                if model_path.is_dir() else model_path.stat().st_size
+            report = {
+                "model_path": str(model_path),
+                "model_hash": model_hash,
+                "model_size_mb": model_size / 2 ** 20,
+                "cases": [list(case) for case in cases],
+                "results": results,
+                "fastest": fastest,
+            }
+            save_json(path=Path(self.config.report_path), data=report)
+            logging.info(f"Inference benchmark saved at {self.config.report_path}.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the inference benchmark: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,61 @@
+import tensorflow as tf
+
+
+class DistillationModel(tf.keras.Model):
+    """
+    Keras model wrapper that trains a student to match both the clean targets and a teacher.
+
+    The training loss is `alpha * MSE(student, clean) + (1 - alpha) * MSE(student, teacher)`;
+    the teacher is frozen and only run forward. Validation (`test_step`) keeps the compiled
+    loss on the clean targets, so `val_loss` stays comparable with normal training and the
+    callbacks monitoring it work unchanged; the MSE to the teacher is logged as
+    `distillation_loss`.
+
+    The student is the model that must be saved: the wrapper only adds the teacher and the
+    custom train step.
+
+    Attributes:
+        student (tf.keras.Model): The model being trained.
+        teacher (tf.keras.Model): The trained model whose outputs are distilled.
+        alpha (float): Weight of the clean-target loss.
+    """
+
+    def __init__(self, student: tf.keras.Model, teacher: tf.keras.Model, alpha: float, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.student = student
+        self.teacher = teacher
+        self.teacher.trainable = False
+        self.alpha = alpha
+        self.distillation_loss_tracker = tf.keras.metrics.Mean(name="distillation_loss")
+
+    def call(self, inputs, training=False):
+        return self.student(inputs, training=training)
+
+    def train_step(self, data):
+        x, y = data
+        teacher_pred = self.teacher(x, training=False)
+        with tf.GradientTape() as tape:
+            y_pred = self(x, training=True)
+            student_loss = self.compute_loss(y=y, y_pred=y_pred)
+            distillation_loss = tf.reduce_mean(tf.square(y_pred - teacher_pred))
+            loss = self.alpha * student_loss + (1.0 - self.alpha) * distillation_loss
+        gradients = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(gradients, self.student.trainable_variables))
+
+        return self._update_metrics(y, y_pred, loss, distillation_loss)
+
+    def test_step(self, data):
+        x, y = data
+        y_pred = self(x, training=False)
+        loss = self.compute_loss(y=y, y_pred=y_pred)
+        distillation_loss = tf.reduce_mean(tf.square(y_pred - self.teacher(x, training=False)))
+        return self._update_metrics(y, y_pred, loss, distillation_loss)
+
+    def _update_metrics(self, y, y_pred, loss, distillation_loss) -> dict:
+        self.distillation_loss_tracker.update_state(distillation_loss)
+        for metric in self.metrics:
+            if metric.name == "loss":
+                metric.update_state(loss)
+            elif metric is not self.distillation_loss_tracker:
+                metric.update_state(y, y_pred)
+        return {metric.name: metric.result() for metric in self.metrics}
@@ -4,18 +4,30 @@ from tensorflow.keras.models import Model
 from tensorflow.keras import layers
 from tensorflow.keras.optimizers import Adam
 from src.entity.config_entity import BaseModelConfig
+from src.utils.common import save_json, estimate_flops, measure_latency
 from src.utils.exception import CustomException
 from src.utils.logger import logging  # Import logging
 from dataclasses import dataclass
 import sys  # Import sys
 
+# Name (params.yaml `architecture`) -> BaseModel builder method.
+ARCHITECTURES = {
+    "baseline": "build_autoencoder",
+    "separable": "build_separable_autoencoder",
+    "resize_conv": "build_resize_conv_autoencoder",
+    "unet_lite": "build_unet_lite",
+    "residual": "build_residual_autoencoder",
+}
+
+
 @dataclass
 class BaseModel:
     """
     Class for building and managing the base autoencoder model.
 
     This class handles the creation, compilation, and saving of an autoencoder model 
-    that can be used as the base model for further training or fine-tuning.
+    that can be used as the base model for further training or fine-tuning. The
+    architecture is selected by name in the `ARCHITECTURES` registry.
 
     Attributes:
         config (BaseModelConfig): Configuration for the base model preparation process.
@@ -49,16 +61,18 @@ class BaseModel:
         try:
             logging.info("Starting to build the autoencoder model.")
             input_img = layers.Input(shape=(self.config.input_shape))
+            # The width multiplier scales the number of filters of every hidden layer.
+            f1, f2, f3 = [max(8, int(round(filters * self.config.width_multiplier))) for filters in (64, 128, 256)]
 
             # Encoder
-            x = layers.Conv2D(64, (3, 3), activation='relu', padding='same', strides=2)(input_img)
-            x = layers.Conv2D(128, (3, 3), activation='relu', padding='same', strides=2)(x)
-            x = layers.Conv2D(256, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2D(f1, (3, 3), activation='relu', padding='same', strides=2)(input_img)
+            x = layers.Conv2D(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2D(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
 
             # Decoder
-            x = layers.Conv2DTranspose(256, (3, 3), activation='relu', padding='same', strides=2)(x)
-            x = layers.Conv2DTranspose(128, (3, 3), activation='relu', padding='same', strides=2)(x)
-            x = layers.Conv2DTranspose(64, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2DTranspose(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2DTranspose(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2DTranspose(f1, (3, 3), activation='relu', padding='same', strides=2)(x)
             decoded = layers.Conv2D(3, (3, 3), activation='sigmoid', padding='same')(x)
 
             autoencoder = Model(input_img, decoded)
@@ -70,6 +84,216 @@ class BaseModel:
             logging.error(f"Error occurred while building the autoencoder: {e}")
             raise CustomException(e, sys)
 
+    def build_separable_autoencoder(self) -> tf.keras.Model:
+        """
+        Build a lightweight autoencoder made of depthwise-separable convolutions.
+
+        The encoder has the same three stride-2 stages as `build_autoencoder`, but only the
+        first one (3 input channels) is a standard convolution; the decoder upsamples with
+        nearest-neighbour resizing followed by separable convolutions instead of transposed
+        convolutions. Filters are 32-64-128 at `width_multiplier` 1.0, i.e. several times
+        fewer FLOPs than the baseline; it is meant as a distillation student.
+
+        Returns:
+            tf.keras.Model: Compiled lightweight autoencoder.
+
+        Raises:
+            CustomException: If any errors occur during the model building process.
+        """
+        try:
+            logging.info("Starting to build the depthwise-separable autoencoder model.")
+            input_img = layers.Input(shape=(self.config.input_shape))
+            f1, f2, f3 = [max(8, int(round(filters * self.config.width_multiplier))) for filters in (32, 64, 128)]
+
+            # Encoder
+            x = layers.Conv2D(f1, (3, 3), activation='relu', padding='same', strides=2)(input_img)
+            x = layers.SeparableConv2D(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.SeparableConv2D(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
+
+            # Decoder
+            x = layers.UpSampling2D(2)(x)
+            x = layers.SeparableConv2D(f2, (3, 3), activation='relu', padding='same')(x)
+            x = layers.UpSampling2D(2)(x)
+            x = layers.SeparableConv2D(f1, (3, 3), activation='relu', padding='same')(x)
+            x = layers.UpSampling2D(2)(x)
+            x = layers.SeparableConv2D(f1, (3, 3), activation='relu', padding='same')(x)
+            decoded = layers.Conv2D(3, (3, 3), activation='sigmoid', padding='same')(x)
+
+            return self._compile(Model(input_img, decoded))
+
+        except Exception as e:
+            logging.error(f"Error occurred while building the depthwise-separable autoencoder: {e}")
+            raise CustomException(e, sys)
+
+    def build_resize_conv_autoencoder(self) -> tf.keras.Model:
+        """
+        Build the baseline autoencoder with resize-convolutions in the decoder.
+
+        Every Conv2DTranspose is replaced by a nearest-neighbour upsampling followed by a
+        convolution, which avoids the checkerboard artifacts of the uneven overlap of
+        strided transposed kernels. The convolutions run at the upsampled resolution, so
+        each decoder stage has the filters of the next-finer scale (f2, f1, f1 / 2) to keep
+        the FLOPs close to the baseline with fewer parameters.
+
+        Returns:
+            tf.keras.Model: Compiled autoencoder.
+
+        Raises:
+            CustomException: If any errors occur during the model building process.
+        """
+        try:
+            logging.info("Starting to build the resize-conv autoencoder model.")
+            input_img = layers.Input(shape=(self.config.input_shape))
+            f1, f2, f3 = [max(8, int(round(filters * self.config.width_multiplier))) for filters in (64, 128, 256)]
+
+            # Encoder
+            x = layers.Conv2D(f1, (3, 3), activation='relu', padding='same', strides=2)(input_img)
+            x = layers.Conv2D(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2D(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
+
+            # Decoder
+            for filters in (f2, f1, max(8, f1 // 2)):
+                x = layers.UpSampling2D(2)(x)
+                x = layers.Conv2D(filters, (3, 3), activation='relu', padding='same')(x)
+            decoded = layers.Conv2D(3, (3, 3), activation='sigmoid', padding='same')(x)
+
+            return self._compile(Model(input_img, decoded))
+        except Exception as e:
+            logging.error(f"Error occurred while building the resize-conv autoencoder: {e}")
+            raise CustomException(e, sys)
+
+    def build_unet_lite(self) -> tf.keras.Model:
+        """
+        Build a narrow U-Net: the encoder features of every scale are concatenated to the
+        decoder at the same scale.
+
+        The skip connections carry the fine details the bottleneck has to reconstruct in
+        the plain autoencoder, so half the filters (32-64-128 at `width_multiplier` 1.0)
+        are enough.
+
+        Returns:
+            tf.keras.Model: Compiled U-Net.
+
+        Raises:
+            CustomException: If any errors occur during the model building process.
+        """
+        try:
+            logging.info("Starting to build the U-Net-lite model.")
+            input_img = layers.Input(shape=(self.config.input_shape))
+            f1, f2, f3 = [max(8, int(round(filters * self.config.width_multiplier))) for filters in (32, 64, 128)]
+
+            # Encoder
+            e1 = layers.Conv2D(f1, (3, 3), activation='relu', padding='same', strides=2)(input_img)
+            e2 = layers.Conv2D(f2, (3, 3), activation='relu', padding='same', strides=2)(e1)
+            x = layers.Conv2D(f3, (3, 3), activation='relu', padding='same', strides=2)(e2)
+
+            # Decoder
+            for filters, skip in ((f2, e2), (f1, e1), (f1, input_img)):
+                x = layers.UpSampling2D(2)(x)
+                x = layers.Concatenate()([x, skip])
+                x = layers.Conv2D(filters, (3, 3), activation='relu', padding='same')(x)
+            decoded = layers.Conv2D(3, (3, 3), activation='sigmoid', padding='same')(x)
+
+            return self._compile(Model(input_img, decoded))
+        except Exception as e:
+            logging.error(f"Error occurred while building the U-Net-lite: {e}")
+            raise CustomException(e, sys)
+
+    def build_residual_autoencoder(self) -> tf.keras.Model:
+        """
+        Build the baseline autoencoder with a residual (noise-prediction) head.
+
+        The network predicts the noise, which is subtracted from the input; the output is
+        clipped to [0, 1]. Learning the residual is easier than regenerating the whole
+        image through the bottleneck, which mostly shows on fine textures.
+
+        Returns:
+            tf.keras.Model: Compiled autoencoder.
+
+        Raises:
+            CustomException: If any errors occur during the model building process.
+        """
+        try:
+            logging.info("Starting to build the residual autoencoder model.")
+            input_img = layers.Input(shape=(self.config.input_shape))
+            f1, f2, f3 = [max(8, int(round(filters * self.config.width_multiplier))) for filters in (64, 128, 256)]
+
+            # Encoder
+            x = layers.Conv2D(f1, (3, 3), activation='relu', padding='same', strides=2)(input_img)
+            x = layers.Conv2D(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2D(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
+
+            # Decoder, predicting the noise
+            x = layers.Conv2DTranspose(f3, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2DTranspose(f2, (3, 3), activation='relu', padding='same', strides=2)(x)
+            x = layers.Conv2DTranspose(f1, (3, 3), activation='relu', padding='same', strides=2)(x)
+            noise = layers.Conv2D(3, (3, 3), activation='linear', padding='same')(x)
+            denoised = layers.Subtract()([input_img, noise])
+            decoded = layers.ReLU(max_value=1.0)(denoised)
+
+            return self._compile(Model(input_img, decoded))
+        except Exception as e:
+            logging.error(f"Error occurred while building the residual autoencoder: {e}")
+            raise CustomException(e, sys)
+
+    def _compile(self, model: tf.keras.Model) -> tf.keras.Model:
+        """Compile a model with Adam at `base_learning_rate` and the MSE loss."""
+        model.compile(optimizer=Adam(learning_rate=self.config.base_learning_rate), loss='mean_squared_error')
+        logging.info(f"Model built and compiled successfully ({model.count_params()} params).")
+        return model
+
+    def build_model(self) -> tf.keras.Model:
+        """
+        Build the architecture selected by `architecture`.
+
+        Returns:
+            tf.keras.Model: Compiled model.
+
+        Raises:
+            CustomException: If the architecture is unknown or cannot be built.
+        """
+        try:
+            if self.config.architecture not in ARCHITECTURES:
+                raise ValueError(f"Unknown architecture '{self.config.architecture}', "
+                                 f"expected one of {sorted(ARCHITECTURES)}.")
+            return getattr(self, ARCHITECTURES[self.config.architecture])()
+        except Exception as e:
+            logging.error(f"Error occurred while building the '{self.config.architecture}' architecture: {e}")
+            raise CustomException(e, sys)
+
+    def save_architecture_report(self, model: tf.keras.Model, with_latency: bool = True) -> dict:
+        """
+        Save the cost of a built model to `architecture_report_path`, so variants can be
+        compared before training.
+
+        Args:
+            model (tf.keras.Model): The model built by `build_model`.
+            with_latency (bool): Also measure the CPU latency (batch of 1). Leave it off
+                where the process does not have the whole machine (e.g. sweep trials sharing
+                the cores), as the timings would not be comparable.
+
+        Returns:
+            dict: Architecture, parameter count, FLOPs per image and, optionally, latency.
+        """
+        try:
+            report = {
+                "architecture": self.config.architecture,
+                "width_multiplier": self.config.width_multiplier,
+                "input_shape": list(self.config.input_shape),
+                "params": int(model.count_params()),
+                "flops": estimate_flops(model),
+            }
+            if with_latency:
+                report["latency_ms"] = measure_latency(model, tuple(self.config.input_shape))
+            save_json(path=Path(self.config.architecture_report_path), data=report)
+            logging.info(f"Architecture '{self.config.architecture}': {report['params']} params, "
+                         f"{report['flops'] / 1e9:.2f} GFLOPs" + (
+                             f", p50 {report['latency_ms']['p50']:.1f} ms per image." if with_latency else "."))
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred while reporting the '{self.config.architecture}' architecture: {e}")
+            raise CustomException(e, sys)
+
     def get_base_model(self):
         """
         Builds the autoencoder model and saves it to the specified path.
@@ -79,7 +303,8 @@ class BaseModel:
         """
         try:
             logging.info("Getting the base model.")
-            self.model = self.build_autoencoder()
+            self.model = self.build_model()
+            self.save_architecture_report(self.model)
             self.save_model(path=self.config.base_model_path, model=self.model)
             logging.info(f"Base model saved at {self.config.base_model_path}.")
         except Exception as e:
@@ -102,6 +327,37 @@ class BaseModel:
             logging.error(f"Error occurred while updating the base model: {e}")
             raise CustomException(e, sys)
 
+    @staticmethod
+    def with_input_shape(model: tf.keras.Model, input_shape: tuple) -> tf.keras.Model:
+        """
+        Rebuild a model on a new input shape and copy its weights.
+
+        The autoencoder is fully convolutional, so the same weights are valid for any
+        spatial size; `(None, None, 3)` gives a model accepting any image size
+        (multiple of 8, because of the three stride-2 stages).
+
+        Args:
+            model (tf.keras.Model): The model to rebuild.
+            input_shape (tuple): The new input shape, without the batch dimension.
+
+        Returns:
+            tf.keras.Model: An uncompiled model with the same layers and weights.
+
+        Raises:
+            CustomException: If the model cannot be rebuilt.
+        """
+        try:
+            rebuilt = tf.keras.models.clone_model(model, input_tensors=layers.Input(shape=tuple(input_shape)))
+            # clone_model also compiles the clone like the source model; rewrapping the
+            # graph drops the optimizer so that the saved rebuild carries no training state.
+            rebuilt = Model(rebuilt.inputs, rebuilt.outputs, name=model.name)
+            rebuilt.set_weights(model.get_weights())
+            logging.info(f"Model rebuilt with input shape {tuple(input_shape)}.")
+            return rebuilt
+        except Exception as e:
+            logging.error(f"Error occurred while rebuilding the model: {e}")
+            raise CustomException(e, sys)
+
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
         """
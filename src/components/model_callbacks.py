@@ -1,33 +1,202 @@
+import time
+import math
 import tensorflow as tf
-from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+from tensorflow.keras.callbacks import Callback, EarlyStopping, ReduceLROnPlateau
 from dataclasses import dataclass
+from src.entity.config_entity import CallbackConfig
 from src.utils.exception import CustomException
 from src.utils.logger import logging
 import sys
 
+
+class SmoothedMetric(Callback):
+    """
+    Add an exponentially smoothed copy of a metric to the epoch logs.
+
+    Epoch-to-epoch validation noise (especially on a subsampled validation set) makes
+    plateau detection on the raw loss either trigger too early or never. Callbacks placed
+    after this one can monitor `<monitor>_smoothed` instead.
+
+    Attributes:
+        monitor (str): Name of the metric to smooth.
+        smoothing (float): EMA factor in [0, 1); 0 disables smoothing.
+    """
+
+    def __init__(self, monitor: str = "val_loss", smoothing: float = 0.6) -> None:
+        super().__init__()
+        self.monitor = monitor
+        self.smoothing = smoothing
+        self.smoothed = None
+
+    def on_train_begin(self, logs=None):
+        self.smoothed = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs is None or self.monitor not in logs:
+            return
+        value = float(logs[self.monitor])
+        self.smoothed = value if self.smoothed is None else \
+            self.smoothing * self.smoothed + (1.0 - self.smoothing) * value
+        logs[f"{self.monitor}_smoothed"] = self.smoothed
+
+
+class WallClockBudget(Callback):
+    """
+    Stop training before a wall-clock budget is exceeded.
+
+    After every epoch, training stops if one more epoch (at the mean epoch duration so far)
+    would not fit in the budget; a batch-level check stops an epoch that overruns it.
+    The clock starts at the first `fit` the callback is used in, so the budget spans all
+    phases of a progressive-resolution run.
+
+    Attributes:
+        max_seconds (float): The wall-clock budget.
+        exhausted (bool): Whether training was stopped by this callback.
+    """
+
+    def __init__(self, max_seconds: float) -> None:
+        super().__init__()
+        self.max_seconds = max_seconds
+        self.start_time = None
+        self.epoch_start = None
+        self.epoch_durations = []
+        self.exhausted = False
+
+    def _stop(self, reason: str) -> None:
+        self.exhausted = True
+        self.model.stop_training = True
+        logging.info(f"Wall-clock budget of {self.max_seconds:.0f}s reached: {reason}")
+
+    def on_train_begin(self, logs=None):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.monotonic()
+
+    def on_train_batch_end(self, batch, logs=None):
+        if time.monotonic() - self.start_time > self.max_seconds:
+            self._stop("stopping in the middle of an epoch.")
+
+    def on_epoch_end(self, epoch, logs=None):
+        now = time.monotonic()
+        self.epoch_durations.append(now - self.epoch_start)
+        mean_epoch = sum(self.epoch_durations) / len(self.epoch_durations)
+        if now - self.start_time + mean_epoch > self.max_seconds:
+            self._stop(f"stopping after epoch {epoch + 1}, the next one would not fit.")
+
+
+class CarryOverState(Callback):
+    """
+    Keep the state of callbacks across successive `fit` calls (e.g. the phases of a
+    progressive-resolution run).
+
+    Every `fit` calls `on_train_begin`, which restarts the patience counters and best
+    values of EarlyStopping / ReduceLROnPlateau and the EMA of SmoothedMetric. Placed
+    after them in the list, this callback puts back the state they had at the end of the
+    previous `fit`, so that they behave as in a single run.
+
+    Attributes:
+        callbacks (list): The callbacks whose state is carried over.
+    """
+
+    def __init__(self, callbacks: list) -> None:
+        super().__init__()
+        self.callbacks = callbacks
+        self.states = None
+
+    def on_train_begin(self, logs=None):
+        if self.states is not None:
+            for callback, state in zip(self.callbacks, self.states):
+                vars(callback).update(state)
+
+    def on_train_end(self, logs=None):
+        self.states = [dict(vars(callback)) for callback in self.callbacks]
+
+
+class PeriodicFullValidation(Callback):
+    """
+    Evaluate on the full validation set every `every_n_epochs` epochs.
+
+    Used together with a subsampled `validation_data` in `fit`: the cheap subset drives the
+    per-epoch callbacks, the full set is measured periodically and at the end of training.
+    The result is written to the logs as `val_full_loss` (NaN on the other epochs, so the
+    History keys stay aligned).
+
+    Attributes:
+        validation_data: (x, y) arrays or a tf.data.Dataset of (x, y) batches.
+        every_n_epochs (int): Period of the full evaluation.
+        batch_size (int): Batch size used when `validation_data` are arrays.
+    """
+
+    def __init__(self, validation_data, every_n_epochs: int, batch_size: int = None) -> None:
+        super().__init__()
+        self.validation_data = validation_data
+        self.every_n_epochs = max(1, every_n_epochs)
+        self.batch_size = batch_size
+
+    def _evaluate(self) -> float:
+        if isinstance(self.validation_data, tf.data.Dataset):
+            return float(self.model.evaluate(self.validation_data, verbose=0, return_dict=True)["loss"])
+        x, y = self.validation_data
+        return float(self.model.evaluate(x, y, batch_size=self.batch_size, verbose=0, return_dict=True)["loss"])
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs is None:
+            return
+        if (epoch + 1) % self.every_n_epochs == 0:
+            logs["val_full_loss"] = self._evaluate()
+            logging.info(f"Full validation loss at epoch {epoch + 1}: {logs['val_full_loss']:.6f}")
+        else:
+            logs["val_full_loss"] = math.nan
+
+    def on_train_end(self, logs=None):
+        logging.info(f"Final full validation loss: {self._evaluate():.6f}")
+
+
 @dataclass
 class ModelCallback:
     """
     Class for creating and managing callbacks used during model training.
 
     This class handles the creation of Keras callbacks such as EarlyStopping and
-    ReduceLROnPlateau, which can be used to optimize the training process by preventing 
-    overfitting and adjusting the learning rate when necessary.
+    ReduceLROnPlateau, which can be used to optimize the training process by preventing
+    overfitting and adjusting the learning rate when necessary. Both monitor the smoothed
+    validation loss, and an optional wall-clock budget bounds the training time.
+
+    Attributes:
+        config (CallbackConfig): Configuration of the callbacks (from params.yaml).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, config: CallbackConfig) -> None:
         """
         Initialize the ModelCallback class.
+
+        Args:
+            config (CallbackConfig): Configuration of the callbacks.
+        """
+        self.config = config
+
+    @property
+    def monitor(self) -> str:
+        return "val_loss_smoothed" if self.config.smoothing > 0 else "val_loss"
+
+    def _create_smoothing_callback(self) -> SmoothedMetric:
+        """
+        Create the callback adding the smoothed validation loss to the logs.
+
+        Returns:
+            SmoothedMetric: Configured SmoothedMetric callback instance.
         """
-        # No specific configuration is needed for this class as it uses hardcoded values.
-        pass
+        logging.info(f"Creating SmoothedMetric callback (smoothing={self.config.smoothing}).")
+        return SmoothedMetric(monitor="val_loss", smoothing=self.config.smoothing)
 
     def _create_early_stopping_callback(self) -> EarlyStopping:
         """
         Create an EarlyStopping callback.
 
-        The EarlyStopping callback is used to stop training when the validation loss
-        has stopped improving for a certain number of epochs.
+        The EarlyStopping callback is used to stop training when the (smoothed) validation
+        loss has not improved by at least `min_delta` for a certain number of epochs.
 
         Returns:
             EarlyStopping: Configured EarlyStopping callback instance.
@@ -38,9 +207,11 @@ class ModelCallback:
         try:
             logging.info("Creating EarlyStopping callback.")
             return EarlyStopping(
-                monitor="val_loss", 
-                patience=100, 
-                restore_best_weights=True, 
+                monitor=self.monitor,
+                mode="min",
+                min_delta=self.config.early_stopping_min_delta,
+                patience=self.config.early_stopping_patience,
+                restore_best_weights=True,
                 verbose=1
             )
         except Exception as e:
@@ -63,34 +234,52 @@ class ModelCallback:
         try:
             logging.info("Creating ReduceLROnPlateau callback.")
             return ReduceLROnPlateau(
-                monitor="val_loss", 
-                factor=0.8, 
-                patience=50, 
+                monitor=self.monitor,
+                mode="min",
+                factor=self.config.reduce_lr_factor,
+                patience=self.config.reduce_lr_patience,
+                min_delta=self.config.reduce_lr_min_delta,
+                min_lr=self.config.min_learning_rate,
                 verbose=1
             )
         except Exception as e:
             logging.error(f"Error occurred while creating ReduceLROnPlateau callback: {e}")
             raise CustomException(e, sys)
 
+    def _create_time_budget_callback(self) -> WallClockBudget:
+        """
+        Create a WallClockBudget callback.
+
+        Returns:
+            WallClockBudget: Callback stopping training before `max_training_minutes`.
+        """
+        logging.info(f"Creating WallClockBudget callback ({self.config.max_training_minutes} min).")
+        return WallClockBudget(max_seconds=self.config.max_training_minutes * 60)
+
     def _get_callbacks(self) -> list:
         """
         Get a list of configured callbacks to be used during model training.
 
-        This method combines the EarlyStopping and ReduceLROnPlateau callbacks
-        into a single list that can be passed to the training function.
+        The smoothing callback comes first so that the callbacks after it can monitor the
+        smoothed loss; the wall-clock budget is only added when `max_training_minutes > 0`.
 
         Returns:
-            list: List containing the EarlyStopping and ReduceLROnPlateau callbacks.
+            list: List of configured callbacks.
 
         Raises:
             CustomException: If an error occurs while getting the callbacks.
         """
         try:
             logging.info("Getting list of callbacks.")
-            callbacks = [
+            callbacks = []
+            if self.config.smoothing > 0:
+                callbacks.append(self._create_smoothing_callback())
+            callbacks += [
                 self._create_early_stopping_callback(),
                 self._create_reduce_lr_callback()
             ]
+            if self.config.max_training_minutes > 0:
+                callbacks.append(self._create_time_budget_callback())
             logging.info("Callbacks created successfully.")
             return callbacks
         except Exception as e:
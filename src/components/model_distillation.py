@@ -0,0 +1,101 @@
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+import tensorflow as tf
+from src.entity.config_entity import BaseModelConfig, DistillationConfig, TrainingConfig
+from src.components.model_base import BaseModel
+from src.components.model_training import ModelTraining
+from src.utils.common import load_model, save_json, measure_model
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+@dataclass
+class ModelDistillation:
+    """
+    Class for distilling the trained autoencoder into a lightweight student.
+
+    The student is the depthwise-separable autoencoder of `BaseModel` at
+    `student_width_multiplier`. It is trained by `ModelTraining` in distillation mode,
+    i.e. with the same data pipeline, validation schedule, callbacks and (optional)
+    progressive resizing as the teacher, on a loss mixing the clean targets and the
+    teacher outputs. The report compares teacher and student (parameters, FLOPs, latency,
+    test MSE).
+
+    Attributes:
+        config (DistillationConfig): Configuration of the distillation.
+        training_config (TrainingConfig): Configuration of the training data path.
+    """
+
+    config: DistillationConfig
+    training_config: TrainingConfig
+
+    def build_student(self) -> tf.keras.Model:
+        """Build the compiled depthwise-separable student and report its cost."""
+        model_base = BaseModel(BaseModelConfig(
+            root_dir=Path(self.config.root_dir),
+            base_model_path=Path(self.config.student_model_path),
+            updated_base_model_path=Path(self.config.student_model_path),
+            base_learning_rate=self.config.learning_rate,
+            input_shape=tuple(self.config.input_shape),
+            width_multiplier=self.config.student_width_multiplier,
+            architecture="separable",
+            architecture_report_path=Path(self.config.root_dir) / "student_architecture.json"
+        ))
+        student = model_base.build_model()
+        model_base.save_architecture_report(student)
+        return student
+
+    def _measure(self, model: tf.keras.Model) -> dict:
+        """Parameters, FLOPs, latency (batch of 1) and test MSE of a model (see `measure_model`)."""
+        return measure_model(model, self.training_config.x_test_noisy, self.training_config.test_data,
+                             tuple(self.config.input_shape), batch_size=self.training_config.batch_size,
+                             latency_runs=self.config.latency_runs)
+
+    def run(self, callbacks_list: list) -> dict:
+        """
+        Train the student and compare it with the teacher.
+
+        Args:
+            callbacks_list (list): Keras callbacks used during the student training.
+
+        Returns:
+            dict: Teacher and student measurements and the student's speedup.
+
+        Raises:
+            CustomException: If any error occurs during the distillation.
+        """
+        try:
+            teacher = load_model(path=Path(self.config.teacher_model_path), compile=False)
+            student = self.build_student()
+            logging.info(f"Distilling {teacher.count_params()} params teacher into a "
+                         f"{student.count_params()} params student.")
+
+            training = ModelTraining(replace(
+                self.training_config,
+                train_model_path=Path(self.config.student_model_path),
+                training_report_path=Path(self.config.training_report_path),
+                num_epochs=self.config.num_epochs,
+                gradient_accumulation_steps=1
+            ))
+            training.model = student
+            training.set_teacher(teacher, alpha=self.config.alpha)
+            training.train(callbacks_list)
+
+            teacher_report, student_report = self._measure(teacher), self._measure(student)
+            report = {
+                "alpha": self.config.alpha,
+                "student_width_multiplier": self.config.student_width_multiplier,
+                "teacher": {"model_path": str(self.config.teacher_model_path), **teacher_report},
+                "student": {"model_path": str(self.config.student_model_path), **student_report},
+                "speedup_p50": teacher_report["latency_ms"]["p50"] / student_report["latency_ms"]["p50"],
+                "flops_ratio": student_report["flops"] / teacher_report["flops"],
+                "mse_increase": student_report["mse"] - teacher_report["mse"],
+            }
+            save_json(path=Path(self.config.report_path), data=report)
+            logging.info(f"Student: {report['speedup_p50']:.2f}x faster, {report['flops_ratio']:.1%} of the FLOPs, "
+                         f"test MSE {student_report['mse']:.6f} vs {teacher_report['mse']:.6f} for the teacher.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the distillation: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,110 @@
+import sys
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from dataclasses import dataclass
+from src.entity.config_entity import ModelExportConfig
+from src.components.model_base import BaseModel
+from src.utils.common import load_model, save_json
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def downsampling_factor(model: tf.keras.Model) -> int:
+    """
+    Total spatial downsampling of a model, i.e. the multiple its input sizes must have.
+
+    The product of the strides of every strided layer except the transposed (upsampling)
+    convolutions: 8 for the autoencoder's three stride-2 stages.
+    """
+    factor = 1
+    for layer in model.layers:
+        strides = getattr(layer, "strides", None)
+        if strides and "Transpose" not in type(layer).__name__:
+            factor *= int(strides[0])
+    return factor
+
+
+def pad_to_multiple(images: np.ndarray, multiple: int, mode: str = "reflect") -> np.ndarray:
+    """
+    Pad the spatial axes of an (H, W, C) image or (N, H, W, C) batch to multiples of `multiple`.
+
+    Padding is added at the bottom/right, so `crop_to_shape` undoes it.
+    """
+    height, width = images.shape[-3], images.shape[-2]
+    pad_h, pad_w = -height % multiple, -width % multiple
+    if not (pad_h or pad_w):
+        return images
+    padding = [(0, 0)] * (images.ndim - 3) + [(0, pad_h), (0, pad_w), (0, 0)]
+    # Reflection needs more pixels than the pad; tiny images fall back to edge padding.
+    if mode == "reflect" and (pad_h >= height or pad_w >= width):
+        mode = "edge"
+    return np.pad(images, padding, mode=mode)
+
+
+def crop_to_shape(images: np.ndarray, shape: tuple) -> np.ndarray:
+    """Crop the spatial axes of an image or batch back to `shape` = (height, width, ...)."""
+    return images[..., :shape[0], :shape[1], :]
+
+
+@dataclass
+class ModelExport:
+    """
+    Class for exporting the trained autoencoder as a fully-convolutional model.
+
+    The trained model has a fixed `input_shape`; it only contains convolutions, so the same
+    layers and weights are rebuilt on a `(None, None, channels)` input, which accepts any
+    image whose sides are multiples of the model's downsampling factor (see
+    `pad_to_multiple`). The export is checked against the trained model on its training
+    size and saved uncompiled, as it is only used for inference.
+
+    Attributes:
+        config (ModelExportConfig): Configuration of the export.
+    """
+
+    config: ModelExportConfig
+
+    def export(self) -> tf.keras.Model:
+        """
+        Rebuild the trained model with a variable input size, verify it and save it.
+
+        Returns:
+            tf.keras.Model: The fully-convolutional model.
+
+        Raises:
+            CustomException: If the export fails or does not reproduce the trained model.
+        """
+        try:
+            model = load_model(path=Path(self.config.path_of_model), compile=False)
+            channels = model.input_shape[-1]
+            exported = BaseModel.with_input_shape(model, (None, None, channels))
+            factor = downsampling_factor(exported)
+
+            rng = np.random.default_rng(0)
+            sample = rng.random((2, *self.config.input_shape), dtype=np.float32)
+            max_difference = float(np.max(np.abs(
+                model(sample, training=False).numpy() - exported(sample, training=False).numpy()
+            )))
+            if max_difference > 1e-4:
+                raise ValueError(f"The exported model differs from the trained model (max abs diff {max_difference}).")
+
+            # Native-resolution check on a size that is not the training size.
+            height, width = self.config.input_shape[0] + factor, self.config.input_shape[1] + 2 * factor
+            output = exported(rng.random((1, height, width, channels), dtype=np.float32), training=False)
+            if tuple(output.shape[1:3]) != (height, width):
+                raise ValueError(f"Unexpected output shape {tuple(output.shape)} for a {height}x{width} input.")
+
+            BaseModel.save_model(path=Path(self.config.exported_model_path), model=exported)
+            save_json(path=Path(self.config.report_path), data={
+                "source_model": str(self.config.path_of_model),
+                "exported_model": str(self.config.exported_model_path),
+                "input_shape": [None, None, int(channels)],
+                "size_multiple": factor,
+                "max_abs_difference": max_difference,
+            })
+            logging.info(f"Fully-convolutional model exported to {self.config.exported_model_path} "
+                         f"(input sizes must be multiples of {factor}, max abs diff {max_difference:.2e}).")
+            return exported
+        except Exception as e:
+            logging.error(f"Error occurred during the model export: {e}")
+            raise CustomException(e, sys)
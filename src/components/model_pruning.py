@@ -0,0 +1,169 @@
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+from tensorflow.keras.models import Model
+from tensorflow.keras.optimizers import Adam
+from src.entity.config_entity import PruningConfig
+from src.components.model_training import ModelTraining
+from src.utils.common import load_model, read_numpy_file, save_json, measure_model
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+CONV_LAYERS = (layers.Conv2D, layers.Conv2DTranspose)
+
+
+def filter_importance(layer: layers.Layer) -> np.ndarray:
+    """
+    L1 norm of every output filter of a convolution.
+
+    Conv2D kernels are (kh, kw, in, out); Conv2DTranspose kernels are (kh, kw, out, in).
+    """
+    kernel = np.abs(layer.get_weights()[0])
+    axes = (0, 1, 3) if isinstance(layer, layers.Conv2DTranspose) else (0, 1, 2)
+    return kernel.sum(axis=axes)
+
+
+def slice_conv_weights(layer: layers.Layer, in_channels: np.ndarray, out_channels: np.ndarray) -> list:
+    """Weights of `layer` restricted to the kept input and output channels."""
+    weights = layer.get_weights()
+    kernel = weights[0]
+    if isinstance(layer, layers.Conv2DTranspose):
+        kernel = kernel[:, :, out_channels, :][:, :, :, in_channels]
+    else:
+        kernel = kernel[:, :, in_channels, :][:, :, :, out_channels]
+    return [kernel] + [bias[out_channels] for bias in weights[1:]]
+
+
+@dataclass
+class ModelPruning:
+    """
+    Class for structured (channel) pruning of the trained autoencoder.
+
+    For every pruning ratio, each hidden convolution keeps its `1 - ratio` filters of
+    largest L1 norm; the model is rebuilt with the reduced filter counts and the kept
+    slices of the weights (output filters of a layer and the matching input channels of
+    the next one), so the result is physically smaller rather than masked. The pruned
+    model is fine-tuned and measured (parameters, FLOPs, latency, test MSE), giving the
+    trade-off curve of the report. The output convolution (image channels) is never pruned.
+
+    Only chain models (every layer feeding the next one) are supported, which is the
+    structure of the autoencoder built by `BaseModel`.
+
+    Attributes:
+        config (PruningConfig): Configuration of the pruning.
+    """
+
+    config: PruningConfig
+
+    @staticmethod
+    def prune(model: tf.keras.Model, ratio: float) -> tf.keras.Model:
+        """
+        Build the channel-pruned copy of a model.
+
+        Args:
+            model (tf.keras.Model): Trained chain model.
+            ratio (float): Fraction of the filters removed from every hidden convolution.
+
+        Returns:
+            tf.keras.Model: Uncompiled model with fewer filters and the kept weights.
+
+        Raises:
+            ValueError: If the model is not a chain of layers or has unsupported weighted layers.
+        """
+        hidden = [layer for layer in model.layers if isinstance(layer, CONV_LAYERS)][:-1]
+        kept = {}
+        for layer in hidden:
+            importance = filter_importance(layer)
+            keep = max(1, int(round(len(importance) * (1.0 - ratio))))
+            kept[layer.name] = np.sort(np.argsort(importance)[::-1][:keep])
+
+        inputs = layers.Input(shape=model.input_shape[1:])
+        x = inputs
+        previous = model.inputs[0]
+        channels = np.arange(model.input_shape[-1])
+        new_weights = []
+        for layer in model.layers:
+            if isinstance(layer, layers.InputLayer):
+                continue
+            if layer.input is not previous:
+                raise ValueError(f"Layer {layer.name} does not follow the previous layer: only chain models can be pruned.")
+            previous = layer.output
+            config = layer.get_config()
+            if isinstance(layer, CONV_LAYERS):
+                out_channels = kept.get(layer.name, np.arange(config["filters"]))
+                config["filters"] = len(out_channels)
+                new_layer = type(layer).from_config(config)
+                x = new_layer(x)
+                new_weights.append((new_layer, slice_conv_weights(layer, channels, out_channels)))
+                channels = out_channels
+            elif layer.weights:
+                raise ValueError(f"Layer {layer.name} ({type(layer).__name__}) has weights and cannot be pruned.")
+            else:
+                x = type(layer).from_config(config)(x)
+
+        pruned = Model(inputs, x, name=f"{model.name}_pruned")
+        for new_layer, weights in new_weights:
+            new_layer.set_weights(weights)
+        return pruned
+
+    def _measure(self, model: tf.keras.Model, x_test: np.ndarray, y_test: np.ndarray) -> dict:
+        """Parameters, FLOPs, latency (batch of 1) and test MSE of a model (see `measure_model`)."""
+        return measure_model(model, x_test, y_test, tuple(self.config.input_shape),
+                             batch_size=self.config.batch_size, latency_runs=self.config.latency_runs)
+
+    def run(self) -> dict:
+        """
+        Prune the trained model at every configured ratio, fine-tune and measure each model.
+
+        Returns:
+            dict: Report with the baseline and one point per ratio of the trade-off curve.
+
+        Raises:
+            CustomException: If any error occurs during pruning.
+        """
+        try:
+            model = load_model(path=Path(self.config.path_of_model), compile=False)
+            x_train = read_numpy_file(Path(self.config.x_train_noisy_path), mmap_mode="r")
+            y_train = read_numpy_file(Path(self.config.train_data_path), mmap_mode="r")
+            x_test = read_numpy_file(Path(self.config.x_test_noisy_path), mmap_mode="r")
+            y_test = read_numpy_file(Path(self.config.test_data_path), mmap_mode="r")
+
+            baseline = {"ratio": 0.0, "model_path": str(self.config.path_of_model), **self._measure(model, x_test, y_test)}
+            points = []
+            for ratio in self.config.ratios:
+                pruned = self.prune(model, ratio)
+                mse_before = self._measure(pruned, x_test, y_test)["mse"]
+
+                pruned.compile(optimizer=Adam(learning_rate=self.config.learning_rate), loss="mean_squared_error")
+                if self.config.fine_tune_epochs > 0:
+                    pruned.fit(
+                        ModelTraining.make_dataset(x_train, y_train, self.config.batch_size,
+                                                   seed=self.config.random_state),
+                        epochs=self.config.fine_tune_epochs,
+                        verbose=0
+                    )
+
+                # Saved without the fine-tuning optimizer state.
+                inference_model = Model(pruned.inputs, pruned.outputs, name=pruned.name)
+                model_path = Path(self.config.root_dir) / f"pruned_{int(round(ratio * 100))}.keras"
+                inference_model.save(model_path)
+
+                point = {"ratio": ratio, "model_path": str(model_path), "mse_before_fine_tuning": mse_before,
+                         **self._measure(inference_model, x_test, y_test)}
+                point["flops_reduction"] = 1.0 - point["flops"] / baseline["flops"]
+                point["speedup_p50"] = baseline["latency_ms"]["p50"] / point["latency_ms"]["p50"]
+                points.append(point)
+                logging.info(f"Pruning ratio {ratio}: {point['params']} params, {point['flops'] / 1e9:.2f} GFLOPs "
+                             f"({point['flops_reduction']:.0%} less), p50 {point['latency_ms']['p50']:.2f} ms, "
+                             f"MSE {mse_before:.6f} -> {point['mse']:.6f} after fine-tuning.")
+
+            report = {"baseline": baseline, "pruned": points}
+            save_json(path=Path(self.config.report_path), data=report)
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the model pruning: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from src.entity.config_entity import QuantizationConfig
+from src.utils.common import load_model, read_numpy_file, save_json, memory_usage_mb
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def benchmark_backend(backend: str, model_path: str, inputs_path: str, targets_path: str,
+                      num_samples: int, num_threads: int) -> dict:
+    """
+    Process-pool entry point: benchmark one model artifact on the test split.
+
+    Every backend runs in its own fresh process, so the memory it reports is its own and
+    not inflated by the other backends: the peak RSS of the process (TensorFlow runtime
+    included) and the RSS added by loading and running the model.
+    Latency is measured per image (batch of 1, the serving case) after a warm-up.
+
+    Args:
+        backend (str): "keras" (a .keras model) or "tflite" (a .tflite model).
+        model_path (str): Path of the model artifact.
+        inputs_path (str): Noisy test images (.npy, float in [0, 1]).
+        targets_path (str): Clean test images (.npy, float in [0, 1]).
+        num_samples (int): Number of test images used.
+        num_threads (int): CPU threads given to the runtime (0 = all cores).
+
+    Returns:
+        dict: Load time, latency percentiles, MSE against the clean images and memory.
+    """
+    threads = num_threads or (os.cpu_count() or 1)
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    inputs = read_numpy_file(Path(inputs_path), mmap_mode="r")
+    targets = read_numpy_file(Path(targets_path), mmap_mode="r")
+    num_samples = min(num_samples, len(inputs))
+    rss_before_load = memory_usage_mb()["rss_mb"]
+
+    start = time.perf_counter()
+    if backend == "keras":
+        model = tf.keras.models.load_model(model_path, compile=False)
+        forward = tf.function(lambda x: model(x, training=False))
+
+        def predict(image: np.ndarray) -> np.ndarray:
+            return forward(tf.convert_to_tensor(image[np.newaxis], dtype=tf.float32)).numpy()[0]
+    else:
+        interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=threads)
+        interpreter.allocate_tensors()
+        input_index = interpreter.get_input_details()[0]["index"]
+        output_index = interpreter.get_output_details()[0]["index"]
+
+        def predict(image: np.ndarray) -> np.ndarray:
+            interpreter.set_tensor(input_index, np.asarray(image, dtype=np.float32)[np.newaxis])
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)[0]
+    load_seconds = time.perf_counter() - start
+
+    for _ in range(3):
+        predict(inputs[0])
+
+    latencies, squared_error = [], 0.0
+    for i in range(num_samples):
+        image = np.asarray(inputs[i], dtype=np.float32)
+        start = time.perf_counter()
+        output = predict(image)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        squared_error += float(np.mean((output - np.asarray(targets[i], dtype=np.float32)) ** 2))
+
+    latencies = np.asarray(latencies)
+    return {
+        "backend": backend,
+        "model_path": model_path,
+        "model_size_mb": os.path.getsize(model_path) / 2 ** 20,
+        "load_seconds": load_seconds,
+        "samples": num_samples,
+        "threads": threads,
+        "latency_ms": {"mean": float(latencies.mean()), "p50": float(np.percentile(latencies, 50)),
+                       "p99": float(np.percentile(latencies, 99))},
+        "mse": squared_error / num_samples,
+        "peak_rss_mb": memory_usage_mb()["peak_rss_mb"],
+        "model_rss_mb": memory_usage_mb()["peak_rss_mb"] - rss_before_load,
+    }
+
+
+@dataclass
+class ModelQuantization:
+    """
+    Class for converting the trained model to TFLite with full-integer (int8) quantization.
+
+    Weights and activations are quantized to int8; the activation ranges are calibrated on
+    a random slice of the noisy training images (the inputs the model actually sees). The
+    model keeps float32 inputs and outputs, so it is a drop-in replacement for the Keras
+    model. `benchmark` compares the int8 model with the float Keras model on the test split.
+
+    Attributes:
+        config (QuantizationConfig): Configuration of the quantization.
+    """
+
+    config: QuantizationConfig
+
+    def representative_dataset(self):
+        """Yield the calibration images one by one, as the TFLite converter expects."""
+        data = read_numpy_file(Path(self.config.calibration_data_path), mmap_mode="r")
+        num_samples = min(self.config.calibration_samples, len(data))
+        rng = np.random.default_rng(self.config.random_state)
+        for index in np.sort(rng.choice(len(data), size=num_samples, replace=False)):
+            yield [np.asarray(data[index:index + 1], dtype=np.float32)]
+
+    def quantize(self) -> Path:
+        """
+        Convert the trained model to an int8 TFLite model and save it.
+
+        Returns:
+            Path: Path of the TFLite model.
+
+        Raises:
+            CustomException: If the conversion fails.
+        """
+        try:
+            model = load_model(path=Path(self.config.path_of_model), compile=False)
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = self.representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            tflite_model = converter.convert()
+
+            tflite_path = Path(self.config.tflite_model_path)
+            tflite_path.parent.mkdir(parents=True, exist_ok=True)
+            tflite_path.write_bytes(tflite_model)
+            logging.info(f"int8 TFLite model saved at {tflite_path} ({len(tflite_model) / 2 ** 20:.2f} MB).")
+            return tflite_path
+        except Exception as e:
+            logging.error(f"Error occurred during the TFLite conversion: {e}")
+            raise CustomException(e, sys)
+
+    def benchmark(self) -> dict:
+        """
+        Compare latency, memory and MSE of the float Keras model and the int8 TFLite model.
+
+        Returns:
+            dict: One entry per artifact (see `benchmark_backend`) and the int8/float ratios.
+
+        Raises:
+            CustomException: If a benchmark fails.
+        """
+        try:
+            artifacts = {
+                "keras_float32": ("keras", self.config.path_of_model),
+                "keras_float32_exported": ("keras", self.config.exported_model_path),
+                "tflite_int8": ("tflite", self.config.tflite_model_path),
+            }
+            report = {}
+            for name, (backend, model_path) in artifacts.items():
+                if not Path(model_path).exists():
+                    logging.info(f"Skipping {name}: {model_path} does not exist.")
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                    report[name] = pool.submit(
+                        benchmark_backend, backend, str(model_path), str(self.config.x_test_noisy_path),
+                        str(self.config.test_data_path), self.config.benchmark_samples, self.config.num_threads
+                    ).result()
+                logging.info(f"{name}: p50 {report[name]['latency_ms']['p50']:.2f} ms, "
+                             f"MSE {report[name]['mse']:.6f}, {report[name]['model_size_mb']:.2f} MB on disk, "
+                             f"{report[name]['model_rss_mb']:.0f} MB RSS.")
+
+            if "keras_float32" in report and "tflite_int8" in report:
+                float_report, int8_report = report["keras_float32"], report["tflite_int8"]
+                report["int8_vs_float32"] = {
+                    "speedup_p50": float_report["latency_ms"]["p50"] / int8_report["latency_ms"]["p50"],
+                    "size_ratio": int8_report["model_size_mb"] / float_report["model_size_mb"],
+                    "mse_increase": int8_report["mse"] - float_report["mse"],
+                }
+            save_json(path=Path(self.config.benchmark_report_path), data=report)
+            logging.info(f"Quantization benchmark saved at {self.config.benchmark_report_path}.")
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred during the quantization benchmark: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,167 @@
+import sys
+import time
+import cv2
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from dataclasses import dataclass, field
+from src.entity.config_entity import ServingConfig
+from src.components.tiled_inference import TiledDenoiser
+from src.components.model_export import downsampling_factor, pad_to_multiple, crop_to_shape
+from src.utils.common import load_model
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+@dataclass
+class DenoisingService:
+    """
+    Class holding the served model and the image encode/decode logic of the API.
+
+    The model is loaded once, its forward pass is wrapped in a `tf.function` (graph
+    execution instead of eager Keras calls on every request) and warmed up before the
+    first request, so the first caller does not pay for tracing.
+
+    A fixed-input model gets every image resized to its input size. A fully-convolutional
+    model (see `ModelExport`) gets images at their native resolution, padded to a multiple
+    of its downsampling factor and cropped back. Images larger than the model input (or
+    than `tile_size` for a fully-convolutional model) are denoised tile by tile
+    (`TiledDenoiser`) instead, when `tile_large_images` is set.
+
+    Attributes:
+        config (ServingConfig): Configuration of the service.
+        model (tf.keras.Model): The served model, set by `load`.
+    """
+
+    config: ServingConfig
+    model: tf.keras.Model = field(default=None, init=False)
+
+    def load(self) -> None:
+        """
+        Load the model and warm it up.
+
+        Raises:
+            CustomException: If the model cannot be loaded or warmed up.
+        """
+        try:
+            self.model = load_model(path=Path(self.config.model_path), compile=False)
+            self._predict_fn = tf.function(lambda x: self.model(x, training=False), reduce_retracing=True)
+            self.size_multiple = downsampling_factor(self.model)
+            self.tiler = TiledDenoiser(self.predict, self.tile_size, self.config.tile_overlap,
+                                       self.config.tile_batch_size)
+            self.warmup()
+        except Exception as e:
+            logging.error(f"Failed to load the served model: {e}")
+            raise CustomException(e, sys)
+
+    @property
+    def input_size(self) -> tuple:
+        """(height, width) expected by the model, (None, None) for a fully-convolutional model."""
+        return tuple(self.model.input_shape[1:3])
+
+    @property
+    def fully_convolutional(self) -> bool:
+        return None in self.input_size
+
+    @property
+    def tile_size(self) -> tuple:
+        """Size of the tiles of large images (and of the warm-up inputs)."""
+        return tuple(self.config.tile_size) if self.fully_convolutional else self.input_size
+
+    def warmup(self) -> None:
+        """
+        Run `warmup_runs` inferences on blank images and log their latency.
+
+        A single image, a full dynamic batch and a full batch of tiles are run, so that the
+        traced graph already has a variable batch dimension when the first request arrives.
+        """
+        height, width = self.tile_size
+        for batch_size in sorted({1, self.config.max_batch_size, self.config.tile_batch_size}):
+            dummy = np.zeros((batch_size, height, width, self.model.input_shape[-1]), dtype=np.float32)
+            for i in range(self.config.warmup_runs):
+                start = time.perf_counter()
+                self.predict(dummy)
+                logging.info(f"Warm-up run {i + 1}/{self.config.warmup_runs} (batch {batch_size}): "
+                             f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the model on a batch of float32 images in [0, 1].
+
+        Args:
+            batch (np.ndarray): Images of shape (N, H, W, C).
+
+        Returns:
+            np.ndarray: Denoised images of the same shape.
+        """
+        return self._predict_fn(tf.convert_to_tensor(batch, dtype=tf.float32)).numpy()
+
+    @staticmethod
+    def decode_image(data: bytes) -> np.ndarray:
+        """
+        Decode an encoded image (PNG, JPEG, ...) into an RGB uint8 array.
+
+        Raises:
+            ValueError: If the bytes are not a decodable image.
+        """
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("The uploaded file is not a decodable image.")
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def encode_image(image: np.ndarray, extension: str = ".png") -> bytes:
+        """Encode an RGB uint8 array (PNG by default)."""
+        ok, buffer = cv2.imencode(extension, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+        if not ok:
+            raise ValueError(f"Failed to encode the image as {extension}.")
+        return buffer.tobytes()
+
+    def preprocess(self, image: np.ndarray) -> np.ndarray:
+        """
+        Turn an RGB uint8 image into a model input in [0, 1]: padded to the size multiple
+        for a fully-convolutional model, resized to the model input otherwise.
+        """
+        if self.fully_convolutional:
+            return pad_to_multiple(image.astype(np.float32) / 255.0, self.size_multiple)
+        height, width = self.input_size
+        resized = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        return resized.astype(np.float32) / 255.0
+
+    def postprocess(self, output: np.ndarray, original_shape: tuple) -> np.ndarray:
+        """Scale a model output back to uint8 at the original image size."""
+        height, width = original_shape[:2]
+        if self.fully_convolutional:
+            output = crop_to_shape(output, original_shape)
+        image = np.clip(output * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        if image.shape[:2] != (height, width):
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_CUBIC)
+        return image
+
+    def is_tiled(self, image: np.ndarray) -> bool:
+        """Whether `image` is denoised tile by tile rather than in a single model call."""
+        height, width = self.tile_size
+        return self.config.tile_large_images and (image.shape[0] > height or image.shape[1] > width)
+
+    def denoise(self, image: np.ndarray) -> np.ndarray:
+        """
+        Denoise one RGB uint8 image of any size.
+
+        Args:
+            image (np.ndarray): RGB uint8 image.
+
+        Returns:
+            np.ndarray: Denoised RGB uint8 image of the same size.
+        """
+        if self.is_tiled(image):
+            return self.tiler.denoise(image)
+        output = self.predict(self.preprocess(image)[np.newaxis])[0]
+        return self.postprocess(output, image.shape)
+
+    def finish(self, output: np.ndarray, original_shape: tuple) -> bytes:
+        """Turn one model output back into a PNG at the original image size."""
+        return self.encode_image(self.postprocess(output, original_shape))
+
+    def denoise_bytes(self, data: bytes) -> bytes:
+        """Decode an uploaded image, denoise it and return it PNG-encoded."""
+        return self.encode_image(self.denoise(self.decode_image(data)))
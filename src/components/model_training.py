@@ -1,12 +1,53 @@
 import tensorflow as tf
+import numpy as np
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from ..entity.config_entity import TrainingConfig
+from .gradient_accumulation import GradientAccumulationModel
+from .knowledge_distillation import DistillationModel
+from .model_base import BaseModel
+from .model_callbacks import CarryOverState, PeriodicFullValidation
 from dataclasses import dataclass
 from src.utils.exception import CustomException
 from ..utils.logger import logging
+from ..utils.common import save_json, load_model, save_inference_model, memory_usage_mb
 import sys
 from sklearn.utils import shuffle
 
+def cold_start_worker(model_path: str, compile: bool, input_shape: tuple) -> dict:
+    """
+    Process-pool entry point: time the cold start of a model in a fresh process.
+
+    The cold start is what every stage pays before its first prediction: loading the model
+    (deserialization, weights and, with `compile`, the optimizer state) and the first
+    forward pass (graph tracing).
+
+    Args:
+        model_path (str): .keras file or inference artifact directory.
+        compile (bool): Restore the optimizer and loss of a .keras file.
+        input_shape (tuple): Shape of one input image.
+
+    Returns:
+        dict: Load and first-prediction times and the resident memory after them.
+    """
+    start = time.perf_counter()
+    model = load_model(path=Path(model_path), compile=compile)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model(np.zeros((1,) + tuple(input_shape), dtype=np.float32), training=False)
+    first_predict_seconds = time.perf_counter() - start
+    return {
+        "model_path": model_path,
+        "compile": compile,
+        "load_seconds": load_seconds,
+        "first_predict_seconds": first_predict_seconds,
+        "cold_start_seconds": load_seconds + first_predict_seconds,
+        "rss_mb": memory_usage_mb()["rss_mb"],
+    }
+
+
 @dataclass
 class ModelTraining:
     """
@@ -31,6 +72,8 @@ class ModelTraining:
         """
         self.config = config
         self.model = None
+        self.teacher = None
+        self.distillation_alpha = 1.0
 
     def get_base_model(self) -> None:
         """
@@ -43,7 +86,8 @@ class ModelTraining:
             Exception: If the model cannot be loaded.
         """
         try:
-            self.model = tf.keras.models.load_model(self.config.updated_model_base_path)
+            # Compiled: training needs the optimizer and loss of the base model.
+            self.model = load_model(path=Path(self.config.updated_model_base_path))
             logging.info(f"Loaded base model from {self.config.updated_model_base_path}.")
         except Exception as e:
             logging.error(f"Error occurred while loading the base model: {e}")
@@ -51,6 +95,200 @@ class ModelTraining:
 
 
 
+    def set_teacher(self, teacher: tf.keras.Model, alpha: float) -> None:
+        """
+        Switch to distillation: `self.model` is trained as a student of `teacher`.
+
+        The teacher is rebuilt with a variable input size, so it also follows the
+        progressive-resolution schedule.
+
+        Args:
+            teacher (tf.keras.Model): The trained model to distil.
+            alpha (float): Weight of the clean-target loss, `1 - alpha` going to the teacher outputs.
+        """
+        self.teacher = BaseModel.with_input_shape(teacher, (None, None, teacher.input_shape[-1]))
+        self.distillation_alpha = alpha
+        logging.info(f"Distillation mode: loss = {alpha} * MSE(clean) + {1.0 - alpha:.2f} * MSE(teacher).")
+
+    @staticmethod
+    def make_dataset(x: np.ndarray, y: np.ndarray, batch_size: int, indices: np.ndarray = None,
+                     shuffle: bool = True, drop_remainder: bool = False, seed: int = None) -> tf.data.Dataset:
+        """
+        Build a batched tf.data pipeline that streams (noisy, clean) pairs from numpy arrays.
+
+        Batches are gathered from the arrays on demand, so memory-mapped arrays are never
+        copied into a single in-graph constant.
+
+        Args:
+            x (np.ndarray): Model inputs (noisy images).
+            y (np.ndarray): Targets (clean images).
+            batch_size (int): Number of samples per batch.
+            indices (np.ndarray, optional): Subset of sample indices to iterate over.
+            shuffle (bool): Reshuffle the indices at every pass over the data.
+            drop_remainder (bool): Drop the last incomplete batch.
+            seed (int, optional): Seed of the shuffling generator.
+
+        Returns:
+            tf.data.Dataset: Dataset yielding (x_batch, y_batch) float32 tuples.
+        """
+        indices = np.arange(len(x)) if indices is None else np.asarray(indices)
+        num_batches = len(indices) // batch_size if drop_remainder else int(np.ceil(len(indices) / batch_size))
+        rng = np.random.default_rng(seed)
+
+        def generator():
+            order = rng.permutation(indices) if shuffle else indices
+            for b in range(num_batches):
+                batch_indices = np.sort(order[b * batch_size:(b + 1) * batch_size])
+                yield (np.asarray(x[batch_indices], dtype=np.float32),
+                       np.asarray(y[batch_indices], dtype=np.float32))
+
+        signature = (
+            tf.TensorSpec(shape=(None,) + tuple(x.shape[1:]), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,) + tuple(y.shape[1:]), dtype=tf.float32),
+        )
+        dataset = tf.data.Dataset.from_generator(generator, output_signature=signature)
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(num_batches))
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def train_distributed(self, strategy: tf.distribute.Strategy, callbacks_list: list,
+                          num_epochs: int = None, save_model: bool = True) -> dict:
+        """
+        Train the autoencoder as one worker of a multi-worker data-parallel cluster.
+
+        Every worker loads the base model inside the strategy scope and reads only its own
+        shard of the training and validation data; gradients are all-reduced by the optimizer.
+        The per-replica batch size is `batch_size`, so the global batch grows with the
+        number of workers.
+
+        The loop is written with `strategy.run` instead of `model.fit`, because Keras 3 cannot
+        build a model from a multi-worker distributed batch. Callbacks are driven manually and
+        see the cross-worker mean losses, and the stop flag is all-reduced every epoch (any
+        worker stopping stops all of them), so every worker takes the same stopping decision.
+
+        Args:
+            strategy (tf.distribute.Strategy): Strategy created from TF_CONFIG
+                (e.g. MultiWorkerMirroredStrategy).
+            callbacks_list (list): List of Keras callbacks to be used during training.
+            num_epochs (int, optional): Overrides `num_epochs` from the configuration.
+            save_model (bool): Save the trained model (chief to `train_model_path`,
+                other workers to a scratch directory, as required by Keras).
+
+        Returns:
+            dict: Timing and throughput of this worker.
+
+        Raises:
+            CustomException: If an error occurs during training.
+        """
+        try:
+            resolver = strategy.cluster_resolver
+            task_id = resolver.task_id if resolver is not None else 0
+            is_chief = task_id == 0
+            num_epochs = num_epochs or self.config.num_epochs
+
+            with strategy.scope():
+                self.model = tf.keras.models.load_model(self.config.updated_model_base_path)
+            optimizer = self.model.optimizer
+            logging.info(f"Worker {task_id} loaded base model from {self.config.updated_model_base_path}.")
+
+            def sharded_input(x, y, shuffle):
+                # Equal-sized shards keep every worker on the same number of steps.
+                shard_size = len(x) // strategy.num_replicas_in_sync
+                if shard_size == 0:
+                    raise ValueError(f"{len(x)} samples cannot be sharded between "
+                                     f"{strategy.num_replicas_in_sync} replicas (at least one sample each).")
+                per_replica_batch_size = min(self.config.batch_size, shard_size)
+
+                def dataset_fn(input_context: tf.distribute.InputContext) -> tf.data.Dataset:
+                    indices = np.arange(len(x))[input_context.input_pipeline_id::input_context.num_input_pipelines]
+                    return self.make_dataset(
+                        x, y, per_replica_batch_size, indices=indices[:shard_size], shuffle=shuffle,
+                        drop_remainder=True, seed=input_context.input_pipeline_id
+                    ).repeat()
+
+                iterator = iter(strategy.distribute_datasets_from_function(dataset_fn))
+                return iterator, shard_size // per_replica_batch_size, per_replica_batch_size * strategy.num_replicas_in_sync
+
+            train_iterator, steps_per_epoch, global_batch_size = sharded_input(
+                self.config.x_train_noisy, self.config.train_data, True)
+            val_iterator, validation_steps, val_global_batch_size = sharded_input(
+                self.config.x_test_noisy, self.config.test_data, False)
+
+            def per_replica_loss(x, y, training, batch_size):
+                predictions = self.model(x, training=training)
+                per_example_loss = tf.reduce_mean(tf.square(y - predictions), axis=[1, 2, 3])
+                return tf.nn.compute_average_loss(per_example_loss, global_batch_size=batch_size)
+
+            @tf.function
+            def train_step(iterator):
+                def step_fn(inputs):
+                    x, y = inputs
+                    with tf.GradientTape() as tape:
+                        loss = per_replica_loss(x, y, True, global_batch_size)
+                    gradients = tape.gradient(loss, self.model.trainable_variables)
+                    optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+                    return loss
+                return strategy.reduce(tf.distribute.ReduceOp.SUM, strategy.run(step_fn, args=(next(iterator),)), axis=None)
+
+            @tf.function
+            def val_step(iterator):
+                def step_fn(inputs):
+                    x, y = inputs
+                    return per_replica_loss(x, y, False, val_global_batch_size)
+                return strategy.reduce(tf.distribute.ReduceOp.SUM, strategy.run(step_fn, args=(next(iterator),)), axis=None)
+
+            @tf.function
+            def any_worker_stops(vote):
+                return strategy.reduce(tf.distribute.ReduceOp.SUM, strategy.run(lambda: tf.identity(vote)), axis=None)
+
+            callbacks = tf.keras.callbacks.CallbackList(callbacks_list, model=self.model)
+            history = {"loss": [], "val_loss": []}
+            self.model.stop_training = False
+
+            logging.info(f"Worker {task_id}: {steps_per_epoch} steps/epoch, global batch size {global_batch_size}.")
+            start = time.perf_counter()
+            callbacks.on_train_begin()
+            for epoch in range(num_epochs):
+                callbacks.on_epoch_begin(epoch)
+                loss = np.mean([float(train_step(train_iterator)) for _ in range(steps_per_epoch)])
+                val_loss = np.mean([float(val_step(val_iterator)) for _ in range(validation_steps)])
+                logs = {"loss": loss, "val_loss": val_loss}
+                history["loss"].append(loss)
+                history["val_loss"].append(val_loss)
+                if is_chief:
+                    logging.info(f"Epoch {epoch + 1}/{num_epochs} - loss: {loss:.6f} - val_loss: {val_loss:.6f}")
+                callbacks.on_epoch_end(epoch, logs)
+                # Callbacks on the local clock (wall-clock budget) may disagree between
+                # workers: training stops everywhere as soon as one worker votes to stop.
+                self.model.stop_training = bool(any_worker_stops(tf.constant(float(self.model.stop_training))) > 0)
+                if self.model.stop_training:
+                    break
+            callbacks.on_train_end()
+            train_seconds = time.perf_counter() - start
+            epochs_run = len(history["loss"])
+            logging.info(f"Worker {task_id} finished training in {train_seconds:.1f}s.")
+
+            if save_model:
+                # Every worker has to save (collective ops), only the chief writes the real artifact.
+                path = Path(self.config.train_model_path) if is_chief else \
+                    Path(self.config.root_dir) / f"worker_{task_id}" / Path(self.config.train_model_path).name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.save_model(path=path, model=self.model)
+
+            return {
+                "worker_index": task_id,
+                "num_workers": strategy.num_replicas_in_sync,
+                "global_batch_size": global_batch_size,
+                "steps_per_epoch": steps_per_epoch,
+                "epochs": epochs_run,
+                "train_seconds": train_seconds,
+                "samples_per_second": steps_per_epoch * global_batch_size * epochs_run / train_seconds,
+                "final_loss": float(history["loss"][-1]) if epochs_run else None,
+                "final_val_loss": float(history["val_loss"][-1]) if epochs_run else None,
+            }
+        except Exception as e:
+            logging.error(f"Error occurred during distributed training: {e}")
+            raise CustomException(e, sys)
+
     def train(self, callbacks_list: list) -> None:
         """
         Train the autoencoder model using noisy and clean image data.
@@ -66,22 +304,234 @@ class ModelTraining:
         """
         try:
             logging.info("Starting the training process.")
-            self.model.fit(
-                self.config.x_train_noisy, self.config.train_data,
-                epochs=self.config.num_epochs,
-                batch_size=self.config.batch_size,
-                shuffle=True,
-                validation_data=(self.config.x_test_noisy, self.config.test_data),
-                callbacks=callbacks_list,
-                verbose=1
-            )
-            logging.info("Training completed successfully.")
+            start = time.perf_counter()
+            if self.config.progressive_resolutions:
+                history = self._train_progressive(callbacks_list)
+            else:
+                trainable_model = self._get_trainable_model(self.model)
+                validation_indices = self._validation_indices()
+                if validation_indices is None:
+                    validation_data = (self.config.x_test_noisy, self.config.test_data)
+                else:
+                    validation_data = (self.config.x_test_noisy[validation_indices], self.config.test_data[validation_indices])
+                    callbacks_list = [PeriodicFullValidation(
+                        (self.config.x_test_noisy, self.config.test_data),
+                        every_n_epochs=self.config.full_validation_every,
+                        batch_size=self.config.batch_size
+                    )] + callbacks_list
+                history = trainable_model.fit(
+                    self.config.x_train_noisy, self.config.train_data,
+                    epochs=self.config.num_epochs,
+                    batch_size=self.config.batch_size,
+                    shuffle=True,
+                    validation_data=validation_data,
+                    callbacks=callbacks_list,
+                    verbose=1
+                ).history
+            train_seconds = time.perf_counter() - start
+            logging.info(f"Training completed successfully in {train_seconds:.1f}s.")
             
             self.save_model(path=self.config.train_model_path, model=self.model)
             logging.info(f"Trained model saved at {self.config.train_model_path}.")
+            self.save_training_report(history, train_seconds)
         except Exception as e:
             logging.error(f"Error occurred during training: {e}")
             raise CustomException(e, sys)
+
+    def _get_trainable_model(self, model: tf.keras.Model) -> tf.keras.Model:
+        """
+        Return the model `fit` is called on.
+
+        With a teacher (see `set_teacher`) the compiled model is wrapped in a
+        DistillationModel; with `gradient_accumulation_steps > 1` it is wrapped in a
+        GradientAccumulationModel. Both reuse its optimizer and loss, so the wrapped model
+        still holds the trained weights and is the one saved.
+
+        Args:
+            model (tf.keras.Model): The compiled model to train.
+
+        Returns:
+            tf.keras.Model: The model to train.
+
+        Raises:
+            ValueError: If both distillation and gradient accumulation are requested.
+        """
+        steps = self.config.gradient_accumulation_steps
+        if self.teacher is not None:
+            if steps > 1:
+                raise ValueError("Gradient accumulation is not supported in distillation mode.")
+            trainable_model = DistillationModel(model, self.teacher, alpha=self.distillation_alpha)
+            trainable_model.compile(optimizer=model.optimizer, loss=model.loss)
+            return trainable_model
+        if steps <= 1:
+            return model
+
+        logging.info(f"Accumulating gradients over {steps} micro-batches "
+                     f"(effective batch size {self.config.batch_size * steps}).")
+        trainable_model = GradientAccumulationModel(model, accumulation_steps=steps)
+        trainable_model.compile(optimizer=model.optimizer, loss=model.loss)
+        return trainable_model
+
+    def _validation_indices(self) -> np.ndarray:
+        """
+        Pick the validation subset evaluated every epoch.
+
+        Returns:
+            np.ndarray: Sorted indices of the subset, or None to validate on the full set.
+        """
+        num_samples = len(self.config.test_data)
+        if self.config.val_subsample_fraction >= 1.0:
+            return None
+        size = min(num_samples, max(self.config.batch_size, int(num_samples * self.config.val_subsample_fraction)))
+        logging.info(f"Validating on {size}/{num_samples} samples every epoch, "
+                     f"on the full set every {self.config.full_validation_every} epochs.")
+        return np.sort(np.random.default_rng(0).choice(num_samples, size=size, replace=False))
+
+    def _progressive_schedule(self) -> list:
+        """
+        Turn `progressive_resolutions` and `progressive_switch_epochs` into training phases.
+
+        Returns:
+            list: (start_epoch, end_epoch, resolution) tuples covering `num_epochs`.
+
+        Raises:
+            ValueError: If the schedule is inconsistent.
+        """
+        resolutions = self.config.progressive_resolutions
+        switch_epochs = self.config.progressive_switch_epochs
+        if len(switch_epochs) != len(resolutions) - 1:
+            raise ValueError("progressive_resizing needs one switch epoch less than resolutions.")
+        if any(resolution % 8 for resolution in resolutions):
+            raise ValueError("Progressive resolutions must be multiples of 8 (three stride-2 stages).")
+
+        boundaries = [0] + [min(epoch, self.config.num_epochs) for epoch in switch_epochs] + [self.config.num_epochs]
+        return [
+            (boundaries[i], boundaries[i + 1], resolution)
+            for i, resolution in enumerate(resolutions)
+            if boundaries[i + 1] > boundaries[i]
+        ]
+
+    def _train_progressive(self, callbacks_list: list) -> dict:
+        """
+        Train with a progressive-resolution schedule.
+
+        The loaded model is rebuilt with a `(None, None, channels)` input sharing the same
+        convolution weights, trained phase by phase on images downsampled to each
+        resolution, and its weights are copied back into `self.model` at the end.
+        Images are downsampled with nearest-neighbour sampling, which keeps the per-pixel
+        noise statistics of the noisy inputs (area averaging would smooth the noise away).
+
+        The callbacks are shared by all phases with their state carried over (see
+        `CarryOverState`): patience and best values span the whole schedule, and a callback
+        stopping training (early stopping, time budget) ends the schedule, not just the phase.
+
+        Args:
+            callbacks_list (list): List of Keras callbacks, reused for every phase.
+
+        Returns:
+            dict: Concatenated `History.history` of all phases.
+        """
+        schedule = self._progressive_schedule()
+        full_size = tuple(self.model.input_shape[1:3])
+        optimizer = self.model.optimizer
+
+        fully_convolutional_model = BaseModel.with_input_shape(self.model, (None, None, self.model.input_shape[-1]))
+        fully_convolutional_model.compile(
+            optimizer=optimizer.__class__.from_config(optimizer.get_config()),
+            loss=self.model.loss
+        )
+        trainable_model = self._get_trainable_model(fully_convolutional_model)
+
+        validation_indices = self._validation_indices()
+        callbacks_list = callbacks_list + [CarryOverState(callbacks_list)]
+        history = {}
+        for start_epoch, end_epoch, resolution in schedule:
+            size = (resolution, resolution)
+            logging.info(f"Progressive training: epochs {start_epoch + 1}-{end_epoch} at {resolution}x{resolution}.")
+
+            def resize(x, y, size=size):
+                if size == full_size:
+                    return x, y
+                return tf.image.resize(x, size, method="nearest"), tf.image.resize(y, size, method="nearest")
+
+            train_dataset = self.make_dataset(self.config.x_train_noisy, self.config.train_data,
+                                              self.config.batch_size, shuffle=True).map(resize)
+            val_dataset = self.make_dataset(self.config.x_test_noisy, self.config.test_data, self.config.batch_size,
+                                            indices=validation_indices, shuffle=False).map(resize)
+            phase_callbacks = callbacks_list
+            if validation_indices is not None:
+                full_val_dataset = self.make_dataset(self.config.x_test_noisy, self.config.test_data,
+                                                     self.config.batch_size, shuffle=False).map(resize)
+                phase_callbacks = [PeriodicFullValidation(full_val_dataset, self.config.full_validation_every)] + callbacks_list
+            phase = trainable_model.fit(
+                train_dataset,
+                initial_epoch=start_epoch,
+                epochs=end_epoch,
+                validation_data=val_dataset,
+                callbacks=phase_callbacks,
+                verbose=1
+            )
+            for key, values in phase.history.items():
+                history.setdefault(key, []).extend(values)
+            if trainable_model.stop_training:
+                logging.info(f"Training stopped by a callback at {resolution}x{resolution}: remaining phases skipped.")
+                break
+
+        self.model.set_weights(fully_convolutional_model.get_weights())
+        return history
+
+    def export_inference_model(self) -> dict:
+        """
+        Save the trained model as an optimizer-free inference artifact and time cold starts.
+
+        The artifact (see `save_inference_model`) is what the inference-only stages load.
+        The cold start (load and first prediction, in a fresh process) is measured for the
+        full .keras model loaded with its optimizer, as before, and for the artifact.
+
+        Returns:
+            dict: Cold-start measurements of both paths and the speedup of the artifact.
+
+        Raises:
+            CustomException: If the export or a measurement fails.
+        """
+        try:
+            save_inference_model(self.model, Path(self.config.inference_model_path))
+            input_shape = tuple(self.config.x_test_noisy.shape[1:])
+            report = {}
+            for name, model_path, compile in (("keras_compiled", self.config.train_model_path, True),
+                                              ("inference_artifact", self.config.inference_model_path, False)):
+                with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                    report[name] = pool.submit(cold_start_worker, str(model_path), compile, input_shape).result()
+                logging.info(f"Cold start of {name}: load {report[name]['load_seconds']:.2f}s, "
+                             f"first prediction {report[name]['first_predict_seconds']:.2f}s.")
+            report["load_speedup"] = report["keras_compiled"]["load_seconds"] / report["inference_artifact"]["load_seconds"]
+            save_json(path=Path(self.config.load_report_path), data=report)
+            return report
+        except Exception as e:
+            logging.error(f"Error occurred while exporting the inference model: {e}")
+            raise CustomException(e, sys)
+
+    def save_training_report(self, history: dict, train_seconds: float) -> None:
+        """
+        Save the loss curves and wall-clock time of a training run, so runs with different
+        batch sizes or accumulation settings can be compared.
+
+        Args:
+            history (dict): `History.history` returned by `fit`.
+            train_seconds (float): Wall-clock duration of `fit`.
+        """
+        epochs = len(history.get("loss", []))
+        report = {
+            "batch_size": self.config.batch_size,
+            "gradient_accumulation_steps": self.config.gradient_accumulation_steps,
+            "effective_batch_size": self.config.batch_size * max(1, self.config.gradient_accumulation_steps),
+            "epochs": epochs,
+            "train_seconds": train_seconds,
+            "seconds_per_epoch": train_seconds / epochs if epochs else None,
+            # NaN marks epochs without a measurement (e.g. val_full_loss), stored as null.
+            "history": {key: [None if np.isnan(v) else float(v) for v in values] for key, values in history.items()},
+        }
+        save_json(path=Path(self.config.training_report_path), data=report)
             
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
@@ -0,0 +1,147 @@
+import sys
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from src.entity.config_entity import RegressionGateConfig
+from src.utils.common import save_json
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def collect_metrics(evaluation_report: dict, benchmark_report: dict) -> dict:
+    """
+    Flatten the metrics the gate compares.
+
+    Quality comes from the evaluation report; latency (p50, ms) and throughput (images/s)
+    of every benchmark case, keyed by backend, configured threads ("tall" for all cores),
+    batch size and input size, and the model size come from the inference benchmark report
+    (optional).
+    """
+    metrics = {name: float(evaluation_report[name]) for name in ("mse", "psnr", "ssim") if name in evaluation_report}
+    if benchmark_report:
+        metrics["model_size_mb"] = float(benchmark_report["model_size_mb"])
+        for row in benchmark_report["results"]:
+            threads = row.get("threads_setting", row["threads"])
+            case = f"{row['backend']}/t{threads}/b{row['batch_size']}/{row['input_size'][0]}x{row['input_size'][1]}"
+            metrics[f"latency_ms/{case}"] = float(row["latency_ms"]["p50"])
+            metrics[f"images_per_second/{case}"] = float(row["images_per_second"])
+    return metrics
+
+
+@dataclass
+class RegressionGate:
+    """
+    Class for gating a new model on its quality and speed against a stored baseline.
+
+    The metrics of the current evaluation and inference benchmark reports are compared with
+    the baseline's, each with its tolerance:
+        - PSNR and SSIM may not drop by more than an absolute amount;
+        - MSE, latency and model size may not grow, and throughput may not shrink, by more
+          than a relative amount.
+    A baseline metric missing from the current run (e.g. no benchmark report, or a renamed
+    benchmark case) fails the gate; a new metric is recorded without being compared. The
+    benchmark must have measured the evaluated model (same weights hash in both reports).
+    The first run (no baseline) records the baseline and passes; with `update_baseline`, a
+    passing run becomes the new baseline (the previous one is kept next to it).
+
+    Attributes:
+        config (RegressionGateConfig): Configuration of the gate.
+    """
+
+    config: RegressionGateConfig
+
+    def _limit(self, metric: str) -> tuple:
+        """(kind, tolerance, higher_is_better) of a metric."""
+        tolerances = self.config.tolerances
+        name = metric.split("/")[0]
+        return {
+            "psnr": ("absolute", tolerances["psnr_drop_db"], True),
+            "ssim": ("absolute", tolerances["ssim_drop"], True),
+            "mse": ("relative", tolerances["mse_increase"], False),
+            "model_size_mb": ("relative", tolerances["model_size_increase"], False),
+            "latency_ms": ("relative", tolerances["latency_increase"], False),
+            "images_per_second": ("relative", tolerances["throughput_decrease"], True),
+        }[name]
+
+    def compare(self, baseline: dict, current: dict) -> list:
+        """
+        Compare every baseline metric with the current run.
+
+        Returns:
+            list: One check per metric: {"metric", "baseline", "current", "kind", "change", "tolerance",
+            "status", "passed"}; "change" is signed so that a positive value is a regression, and
+            "status" is "passed", "regressed" or "missing" (absent from the current run, failed).
+        """
+        checks = []
+        for metric in sorted(baseline):
+            kind, tolerance, higher_is_better = self._limit(metric)
+            if metric not in current:
+                checks.append({"metric": metric, "baseline": baseline[metric], "current": None,
+                               "kind": kind, "change": None, "tolerance": tolerance,
+                               "status": "missing", "passed": False})
+                continue
+            regression = baseline[metric] - current[metric] if higher_is_better else current[metric] - baseline[metric]
+            if kind == "relative" and baseline[metric]:
+                regression = regression / abs(baseline[metric])
+            elif kind == "relative":
+                # No relative change from 0: any regression fails.
+                kind, tolerance = "absolute", 0.0
+            passed = regression <= tolerance
+            checks.append({"metric": metric, "baseline": baseline[metric], "current": current[metric],
+                           "kind": kind, "change": regression, "tolerance": tolerance,
+                           "status": "passed" if passed else "regressed", "passed": passed})
+        return checks
+
+    def run(self) -> dict:
+        """
+        Run the gate and write its report.
+
+        Returns:
+            dict: Gate report (status and every check).
+
+        Raises:
+            CustomException: If a metric regressed beyond its tolerance or is missing, if the
+            benchmark did not measure the evaluated model (or the reports cannot be read).
+        """
+        try:
+            evaluation_report = json.loads(Path(self.config.evaluation_report_path).read_text())
+            benchmark_path = Path(self.config.benchmark_report_path)
+            benchmark_report = json.loads(benchmark_path.read_text()) if benchmark_path.exists() else {}
+            if not benchmark_report:
+                logging.info(f"No inference benchmark at {benchmark_path}: its baseline metrics are missing.")
+            elif benchmark_report.get("model_hash") != evaluation_report.get("model_hash"):
+                raise ValueError(f"The inference benchmark at {benchmark_path} did not measure the evaluated model "
+                                 f"(weights hash {benchmark_report.get('model_hash')} != "
+                                 f"{evaluation_report.get('model_hash')}): re-run the benchmark.")
+            current = collect_metrics(evaluation_report, benchmark_report)
+
+            baseline_path = Path(self.config.baseline_path)
+            if not baseline_path.exists():
+                save_json(path=baseline_path, data=current)
+                report = {"status": "baseline_created", "checks": []}
+                save_json(path=Path(self.config.report_path), data=report)
+                logging.info(f"No baseline: the current metrics are recorded as the baseline at {baseline_path}.")
+                return report
+
+            baseline = json.loads(baseline_path.read_text())
+            checks = self.compare(baseline, current)
+            failures = [check for check in checks if not check["passed"]]
+            report = {"status": "failed" if failures else "passed", "model_hash": evaluation_report.get("model_hash"),
+                      "checks": checks}
+            save_json(path=Path(self.config.report_path), data=report)
+            if failures:
+                raise ValueError("Regression gate failed: " + "; ".join(
+                    f"{check['metric']} missing from the current run" if check["status"] == "missing" else
+                    f"{check['metric']} {check['baseline']:.6g} -> {check['current']:.6g} "
+                    f"({check['kind']} regression {check['change']:.4g} > {check['tolerance']})" for check in failures))
+
+            logging.info(f"Regression gate passed ({len(checks)} metrics compared).")
+            if self.config.update_baseline:
+                shutil.copyfile(baseline_path, baseline_path.with_suffix(".previous.json"))
+                save_json(path=baseline_path, data=current)
+                logging.info(f"Baseline updated at {baseline_path}.")
+            return report
+        except Exception as e:
+            logging.error(f"Regression gate: {e}")
+            raise CustomException(e, sys)
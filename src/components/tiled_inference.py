@@ -0,0 +1,177 @@
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+from src.utils.exception import CustomException
+from src.utils.logger import logging
+
+
+def tile_positions(length: int, tile: int, stride: int) -> list:
+    """
+    Start offsets of the tiles covering `length` pixels.
+
+    Tiles are `stride` apart; the last one is aligned on the end of the axis, so it may
+    overlap its neighbour by more than the nominal overlap. An axis shorter than a tile
+    gets a single (padded) tile.
+    """
+    if length <= tile:
+        return [0]
+    positions = list(range(0, length - tile, stride))
+    positions.append(length - tile)
+    return positions
+
+
+def blending_window(tile_size: tuple, overlap: int, eps: float = 1e-3) -> np.ndarray:
+    """
+    Separable blending weights of a tile, of shape (tile_h, tile_w, 1).
+
+    The weight is 1 in the centre and tapers over the `overlap` border pixels with a
+    squared-sine ramp; with tiles `tile - overlap` apart, the rising and falling ramps of
+    two neighbours sum to 1, so overlapping predictions are cross-faded without seams.
+    The weights never drop below `eps`, which keeps the normalisation defined on the image
+    border where a single tile contributes.
+    """
+    def ramp(size: int) -> np.ndarray:
+        weights = np.ones(size, dtype=np.float32)
+        width = min(overlap, size // 2)
+        if width > 0:
+            edge = np.sin(0.5 * np.pi * (np.arange(width) + 0.5) / width) ** 2
+            weights[:width] = edge
+            weights[-width:] = edge[::-1]
+        return np.maximum(weights, eps)
+
+    return np.outer(ramp(tile_size[0]), ramp(tile_size[1]))[..., np.newaxis].astype(np.float32)
+
+
+class TiledDenoiser:
+    """
+    Denoise images of any size with a fixed-input model, tile by tile.
+
+    The image is covered with overlapping tiles of the model input size, which are run
+    through the model in batches and blended back with `blending_window`. Tiles are
+    produced in raster order and accumulated in a rolling buffer one tile high: as soon as
+    the tiles move down, the rows above them are final, so they are normalised, written to
+    the output and dropped. Peak memory is therefore one tile row of the image (plus the
+    batch), independent of its height, and the input and output can be memory-mapped
+    (`denoise_file` with .npy files) to denoise e.g. 20k x 20k orthomosaics.
+
+    Axes shorter than a tile are reflect-padded.
+
+    Attributes:
+        predict_fn: Callable mapping an (N, tile_h, tile_w, C) float32 batch in [0, 1] to the outputs.
+        tile_size (tuple): (height, width) of the tiles, i.e. of the model input.
+        overlap (int): Overlap between neighbouring tiles, in pixels.
+        batch_size (int): Number of tiles per model call.
+    """
+
+    def __init__(self, predict_fn, tile_size: tuple, overlap: int, batch_size: int) -> None:
+        self.predict_fn = predict_fn
+        self.tile_size = tuple(int(size) for size in tile_size)
+        self.overlap = max(0, min(int(overlap), min(self.tile_size) // 2))
+        self.batch_size = max(1, int(batch_size))
+        self.window = blending_window(self.tile_size, self.overlap)
+
+    def _read_tile(self, image: np.ndarray, y: int, x: int) -> np.ndarray:
+        """Read one tile as float32 in [0, 1], reflect-padded if the image is smaller than a tile."""
+        tile_h, tile_w = self.tile_size
+        tile = np.asarray(image[y:y + tile_h, x:x + tile_w], dtype=np.float32)
+        if image.dtype == np.uint8:
+            tile /= 255.0
+        pad_h, pad_w = tile_h - tile.shape[0], tile_w - tile.shape[1]
+        if pad_h or pad_w:
+            tile = np.pad(tile, ((0, pad_h), (0, pad_w), (0, 0)), mode="reflect")
+        return tile
+
+    def denoise(self, image: np.ndarray, output: np.ndarray = None) -> np.ndarray:
+        """
+        Denoise an (H, W, C) image.
+
+        Args:
+            image (np.ndarray): uint8 image, or float image in [0, 1]; may be a memmap.
+            output (np.ndarray): Optional array (e.g. a memmap) of the image's shape the
+                result is written to; allocated with the image's dtype when omitted.
+
+        Returns:
+            np.ndarray: The denoised image, in the dtype of `output`.
+        """
+        height, width, channels = image.shape
+        tile_h, tile_w = self.tile_size
+        stride_h, stride_w = tile_h - self.overlap, tile_w - self.overlap
+        rows = tile_positions(height, tile_h, stride_h)
+        cols = tile_positions(width, tile_w, stride_w)
+        padded_w = max(width, tile_w)
+        if output is None:
+            output = np.empty(image.shape, dtype=image.dtype)
+
+        accumulator = np.zeros((tile_h, padded_w, channels), dtype=np.float32)
+        weights = np.zeros((tile_h, padded_w, 1), dtype=np.float32)
+        top = 0
+
+        def flush(num_rows: int) -> None:
+            """Write the first `num_rows` buffered rows to the output and roll the buffer."""
+            nonlocal top
+            valid = min(num_rows, height - top)
+            if valid > 0:
+                block = accumulator[:valid, :width] / weights[:valid, :width]
+                if output.dtype == np.uint8:
+                    block = np.clip(block * 255.0 + 0.5, 0, 255)
+                output[top:top + valid] = block.astype(output.dtype)
+            accumulator[:tile_h - num_rows] = accumulator[num_rows:]
+            accumulator[tile_h - num_rows:] = 0.0
+            weights[:tile_h - num_rows] = weights[num_rows:]
+            weights[tile_h - num_rows:] = 0.0
+            top += num_rows
+
+        def run_batch(coords: list, tiles: list) -> None:
+            predictions = self.predict_fn(np.stack(tiles))
+            for (y, x), prediction in zip(coords, predictions):
+                if y > top:
+                    flush(y - top)
+                accumulator[y - top:y - top + tile_h, x:x + tile_w] += prediction * self.window
+                weights[y - top:y - top + tile_h, x:x + tile_w] += self.window
+
+        coords, tiles = [], []
+        for y in rows:
+            for x in cols:
+                coords.append((y, x))
+                tiles.append(self._read_tile(image, y, x))
+                if len(tiles) == self.batch_size:
+                    run_batch(coords, tiles)
+                    coords, tiles = [], []
+        if tiles:
+            run_batch(coords, tiles)
+        flush(tile_h)
+        return output
+
+    def denoise_file(self, input_path: Path, output_path: Path) -> None:
+        """
+        Denoise an image file.
+
+        `.npy` inputs are memory-mapped and written to a memory-mapped `.npy` output, so
+        images larger than the RAM can be processed; other formats are read with OpenCV.
+
+        Args:
+            input_path (Path): Noisy image (.npy array of shape (H, W, C), or an image file).
+            output_path (Path): Where to write the denoised image (same format).
+
+        Raises:
+            CustomException: If the image cannot be read, denoised or written.
+        """
+        try:
+            input_path, output_path = Path(input_path), Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if input_path.suffix == ".npy":
+                image = np.load(input_path, mmap_mode="r")
+                output = np.lib.format.open_memmap(output_path, mode="w+", dtype=image.dtype, shape=image.shape)
+                self.denoise(image, output)
+                output.flush()
+            else:
+                image = cv2.imread(str(input_path), cv2.IMREAD_COLOR)
+                if image is None:
+                    raise ValueError(f"Cannot read the image {input_path}.")
+                denoised = self.denoise(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                cv2.imwrite(str(output_path), cv2.cvtColor(denoised, cv2.COLOR_RGB2BGR))
+            logging.info(f"Denoised {input_path} ({image.shape[1]}x{image.shape[0]}) to {output_path}.")
+        except Exception as e:
+            logging.error(f"Tiled denoising of {input_path} failed: {e}")
+            raise CustomException(e, sys)
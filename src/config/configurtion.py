@@ -4,11 +4,14 @@ import numpy as np
 from src.utils.logger import logging
 from src.utils.exception import CustomException
 from src.utils.common import create_directories, read_yaml ,read_numpy_file
-from src.entity.config_entity import DataIngestionConfig , DataPreprocessingConfig ,BaseModelConfig ,TrainingConfig ,ModelEvaluationConfig
+from src.entity.config_entity import DataIngestionConfig , DataPreprocessingConfig ,BaseModelConfig ,TrainingConfig ,ModelEvaluationConfig ,DistributedTrainingConfig ,CallbackConfig ,HyperparameterSearchConfig ,ServingConfig ,ModelExportConfig ,BatchInferenceConfig ,QuantizationConfig ,PruningConfig ,DistillationConfig ,CheckpointEvaluationConfig ,InferenceBenchmarkConfig ,RegressionGateConfig ,PipelineConfig
 
 class Configuration:
     def __init__(self, config_file_path: Path, params_file_path: Path):
         try:
+            self.config_file_path = config_file_path
+            self.params_file_path = params_file_path
+
             # Load configurations
             self.config = read_yaml(config_file_path)
             self.params = read_yaml(params_file_path)
@@ -53,6 +56,8 @@ class Configuration:
             root_dir=config.root_dir,
             train_data_path=Path(self.get_data_ingestion_config().train_data_path),
             test_data_path=Path(self.get_data_ingestion_config().test_data_path),
+            train_normalized_path=Path(config.train_normalized_path),
+            test_normalized_path=Path(config.test_normalized_path),
             x_train_noisy_path=config.x_train_noisy_path,
             x_test_noisy_path=config.x_test_noisy_path,
             noise_factor=self.params.noise_factor
@@ -68,52 +73,295 @@ class Configuration:
             base_model_path=config.base_model_path,
             updated_base_model_path=config.updated_base_model_path,
             base_learning_rate=float(self.params.base_learning_rate),
-            input_shape=tuple(list(self.params.input_shape))
+            input_shape=tuple(list(self.params.input_shape)),
+            width_multiplier=float(self.params.width_multiplier),
+            architecture=str(self.params.architecture),
+            architecture_report_path=Path(config.architecture_report_path)
         )
         return base_model_config
 
-    def get_training_config(self) -> TrainingConfig:
+    def get_training_config(self, mmap_mode=None) -> TrainingConfig:
+        """
+        Args:
+            mmap_mode (str, optional): Memory-map the .npy datasets instead of loading
+                them (e.g. "r"), so several processes can share the page cache.
+        """
         training = self.config.training
+        progressive = self.params.progressive_resizing
         create_directories([training.root_dir])
         training_config = TrainingConfig(
             root_dir=Path(training.root_dir), #data
             train_model_path=Path(training.train_model_path), # artifacts/training/
             updated_model_base_path=self.get_base_model_config().updated_base_model_path,
-            train_data = read_numpy_file(Path(self.get_data_ingestion_config().train_data_path)),
-            test_data = read_numpy_file(Path(self.get_data_ingestion_config().test_data_path)),
-            x_train_noisy =read_numpy_file(Path(self.get_data_preprocessing_config().x_train_noisy_path)),
-            x_test_noisy = read_numpy_file(Path(self.get_data_preprocessing_config().x_test_noisy_path)),
+            train_data = read_numpy_file(Path(self.get_data_preprocessing_config().train_normalized_path), mmap_mode=mmap_mode),
+            test_data = read_numpy_file(Path(self.get_data_preprocessing_config().test_normalized_path), mmap_mode=mmap_mode),
+            x_train_noisy =read_numpy_file(Path(self.get_data_preprocessing_config().x_train_noisy_path), mmap_mode=mmap_mode),
+            x_test_noisy = read_numpy_file(Path(self.get_data_preprocessing_config().x_test_noisy_path), mmap_mode=mmap_mode),
             num_epochs = self.params.num_epochs,
-            batch_size = self.params.batch_size
+            batch_size = self.params.batch_size,
+            gradient_accumulation_steps = int(self.params.gradient_accumulation_steps),
+            training_report_path = Path(training.training_report_path),
+            inference_model_path = Path(training.inference_model_path),
+            load_report_path = Path(training.load_report_path),
+            progressive_resolutions = list(progressive.resolutions) if progressive.enabled else [],
+            progressive_switch_epochs = list(progressive.switch_epochs) if progressive.enabled else [],
+            val_subsample_fraction = float(self.params.callbacks.val_subsample_fraction),
+            full_validation_every = int(self.params.callbacks.full_validation_every)
         )
         return training_config
 
+    def get_callback_config(self) -> CallbackConfig:
+        callbacks = self.params.callbacks
+        callback_config = CallbackConfig(
+            smoothing=float(callbacks.smoothing),
+            early_stopping_patience=int(callbacks.early_stopping_patience),
+            early_stopping_min_delta=float(callbacks.early_stopping_min_delta),
+            reduce_lr_patience=int(callbacks.reduce_lr_patience),
+            reduce_lr_factor=float(callbacks.reduce_lr_factor),
+            reduce_lr_min_delta=float(callbacks.reduce_lr_min_delta),
+            min_learning_rate=float(callbacks.min_learning_rate),
+            max_training_minutes=float(callbacks.max_training_minutes)
+        )
+        return callback_config
+
+    def get_distributed_training_config(self) -> DistributedTrainingConfig:
+        training = self.config.training
+        distributed = self.params.distributed
+        create_directories([training.root_dir])
+        distributed_training_config = DistributedTrainingConfig(
+            root_dir=Path(training.root_dir),
+            config_file_path=Path(self.config_file_path),
+            params_file_path=Path(self.params_file_path),
+            num_workers=int(distributed.num_workers),
+            base_port=int(distributed.base_port),
+            benchmark_workers=list(distributed.benchmark_workers),
+            benchmark_epochs=int(distributed.benchmark_epochs),
+            scaling_report_path=Path(training.scaling_report_path)
+        )
+        return distributed_training_config
+
+    def get_distillation_config(self) -> DistillationConfig:
+        config = self.config.distillation
+        params = self.params.distillation
+        create_directories([config.root_dir])
+        distillation_config = DistillationConfig(
+            root_dir=Path(config.root_dir),
+            teacher_model_path=Path(self.config.training.train_model_path),
+            student_model_path=Path(config.student_model_path),
+            training_report_path=Path(config.training_report_path),
+            report_path=Path(config.report_path),
+            alpha=float(params.alpha),
+            student_width_multiplier=float(params.student_width_multiplier),
+            learning_rate=float(params.learning_rate),
+            num_epochs=int(params.num_epochs),
+            latency_runs=int(params.latency_runs),
+            input_shape=tuple(list(self.params.input_shape))
+        )
+        return distillation_config
+
+    def get_hyperparameter_search_config(self) -> HyperparameterSearchConfig:
+        config = self.config.hyperparameter_search
+        search = self.params.hyperparameter_search
+        create_directories([config.root_dir])
+        hyperparameter_search_config = HyperparameterSearchConfig(
+            root_dir=Path(config.root_dir),
+            report_path=Path(config.report_path),
+            train_data_path=Path(self.get_data_preprocessing_config().train_normalized_path),
+            test_data_path=Path(self.get_data_preprocessing_config().test_normalized_path),
+            input_shape=tuple(list(self.params.input_shape)),
+            architecture=str(self.params.architecture),
+            random_state=self.params.random_state,
+            learning_rates=[float(lr) for lr in search.learning_rates],
+            batch_sizes=list(search.batch_sizes),
+            noise_factors=[float(nf) for nf in search.noise_factors],
+            width_multipliers=[float(w) for w in search.width_multipliers],
+            num_trials=int(search.num_trials),
+            min_epochs=int(search.min_epochs),
+            max_epochs=int(search.max_epochs),
+            reduction_factor=int(search.reduction_factor),
+            max_workers=int(search.max_workers),
+            tracking_uri=str(search.tracking_uri),
+            experiment_name=str(search.experiment_name)
+        )
+        return hyperparameter_search_config
+
+    def get_model_export_config(self) -> ModelExportConfig:
+        config = self.config.model_export
+        create_directories([config.root_dir])
+        model_export_config = ModelExportConfig(
+            root_dir=Path(config.root_dir),
+            path_of_model=Path(self.config.training.train_model_path),
+            exported_model_path=Path(config.exported_model_path),
+            report_path=Path(config.report_path),
+            input_shape=tuple(list(self.params.input_shape))
+        )
+        return model_export_config
+
+    def get_pruning_config(self) -> PruningConfig:
+        config = self.config.pruning
+        params = self.params.pruning
+        create_directories([config.root_dir])
+        pruning_config = PruningConfig(
+            root_dir=Path(config.root_dir),
+            report_path=Path(config.report_path),
+            path_of_model=Path(self.config.training.train_model_path),
+            train_data_path=Path(self.config.data_preprocessing.train_normalized_path),
+            x_train_noisy_path=Path(self.config.data_preprocessing.x_train_noisy_path),
+            test_data_path=Path(self.config.data_preprocessing.test_normalized_path),
+            x_test_noisy_path=Path(self.config.data_preprocessing.x_test_noisy_path),
+            ratios=[float(ratio) for ratio in params.ratios],
+            fine_tune_epochs=int(params.fine_tune_epochs),
+            batch_size=int(self.params.batch_size),
+            learning_rate=float(params.learning_rate),
+            latency_runs=int(params.latency_runs),
+            input_shape=tuple(list(self.params.input_shape)),
+            random_state=int(self.params.random_state)
+        )
+        return pruning_config
+
+    def get_quantization_config(self) -> QuantizationConfig:
+        config = self.config.quantization
+        params = self.params.quantization
+        create_directories([config.root_dir])
+        quantization_config = QuantizationConfig(
+            root_dir=Path(config.root_dir),
+            path_of_model=Path(self.config.training.train_model_path),
+            exported_model_path=Path(self.config.model_export.exported_model_path),
+            tflite_model_path=Path(config.tflite_model_path),
+            benchmark_report_path=Path(config.benchmark_report_path),
+            calibration_data_path=Path(self.config.data_preprocessing.x_train_noisy_path),
+            x_test_noisy_path=Path(self.config.data_preprocessing.x_test_noisy_path),
+            test_data_path=Path(self.config.data_preprocessing.test_normalized_path),
+            calibration_samples=int(params.calibration_samples),
+            benchmark_samples=int(params.benchmark_samples),
+            num_threads=int(params.num_threads),
+            random_state=int(self.params.random_state)
+        )
+        return quantization_config
+
+    def get_serving_config(self) -> ServingConfig:
+        config = self.config.serving
+        serving = self.params.serving
+        create_directories([config.root_dir])
+        serving_config = ServingConfig(
+            root_dir=Path(config.root_dir),
+            model_path=Path(config.model_path),
+            load_test_report_path=Path(config.load_test_report_path),
+            host=str(serving.host),
+            port=int(serving.port),
+            warmup_runs=int(serving.warmup_runs),
+            max_batch_size=int(serving.max_batch_size),
+            max_wait_ms=float(serving.max_wait_ms),
+            tile_large_images=bool(serving.tile_large_images),
+            tile_size=tuple(list(serving.tile_size)),
+            tile_overlap=int(serving.tile_overlap),
+            tile_batch_size=int(serving.tile_batch_size)
+        )
+        return serving_config
+
+    def get_batch_inference_config(self) -> BatchInferenceConfig:
+        config = self.config.batch_inference
+        params = self.params.batch_inference
+        create_directories([config.root_dir])
+        batch_inference_config = BatchInferenceConfig(
+            root_dir=Path(config.root_dir),
+            report_path=Path(config.report_path),
+            batch_size=int(params.batch_size),
+            decode_workers=int(params.decode_workers),
+            write_workers=int(params.write_workers),
+            queue_size=int(params.queue_size),
+            extensions=list(params.extensions),
+            output_extension=str(params.output_extension)
+        )
+        return batch_inference_config
+
     def get_model_evaluation_config(self) -> ModelEvaluationConfig :
         model_evaluation=self.config.evaluation
         create_directories([model_evaluation.root_dir])
         model_evaluation_config = ModelEvaluationConfig(
             root_dir= model_evaluation.root_dir,
-            path_of_model= Path(self.get_training_config().train_model_path),
+            path_of_model= Path(self.config.training.inference_model_path),
             evaluation_report_path = Path(model_evaluation.evaluation_report_path),
-            X_test = read_numpy_file(Path(self.get_data_ingestion_config().test_data_path)),
-            x_test_noisy = read_numpy_file(Path(self.get_data_preprocessing_config().x_test_noisy_path)),
+            X_test = read_numpy_file(Path(self.get_data_preprocessing_config().test_normalized_path), mmap_mode="r"),
+            x_test_noisy = read_numpy_file(Path(self.get_data_preprocessing_config().x_test_noisy_path), mmap_mode="r"),
             num_epochs = self.params.num_epochs,
             batch_size = self.params.batch_size,
             base_learning_rate = float(self.params.base_learning_rate),
-            im_size = tuple(list(self.params.im_size))
+            im_size = tuple(list(self.params.im_size)),
+            evaluation_batch_size = int(self.params.evaluation.batch_size),
+            worst_k = int(self.params.evaluation.worst_k),
+            num_sample_images = int(self.params.evaluation.sample_images),
+            num_extreme_images = int(self.params.evaluation.figures.extreme_images),
+            figure_columns = int(self.params.evaluation.figures.columns),
+            figure_workers = int(self.params.evaluation.figures.workers),
+            noise_types = list(self.params.evaluation.noise_grid.types),
+            noise_levels = [float(level) for level in self.params.evaluation.noise_grid.levels],
+            random_state = int(self.params.random_state),
+            tracking_uri = str(self.params.evaluation.tracking_uri),
+            experiment_name = str(self.params.evaluation.experiment_name),
+            model_cache_path = Path(model_evaluation.model_cache_path)
 
         )
         return model_evaluation_config
 
+    def get_checkpoint_evaluation_config(self) -> CheckpointEvaluationConfig:
+        config = self.config.checkpoint_evaluation
+        params = self.params.checkpoint_evaluation
+        create_directories([config.root_dir])
+        checkpoint_evaluation_config = CheckpointEvaluationConfig(
+            root_dir=Path(config.root_dir),
+            leaderboard_path=Path(config.leaderboard_path),
+            test_data_path=Path(self.config.data_preprocessing.test_normalized_path),
+            x_test_noisy_path=Path(self.config.data_preprocessing.x_test_noisy_path),
+            model_patterns=list(params.model_patterns),
+            max_workers=int(params.max_workers)
+        )
+        return checkpoint_evaluation_config
 
+    def get_inference_benchmark_config(self) -> InferenceBenchmarkConfig:
+        config = self.config.inference_benchmark
+        params = self.params.inference_benchmark
+        create_directories([config.root_dir, Path(config.report_path).parent])
+        inference_benchmark_config = InferenceBenchmarkConfig(
+            report_path=Path(config.report_path),
+            model_path=Path(self.config.model_export.exported_model_path),
+            tflite_model_path=Path(config.tflite_model_path),
+            im_size=tuple(list(self.params.im_size)),
+            backends=list(params.backends),
+            batch_sizes=[int(batch_size) for batch_size in params.batch_sizes],
+            input_sizes=[int(size) for size in params.input_sizes],
+            threads=[int(count) for count in params.threads],
+            max_pixels_per_call=int(params.max_pixels_per_call),
+            runs=int(params.runs),
+            warmup=int(params.warmup)
+        )
+        return inference_benchmark_config
 
+    def get_regression_gate_config(self) -> RegressionGateConfig:
+        config = self.config.regression_gate
+        params = self.params.regression_gate
+        create_directories([config.root_dir])
+        regression_gate_config = RegressionGateConfig(
+            baseline_path=Path(config.baseline_path),
+            report_path=Path(config.report_path),
+            evaluation_report_path=Path(self.config.evaluation.evaluation_report_path),
+            benchmark_report_path=Path(self.config.inference_benchmark.report_path),
+            update_baseline=bool(params.update_baseline),
+            tolerances={key: float(value) for key, value in params.tolerances.items()}
+        )
+        return regression_gate_config
 
-
-
-
-    
-
-
-
-
-
+    def get_pipeline_config(self) -> PipelineConfig:
+        config = self.config.pipeline
+        params = self.params.pipeline
+        create_directories([config.root_dir])
+        pipeline_config = PipelineConfig(
+            root_dir=Path(config.root_dir),
+            report_path=Path(config.report_path),
+            max_workers=int(params.max_workers),
+            cpu_cores=int(params.cpu_cores),
+            memory_limit_mb=float(params.memory_limit_mb),
+            variant_memory_mb=float(params.variant_memory_mb),
+            variants=[dict(variant) for variant in params.variants]
+        )
+        return pipeline_config
@@ -32,8 +32,10 @@ class DataPreprocessingConfig:
 
     Attributes:
         root_dir (Path): The root directory for storing processed data.
-        train_data (np.ndarray): The training data as a numpy array.
-        test_data (np.ndarray): The testing data as a numpy array.
+        train_data_path (Path): Path of the ingested (uint8) training images.
+        test_data_path (Path): Path of the ingested (uint8) testing images.
+        train_normalized_path (Path): Path to store the training images scaled to [0, 1].
+        test_normalized_path (Path): Path to store the testing images scaled to [0, 1].
         x_train_noisy_path (Path): Path to store noisy versions of the training data.
         x_test_noisy_path (Path): Path to store noisy versions of the testing data.
         noise_factor (int): Factor by which noise is added to the data.
@@ -41,6 +43,8 @@ class DataPreprocessingConfig:
     root_dir : Path
     train_data_path : Path
     test_data_path : Path
+    train_normalized_path : Path
+    test_normalized_path : Path
     x_train_noisy_path: Path
     x_test_noisy_path: Path
     noise_factor : int
@@ -57,12 +61,18 @@ class BaseModelConfig:
         updated_base_model_path (Path): Path to save the updated base model after training.
         base_learning_rate (int): The initial learning rate for model training.
         im_size (tuple): The size of the input images for the model (height, width).
+        width_multiplier (float): Scale factor of the number of filters of every hidden layer.
+        architecture (str): Name of the architecture in the `ARCHITECTURES` registry of model_base.
+        architecture_report_path (Path): Path to save the params/FLOPs/latency of the built model.
     """
     root_dir: Path
     base_model_path: Path
     updated_base_model_path : Path
     base_learning_rate : float
     input_shape: tuple
+    width_multiplier: float
+    architecture: str
+    architecture_report_path: Path
 
 
 @dataclass(frozen=True)
@@ -80,6 +90,14 @@ class TrainingConfig:
         x_test_noisy (np.ndarray): The noisy testing data.
         num_epochs (int): Number of epochs to train the model.
         batch_size (int): The batch size used during training.
+        gradient_accumulation_steps (int): Number of micro-batches accumulated per optimizer update.
+        training_report_path (Path): Path to save the training report (history and wall-clock time).
+        inference_model_path (Path): Directory of the optimizer-free inference artifact of the trained model.
+        load_report_path (Path): Path to save the cold-start times of the .keras model and the inference artifact.
+        progressive_resolutions (list): Training resolutions, in order; empty to always train at full size.
+        progressive_switch_epochs (list): Epochs at which training switches to the next resolution.
+        val_subsample_fraction (float): Fraction of the validation set evaluated every epoch.
+        full_validation_every (int): Number of epochs between two evaluations on the full validation set.
     """
     root_dir: Path
     train_model_path : Path
@@ -90,6 +108,289 @@ class TrainingConfig:
     x_test_noisy : np.ndarray
     num_epochs : int
     batch_size: int
+    gradient_accumulation_steps: int
+    training_report_path: Path
+    inference_model_path: Path
+    load_report_path: Path
+    progressive_resolutions: list
+    progressive_switch_epochs: list
+    val_subsample_fraction: float
+    full_validation_every: int
+
+
+@dataclass(frozen=True)
+class CallbackConfig:
+    """
+    Configuration class for the training callbacks.
+
+    Attributes:
+        smoothing (float): EMA factor applied to the validation loss before plateau detection.
+        early_stopping_patience (int): Epochs without improvement before stopping.
+        early_stopping_min_delta (float): Minimum decrease of the monitored loss counted as an improvement.
+        reduce_lr_patience (int): Epochs without improvement before reducing the learning rate.
+        reduce_lr_factor (float): Factor applied to the learning rate on a plateau.
+        reduce_lr_min_delta (float): Minimum decrease counted as an improvement by ReduceLROnPlateau.
+        min_learning_rate (float): Lower bound of the learning rate.
+        max_training_minutes (float): Wall-clock training budget in minutes (0 disables it).
+    """
+    smoothing: float
+    early_stopping_patience: int
+    early_stopping_min_delta: float
+    reduce_lr_patience: int
+    reduce_lr_factor: float
+    reduce_lr_min_delta: float
+    min_learning_rate: float
+    max_training_minutes: float
+
+
+@dataclass(frozen=True)
+class DistributedTrainingConfig:
+    """
+    Configuration class for multi-worker data-parallel training on a single host.
+
+    Attributes:
+        root_dir (Path): The root directory for storing trained models and reports.
+        config_file_path (Path): Path to config.yaml, re-read by every worker process.
+        params_file_path (Path): Path to params.yaml, re-read by every worker process.
+        num_workers (int): Number of local worker processes used for training.
+        base_port (int): First localhost port of the worker cluster (one port per worker).
+        benchmark_workers (list): Worker counts used by the scaling benchmark.
+        benchmark_epochs (int): Number of epochs trained for each benchmark run.
+        scaling_report_path (Path): Path to save the scaling benchmark report.
+    """
+    root_dir: Path
+    config_file_path: Path
+    params_file_path: Path
+    num_workers: int
+    base_port: int
+    benchmark_workers: list
+    benchmark_epochs: int
+    scaling_report_path: Path
+
+
+@dataclass(frozen=True)
+class DistillationConfig:
+    """
+    Configuration class for the knowledge distillation into a lightweight student.
+
+    Attributes:
+        root_dir (Path): Directory for the student model and reports.
+        teacher_model_path (Path): Path of the trained (teacher) model.
+        student_model_path (Path): Path to save the trained student.
+        training_report_path (Path): Path to save the student's training report.
+        report_path (Path): Path to save the teacher/student comparison.
+        alpha (float): Weight of the clean-target loss (1 - alpha on the teacher outputs).
+        student_width_multiplier (float): Width multiplier of the depthwise-separable student.
+        learning_rate (float): Learning rate of the student.
+        num_epochs (int): Number of training epochs of the student.
+        latency_runs (int): Number of timed inferences per model in the comparison.
+        input_shape (tuple): Input shape of the models.
+    """
+    root_dir: Path
+    teacher_model_path: Path
+    student_model_path: Path
+    training_report_path: Path
+    report_path: Path
+    alpha: float
+    student_width_multiplier: float
+    learning_rate: float
+    num_epochs: int
+    latency_runs: int
+    input_shape: tuple
+
+
+@dataclass(frozen=True)
+class HyperparameterSearchConfig:
+    """
+    Configuration class for the hyperparameter sweep.
+
+    Attributes:
+        root_dir (Path): Directory holding one sub-directory (checkpoint) per trial.
+        report_path (Path): Path to save the sweep report.
+        train_data_path (Path): Path to the normalized clean training images.
+        test_data_path (Path): Path to the normalized clean testing images.
+        input_shape (tuple): Input shape of the autoencoder.
+        architecture (str): Architecture of every trial (see `ARCHITECTURES` in model_base).
+        random_state (int): Seed of trial sampling and noise generation.
+        learning_rates (list): Learning rates searched.
+        batch_sizes (list): Batch sizes searched.
+        noise_factors (list): Noise factors searched.
+        width_multipliers (list): Architecture width multipliers searched.
+        num_trials (int): Number of trials sampled from the grid (0 for the full grid).
+        min_epochs (int): Epoch budget of the first successive-halving rung.
+        max_epochs (int): Epoch budget of the last rung.
+        reduction_factor (int): Each rung keeps the best 1/reduction_factor trials.
+        max_workers (int): Size of the process pool (0 for one worker per CPU core).
+        tracking_uri (str): MLflow tracking URI (a local `file:` store).
+        experiment_name (str): MLflow experiment of the sweep.
+    """
+    root_dir: Path
+    report_path: Path
+    train_data_path: Path
+    test_data_path: Path
+    input_shape: tuple
+    architecture: str
+    random_state: int
+    learning_rates: list
+    batch_sizes: list
+    noise_factors: list
+    width_multipliers: list
+    num_trials: int
+    min_epochs: int
+    max_epochs: int
+    reduction_factor: int
+    max_workers: int
+    tracking_uri: str
+    experiment_name: str
+
+
+@dataclass(frozen=True)
+class ModelExportConfig:
+    """
+    Configuration class for the fully-convolutional model export.
+
+    Attributes:
+        root_dir (Path): Directory for the exported model.
+        path_of_model (Path): Path of the trained model.
+        exported_model_path (Path): Path to save the variable-input-size model.
+        report_path (Path): Path to save the export report.
+        input_shape (tuple): Input shape the model was trained on, used to verify the export.
+    """
+    root_dir: Path
+    path_of_model: Path
+    exported_model_path: Path
+    report_path: Path
+    input_shape: tuple
+
+
+@dataclass(frozen=True)
+class PruningConfig:
+    """
+    Configuration class for the structured channel pruning.
+
+    Attributes:
+        root_dir (Path): Directory for the pruned models.
+        report_path (Path): Path to save the trade-off report.
+        path_of_model (Path): Path of the trained model.
+        train_data_path (Path): Clean training images (fine-tuning targets).
+        x_train_noisy_path (Path): Noisy training images (fine-tuning inputs).
+        test_data_path (Path): Clean test images.
+        x_test_noisy_path (Path): Noisy test images.
+        ratios (list): Fractions of the filters removed, one pruned model per ratio.
+        fine_tune_epochs (int): Fine-tuning epochs after pruning.
+        batch_size (int): Batch size of fine-tuning and evaluation.
+        learning_rate (float): Learning rate of the fine-tuning.
+        latency_runs (int): Number of timed inferences per model.
+        input_shape (tuple): Input shape of the model.
+        random_state (int): Seed of the fine-tuning shuffling.
+    """
+    root_dir: Path
+    report_path: Path
+    path_of_model: Path
+    train_data_path: Path
+    x_train_noisy_path: Path
+    test_data_path: Path
+    x_test_noisy_path: Path
+    ratios: list
+    fine_tune_epochs: int
+    batch_size: int
+    learning_rate: float
+    latency_runs: int
+    input_shape: tuple
+    random_state: int
+
+
+@dataclass(frozen=True)
+class QuantizationConfig:
+    """
+    Configuration class for the int8 TFLite conversion and its benchmark.
+
+    Attributes:
+        root_dir (Path): Directory for the quantized model and the benchmark.
+        path_of_model (Path): Path of the trained (float) model.
+        exported_model_path (Path): Path of the fully-convolutional model export, also benchmarked.
+        tflite_model_path (Path): Path to save the int8 TFLite model.
+        benchmark_report_path (Path): Path to save the benchmark report.
+        calibration_data_path (Path): Noisy training images used for calibration.
+        x_test_noisy_path (Path): Noisy test images used for the benchmark.
+        test_data_path (Path): Clean test images used for the benchmark MSE.
+        calibration_samples (int): Number of calibration images.
+        benchmark_samples (int): Number of benchmark images.
+        num_threads (int): CPU threads of the benchmarked runtimes (0 = all cores).
+        random_state (int): Seed of the calibration sample.
+    """
+    root_dir: Path
+    path_of_model: Path
+    exported_model_path: Path
+    tflite_model_path: Path
+    benchmark_report_path: Path
+    calibration_data_path: Path
+    x_test_noisy_path: Path
+    test_data_path: Path
+    calibration_samples: int
+    benchmark_samples: int
+    num_threads: int
+    random_state: int
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    """
+    Configuration class for the denoising inference service.
+
+    Attributes:
+        root_dir (Path): Directory for serving artifacts (load-test reports).
+        model_path (Path): Path of the trained model served.
+        load_test_report_path (Path): Path to save the load-test report.
+        host (str): Host the API listens on.
+        port (int): Port the API listens on.
+        warmup_runs (int): Number of inference calls run at startup before serving.
+        max_batch_size (int): Largest batch of concurrent requests per model call (1 disables batching).
+        max_wait_ms (float): Longest wait of the first request of a batch for other requests.
+        tile_large_images (bool): Denoise images larger than the model input tile by tile.
+        tile_size (tuple): Tile size (height, width) used when the model accepts any input size.
+        tile_overlap (int): Overlap in pixels between neighbouring tiles.
+        tile_batch_size (int): Number of tiles per model call.
+    """
+    root_dir: Path
+    model_path: Path
+    load_test_report_path: Path
+    host: str
+    port: int
+    warmup_runs: int
+    max_batch_size: int
+    max_wait_ms: float
+    tile_large_images: bool
+    tile_size: tuple
+    tile_overlap: int
+    tile_batch_size: int
+
+
+@dataclass(frozen=True)
+class BatchInferenceConfig:
+    """
+    Configuration class for the batch denoising of image folders.
+
+    Attributes:
+        root_dir (Path): Directory for batch inference artifacts.
+        report_path (Path): Path to save the report of the last run.
+        batch_size (int): Number of images per model call.
+        decode_workers (int): Threads decoding the input images.
+        write_workers (int): Threads encoding and writing the outputs.
+        queue_size (int): Maximum number of images decoded ahead or waiting to be written.
+        extensions (list): File extensions of the input images.
+        output_extension (str): Extension (format) of the denoised images.
+    """
+    root_dir: Path
+    report_path: Path
+    batch_size: int
+    decode_workers: int
+    write_workers: int
+    queue_size: int
+    extensions: list
+    output_extension: str
+
+
 @dataclass(frozen=True)
 class ModelEvaluationConfig:
     root_dir: Path
@@ -101,17 +402,113 @@ class ModelEvaluationConfig:
     batch_size : int
     base_learning_rate : float
     im_size : tuple
+    evaluation_batch_size : int
+    worst_k : int
+    num_sample_images : int
+    num_extreme_images : int
+    figure_columns : int
+    figure_workers : int
+    noise_types : list
+    noise_levels : list
+    random_state : int
+    tracking_uri : str
+    experiment_name : str
+    model_cache_path : Path
 
 
-    
+@dataclass(frozen=True)
+class CheckpointEvaluationConfig:
+    """
+    Configuration class for the concurrent evaluation of many model artifacts.
 
+    Attributes:
+        root_dir (Path): Directory of the per-model evaluation reports and the leaderboard.
+        leaderboard_path (Path): Path to save the leaderboard (JSON; a Markdown table is written next to it).
+        test_data_path (Path): Path to the normalized clean testing images (memory-mapped by the workers).
+        x_test_noisy_path (Path): Path to the noisy testing images (memory-mapped by the workers).
+        model_patterns (list): Paths or glob patterns of the models evaluated by default.
+        max_workers (int): Size of the process pool (0 for one worker per CPU core).
+    """
+    root_dir: Path
+    leaderboard_path: Path
+    test_data_path: Path
+    x_test_noisy_path: Path
+    model_patterns: list
+    max_workers: int
 
 
+@dataclass(frozen=True)
+class InferenceBenchmarkConfig:
+    """
+    Configuration class for the inference speed benchmark.
 
+    Attributes:
+        report_path (Path): Path to save the benchmark report (next to the evaluation report).
+        model_path (Path): Model benchmarked (the exported fully-convolutional model).
+        tflite_model_path (Path): Path of the float32 TFLite conversion used by the "tflite" backend.
+        im_size (tuple): Training image size, at which every batch size is measured.
+        backends (list): Backends measured ("eager", "tf_function", "xla", "tflite").
+        batch_sizes (list): Batch sizes measured.
+        input_sizes (list): Square input sizes measured (fully-convolutional model only).
+        threads (list): CPU thread counts measured (0 = all cores).
+        max_pixels_per_call (int): Largest batch_size * height * width measured beyond batch size 1.
+        runs (int): Timed calls per case.
+        warmup (int): Untimed calls per case after the first (cold) one.
+    """
+    report_path: Path
+    model_path: Path
+    tflite_model_path: Path
+    im_size: tuple
+    backends: list
+    batch_sizes: list
+    input_sizes: list
+    threads: list
+    max_pixels_per_call: int
+    runs: int
+    warmup: int
 
 
-  
+@dataclass(frozen=True)
+class RegressionGateConfig:
+    """
+    Configuration class for the regression gate of a new model.
+
+    Attributes:
+        baseline_path (Path): Metrics of the last accepted model.
+        report_path (Path): Path to save the gate report (every comparison).
+        evaluation_report_path (Path): Evaluation report of the new model.
+        benchmark_report_path (Path): Inference benchmark report of the new model (optional).
+        update_baseline (bool): Make the metrics of a passing run the new baseline.
+        tolerances (dict): Allowed regressions: psnr_drop_db and ssim_drop (absolute),
+            mse_increase, latency_increase, throughput_decrease and model_size_increase (relative).
+    """
+    baseline_path: Path
+    report_path: Path
+    evaluation_report_path: Path
+    benchmark_report_path: Path
+    update_baseline: bool
+    tolerances: dict
 
 
-    
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Configuration class for the pipeline runner.
 
+    Attributes:
+        root_dir (Path): Directory of the pipeline run reports and of the variants' artifacts.
+        report_path (Path): Path to save the run report (wall time and memory of every stage).
+        max_workers (int): Stages and branches running at the same time (1 = sequential).
+        cpu_cores (int): CPU cores the run may use (0 = all).
+        memory_limit_mb (float): RAM budget of the run (0 = no limit).
+        variant_memory_mb (float): Estimated peak memory of a variant until one is measured.
+        variants (list): Extra branches trained and evaluated in their own process:
+            {"name", "architecture" (optional), "noise_factor" (optional)} dicts.
+    """
+    root_dir: Path
+    report_path: Path
+    max_workers: int
+    cpu_cores: int
+    memory_limit_mb: float
+    variant_memory_mb: float
+    variants: list
@@ -0,0 +1,39 @@
+import argparse
+from dataclasses import replace
+from src.config.configurtion import Configuration
+from src.components.batch_inference import BatchInference
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Batch Denoising"
+
+class BatchDenoisingPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self, input_dir: Path, output_dir: Path, batch_size: int = None, overwrite: bool = False):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        batch_inference_config = config.get_batch_inference_config()
+        if batch_size:
+            batch_inference_config = replace(batch_inference_config, batch_size=batch_size)
+        batch_inference = BatchInference(batch_inference_config, config.get_serving_config())
+        batch_inference.run(input_dir, output_dir, overwrite=overwrite)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Denoise every image of a folder with the trained model.")
+    parser.add_argument("--input-dir", type=Path, required=True, help="Folder of noisy images (searched recursively).")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Folder the denoised images are written to.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Overrides batch_inference.batch_size.")
+    parser.add_argument("--overwrite", action="store_true", help="Denoise images whose output already exists.")
+    args = parser.parse_args()
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = BatchDenoisingPipeline()
+        obj.main(args.input_dir, args.output_dir, args.batch_size, args.overwrite)
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,28 @@
+from src.config.configurtion import Configuration
+from src.components.distributed_training import DistributedTraining
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Distributed Training Scaling Benchmark"
+
+class DistributedTrainingBenchmarkPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        get_config_data = config.get_distributed_training_config()
+        distributed_training = DistributedTraining(get_config_data)
+        distributed_training.benchmark_scaling()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = DistributedTrainingBenchmarkPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
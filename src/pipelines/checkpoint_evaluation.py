@@ -0,0 +1,38 @@
+import argparse
+from dataclasses import replace
+from src.config.configurtion import Configuration
+from src.components.checkpoint_evaluation import CheckpointEvaluation
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Checkpoint Evaluation"
+
+class CheckpointEvaluationPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self, models: list = None, max_workers: int = None):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        checkpoint_evaluation_config = config.get_checkpoint_evaluation_config()
+        if max_workers is not None:
+            checkpoint_evaluation_config = replace(checkpoint_evaluation_config, max_workers=max_workers)
+        checkpoint_evaluation = CheckpointEvaluation(checkpoint_evaluation_config, config.get_model_evaluation_config())
+        checkpoint_evaluation.run(models)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Evaluate many model artifacts concurrently and rank them.")
+    parser.add_argument("--models", nargs="*", default=None,
+                        help="Model artifacts or glob patterns (default: checkpoint_evaluation.model_patterns).")
+    parser.add_argument("--max-workers", type=int, default=None, help="Overrides checkpoint_evaluation.max_workers.")
+    args = parser.parse_args()
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = CheckpointEvaluationPipeline()
+        obj.main(args.models, args.max_workers)
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,415 @@
+import os
+import json
+import math
+import argparse
+import time
+import multiprocessing as mp
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Callable
+import tensorflow as tf
+from src.config.configurtion import Configuration
+from src.components.data_ingestion import DataIngestion
+from src.components.data_preprocessing import DataPreprocessing, add_gaussian_noise
+from src.components.model_base import BaseModel
+from src.components.model_training import ModelTraining
+from src.components.model_callbacks import ModelCallback
+from src.components.distributed_training import DistributedTraining
+from src.components.model_evaluation import ModelEvaluation
+from src.utils.common import create_directories, memory_usage_mb, reset_peak_memory, save_json
+from src.utils.logger import logging
+STAGE_NAME  = "Denoising Pipeline"
+
+VARIANT_KEYS = ("name", "architecture", "noise_factor")
+
+
+def variant_worker(config_file_path: str, params_file_path: str, variant: dict, cores: list) -> dict:
+    """
+    Process entry point: train and evaluate one variant (see `DenoisingPipeline.run_variant`).
+
+    The process is pinned to `cores` and TensorFlow gets as many intra-op threads, before
+    any op creates its thread pools.
+    """
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    tf.config.threading.set_intra_op_parallelism_threads(len(cores) or (os.cpu_count() or 1))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    config = Configuration(Path(config_file_path), Path(params_file_path))
+    return DenoisingPipeline(config).run_variant(variant)
+
+
+@dataclass
+class Stage:
+    """
+    A node of the pipeline DAG.
+
+    Attributes:
+        name (str): Name of the stage (used by `--from` / `--to`).
+        run (Callable): Runs the stage; reads and writes the in-memory artifacts.
+        depends_on (tuple): Names of the stages whose artifacts it uses.
+        isolated (bool): Runs in its own spawned process; `run` is then a picklable function
+            of the CPU cores it may use, returning its report row.
+    """
+    name: str
+    run: Callable
+    depends_on: tuple = ()
+    isolated: bool = False
+
+
+class DenoisingPipeline:
+    """
+    Runs the pipeline stages as a DAG.
+
+    The five stages run in one process: TensorFlow is imported and the YAML files are
+    parsed once for the whole run, and the artifacts of a stage are handed to the next
+    ones in memory (datasets, base and trained models) instead of being read back from
+    their .npy / .keras files; every stage still saves its artifacts, so a later run can
+    start from any stage. An artifact produced by a stage that is not part of the run is
+    memory-mapped from its file (datasets) or loaded (models). Every artifact is dropped
+    once its last consumer has run.
+
+    Every variant (another architecture and/or noise factor) is a branch of its own,
+    trained and evaluated in a spawned process once the datasets are preprocessed.
+
+    A stage starts as soon as the stages it depends on are done, up to `max_workers` at
+    a time: independent stages of the main process (e.g. the base model and the data
+    preparation) run in threads, variants in their processes. The `cpu_cores` are split
+    between the main process and the variant processes: a variant is pinned to its share
+    with as many TensorFlow threads, and the main process is pinned to the cores no
+    running variant uses, i.e. all of them when no variant runs. With a `memory_limit_mb`,
+    a variant only starts if the main process, the running variants and itself fit in it
+    (a variant's peak is the largest one measured so far, `variant_memory_mb` until then).
+
+    The run report gives the start, wall time, resident memory at the end and peak
+    resident memory of every stage (for the main process, its peak while the stage ran).
+
+    Attributes:
+        config (Configuration): Configuration of the pipeline.
+    """
+
+    def __init__(self, config: Configuration) -> None:
+        self.config = config
+        self.pipeline_config = config.get_pipeline_config()
+        self.artifacts = {}
+        self.stages = [
+            Stage("data_ingestion", self.data_ingestion),
+            Stage("data_preprocessing", self.data_preprocessing, ("data_ingestion",)),
+            Stage("base_model", self.base_model),
+            Stage("training", self.training, ("data_preprocessing", "base_model")),
+            Stage("evaluation", self.evaluation, ("data_preprocessing", "training")),
+        ]
+        names = set()
+        for variant in self.pipeline_config.variants:
+            unknown = set(variant) - set(VARIANT_KEYS)
+            if "name" not in variant or unknown or variant["name"] in names:
+                raise ValueError(f"Invalid variant {variant}: a unique name is required, "
+                                 f"and only {VARIANT_KEYS} can be set.")
+            names.add(variant["name"])
+            self.stages.append(Stage(f"variant:{variant['name']}",
+                                     partial(variant_worker, str(config.config_file_path),
+                                             str(config.params_file_path), variant),
+                                     ("data_preprocessing",), isolated=True))
+
+    def data_ingestion(self) -> None:
+        train_images, test_images = DataIngestion(self.config.get_data_ingestion_config()).initiate_data_ingestion()
+        self.artifacts.update(train_images=train_images, test_images=test_images)
+
+    def data_preprocessing(self) -> None:
+        data_preprocessing = DataPreprocessing(self.config.get_data_preprocessing_config(),
+                                               train_data=self.artifacts.pop("train_images", None),
+                                               test_data=self.artifacts.pop("test_images", None))
+        self.artifacts.update(train_data=data_preprocessing.train_data, test_data=data_preprocessing.test_data,
+                              x_train_noisy=data_preprocessing.x_train_noisy,
+                              x_test_noisy=data_preprocessing.x_test_noisy)
+
+    def base_model(self) -> None:
+        model_base = BaseModel(self.config.get_base_model_config())
+        model_base.get_base_model()
+        model_base.update_base_model()
+        self.artifacts["base_model"] = model_base.model
+
+    def training(self) -> None:
+        distributed_config = self.config.get_distributed_training_config()
+        if distributed_config.num_workers > 1:
+            # The workers read the datasets and the base model from their files.
+            self.artifacts.pop("base_model", None)
+            DistributedTraining(distributed_config).launch()
+            return
+
+        # Memory-mapped files, replaced by the arrays already in memory.
+        training_config = replace(self.config.get_training_config(mmap_mode="r"), **{
+            key: self.artifacts[key] for key in ("train_data", "test_data", "x_train_noisy", "x_test_noisy")
+            if key in self.artifacts
+        })
+        model_training = ModelTraining(training_config)
+        if "base_model" in self.artifacts:
+            model_training.model = self.artifacts.pop("base_model")
+        else:
+            model_training.get_base_model()
+        callbacks_list = ModelCallback(self.config.get_callback_config())._get_callbacks()
+        model_training.train(callbacks_list)
+        model_training.export_inference_model()
+        self.artifacts.pop("train_data", None)
+        self.artifacts.pop("x_train_noisy", None)
+        self.artifacts["model"] = model_training.model
+
+    def evaluation(self) -> None:
+        evaluation_config = self.config.get_model_evaluation_config()
+        evaluation_config = replace(evaluation_config,
+                                    X_test=self.artifacts.pop("test_data", evaluation_config.X_test),
+                                    x_test_noisy=self.artifacts.pop("x_test_noisy", evaluation_config.x_test_noisy))
+        ModelEvaluation(evaluation_config).initiate_model_evaluation(model=self.artifacts.pop("model", None))
+
+    def run_variant(self, variant: dict) -> dict:
+        """
+        Build, train and evaluate one variant from the preprocessed datasets.
+
+        Its artifacts (base and trained models, reports, figures) are written under
+        `<root_dir>/variants/<name>`. A `noise_factor` variant gets noisy datasets of its own,
+        generated in memory from the clean ones. Training is single-process.
+
+        Returns:
+            dict: Report row: name, variant, seconds, MSE/PSNR/SSIM and memory of the process.
+        """
+        start = time.perf_counter()
+        root = Path(self.pipeline_config.root_dir) / "variants" / variant["name"]
+        create_directories([root])
+
+        base_model_config = self.config.get_base_model_config()
+        base_model_config = replace(base_model_config, root_dir=root,
+                                    architecture=variant.get("architecture", base_model_config.architecture),
+                                    base_model_path=root / "base_model.keras",
+                                    updated_base_model_path=root / "base_model.keras",
+                                    architecture_report_path=root / "architecture_report.json")
+        model_base = BaseModel(base_model_config)
+        model_base.get_base_model()
+        model_base.update_base_model()
+
+        training_config = self.config.get_training_config(mmap_mode="r")
+        if "noise_factor" in variant:
+            seed = int(self.config.params.random_state)
+            training_config = replace(
+                training_config,
+                x_train_noisy=add_gaussian_noise(training_config.train_data, float(variant["noise_factor"]), seed=seed),
+                x_test_noisy=add_gaussian_noise(training_config.test_data, float(variant["noise_factor"]), seed=seed + 1)
+            )
+        training_config = replace(training_config, root_dir=root, train_model_path=root / "model.keras",
+                                  updated_model_base_path=base_model_config.updated_base_model_path,
+                                  training_report_path=root / "training_report.json",
+                                  inference_model_path=root / "model_inference",
+                                  load_report_path=root / "load_report.json")
+        model_training = ModelTraining(training_config)
+        model_training.model = model_base.model
+        model_training.train(ModelCallback(self.config.get_callback_config())._get_callbacks())
+        model_training.export_inference_model()
+
+        # Own model cache: the main process and the other variants update theirs concurrently.
+        evaluation_config = replace(self.config.get_model_evaluation_config(), root_dir=root,
+                                    path_of_model=training_config.inference_model_path,
+                                    evaluation_report_path=root / "evaluation_report.json",
+                                    model_cache_path=root / "logged_models.json",
+                                    x_test_noisy=training_config.x_test_noisy)
+        ModelEvaluation(evaluation_config).initiate_model_evaluation(model=model_training.model)
+        report = json.loads(Path(evaluation_config.evaluation_report_path).read_text())
+        return {"name": f"variant:{variant['name']}", "variant": variant, "seconds": time.perf_counter() - start,
+                **{name: report[name] for name in ("mse", "psnr", "ssim")}, **memory_usage_mb()}
+
+    def order(self) -> list:
+        """The stages sorted so that every stage comes after the ones it depends on."""
+        stages = {stage.name: stage for stage in self.stages}
+        ordered, done = [], set()
+        while len(ordered) < len(stages):
+            ready = [stage for stage in self.stages if stage.name not in done and set(stage.depends_on) <= done]
+            if not ready:
+                raise ValueError(f"Cyclic stage dependencies: {sorted(set(stages) - done)}")
+            ordered.append(ready[0])
+            done.add(ready[0].name)
+        return ordered
+
+    def select(self, start: str = None, end: str = None) -> list:
+        """
+        Stages of a run: the ones from `start` to `end` (both included) in dependency order.
+
+        Args:
+            start (str, optional): First stage (default: the first one).
+            end (str, optional): Last stage (default: the last one).
+
+        Returns:
+            list: The selected `Stage`s.
+        """
+        names = [stage.name for stage in self.order()]
+        for name in (start, end):
+            if name is not None and name not in names:
+                raise ValueError(f"Unknown stage '{name}', expected one of {names}.")
+        first = names.index(start) if start is not None else 0
+        last = names.index(end) if end is not None else len(names) - 1
+        if first > last:
+            raise ValueError(f"Stage '{start}' comes after '{end}'.")
+        return self.order()[first:last + 1]
+
+    def usable_cores(self) -> list:
+        """The CPU cores of the run: the process' affinity, limited to `cpu_cores`."""
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+        return cores[:self.pipeline_config.cpu_cores] if self.pipeline_config.cpu_cores else cores
+
+    def core_groups(self, num_variants: int) -> list:
+        """
+        Split the usable CPU cores between the main process (first group) and the
+        variant processes running at the same time (one group each).
+        """
+        cores = self.usable_cores()
+        num_groups = 1 + min(num_variants, max(1, self.pipeline_config.max_workers) - 1)
+        size = max(1, len(cores) // num_groups)
+        # With fewer cores than groups, the groups share the cores.
+        return [cores[i * size:(i + 1) * size] or cores[-size:] for i in range(num_groups)]
+
+    @staticmethod
+    def pin_main_process(cores: list) -> None:
+        """
+        Pin every thread of the main process to `cores`.
+
+        On Linux the affinity is per thread, so the threads already started (TensorFlow's
+        pools included) are pinned one by one. Their number is not changed: TensorFlow's
+        thread pools cannot be resized once created.
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            return
+        tasks = [int(task) for task in os.listdir("/proc/self/task")] if os.path.isdir("/proc/self/task") else [0]
+        for task in tasks:
+            try:
+                os.sched_setaffinity(task, cores)
+            except ProcessLookupError:
+                pass  # The thread exited meanwhile.
+
+    def memory_fits(self, estimate_mb: float, running_variants: int) -> bool:
+        """
+        Whether one more variant fits in the memory budget (always when none is running;
+        never while one runs if the memory cannot be measured).
+        """
+        limit = self.pipeline_config.memory_limit_mb
+        if not limit or not running_variants:
+            return True
+        used = memory_usage_mb()["rss_mb"] + running_variants * estimate_mb
+        if math.isnan(used + estimate_mb):
+            return False
+        return used + estimate_mb <= limit
+
+    def run_stage(self, stage: Stage, run_start: float, alone: bool) -> dict:
+        """Run a stage of the main process and return its report row."""
+        if alone:
+            reset_peak_memory()
+        started = time.perf_counter()
+        stage.run()
+        return {"name": stage.name, "start": started - run_start, "seconds": time.perf_counter() - started,
+                **memory_usage_mb()}
+
+    def run(self, start: str = None, end: str = None) -> dict:
+        """
+        Run the selected stages and save the run report.
+
+        Returns:
+            dict: {"stages": [{"name", "start", "seconds", "rss_mb", "peak_rss_mb", ...}],
+            "cores", "seconds", "stage_seconds" (sum of the stages' times), "peak_rss_mb"
+            (largest peak of a stage)}.
+        """
+        stages = self.select(start, end)
+        selected = {stage.name for stage in stages}
+        max_workers = max(1, self.pipeline_config.max_workers)
+        cores = self.usable_cores()
+        groups = self.core_groups(sum(stage.isolated for stage in stages))
+        # With a single group, the variants share the cores of the main process (one at a time).
+        variant_groups = groups[1:] or groups[:1]
+        logging.info(f"Running stages: {[stage.name for stage in stages]} "
+                     f"({max_workers} at a time, cores {groups})")
+
+        report = {"stages": [], "cores": groups}
+        pending, running, done = list(stages), {}, set()
+        free_groups = list(range(len(variant_groups)))
+        variant_peaks = []
+        run_start = time.perf_counter()
+
+        def give_main_free_cores() -> None:
+            busy = {core for index, group in enumerate(variant_groups) if index not in free_groups for core in group}
+            self.pin_main_process([core for core in cores if core not in busy] or groups[0])
+
+        give_main_free_cores()
+        with ThreadPoolExecutor(max_workers=max_workers) as threads, \
+                ProcessPoolExecutor(max_workers=len(variant_groups), mp_context=mp.get_context("spawn"),
+                                    max_tasks_per_child=1) as processes:
+            while pending or running:
+                for stage in list(pending):
+                    if len(running) >= max_workers:
+                        break
+                    if not all(name in done for name in stage.depends_on if name in selected):
+                        continue
+                    if stage.isolated:
+                        estimate = max(variant_peaks) if variant_peaks else self.pipeline_config.variant_memory_mb
+                        running_variants = sum(other.isolated for other, _, _ in running.values())
+                        if not free_groups or not self.memory_fits(estimate, running_variants):
+                            continue
+                        group = free_groups.pop(0)
+                        give_main_free_cores()
+                        future = processes.submit(stage.run, cores=variant_groups[group])
+                    else:
+                        group = None
+                        alone = not any(not other.isolated for other, _, _ in running.values())
+                        future = threads.submit(self.run_stage, stage, run_start, alone)
+                    running[future] = (stage, group, time.perf_counter())
+                    pending.remove(stage)
+                    logging.info(f" >>>> stage {stage.name} <<<< started !")
+                if not running:
+                    raise RuntimeError(f"No stage can start: {[stage.name for stage in pending]}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, group, submitted = running.pop(future)
+                    row = future.result()
+                    if stage.isolated:
+                        row.update(start=submitted - run_start, cores=variant_groups[group])
+                        free_groups.append(group)
+                        give_main_free_cores()
+                        variant_peaks.append(row["peak_rss_mb"])
+                    report["stages"].append(row)
+                    done.add(stage.name)
+                    logging.info(f" >>>> stage {stage.name} <<<< Completed in {row['seconds']:.1f}s "
+                                 f"(RSS {row['rss_mb']:.0f} MB, peak {row['peak_rss_mb']:.0f} MB)")
+
+        report["seconds"] = time.perf_counter() - run_start
+        report["stage_seconds"] = sum(row["seconds"] for row in report["stages"])
+        report["peak_rss_mb"] = max((row["peak_rss_mb"] for row in report["stages"]), default=0.0)
+        save_json(path=Path(self.pipeline_config.report_path), data=report)
+        logging.info(f"Pipeline completed in {report['seconds']:.1f}s "
+                     f"({report['stage_seconds']:.1f}s of stages).")
+        return report
+
+
+class DenoisingPipelineRunner:
+    def __init__(self) -> None:
+        pass
+
+    def main(self, start: str = None, end: str = None):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        pipeline = DenoisingPipeline(config)
+        pipeline.run(start, end)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run the denoising pipeline stages as a DAG.")
+    parser.add_argument("--from", dest="start", default=None,
+                        help="First stage to run (default: data_ingestion).")
+    parser.add_argument("--to", dest="end", default=None,
+                        help="Last stage to run (default: the last variant, or evaluation).")
+    args = parser.parse_args()
+
+    try:
+        logging.info(f" >>>> {STAGE_NAME} <<<< started !")
+        obj = DenoisingPipelineRunner()
+        obj.main(args.start, args.end)
+        logging.info(f" >>>> {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
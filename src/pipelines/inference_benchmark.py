@@ -0,0 +1,27 @@
+from src.config.configurtion import Configuration
+from src.components.inference_benchmark import InferenceBenchmark
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Inference Benchmark"
+
+class InferenceBenchmarkPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        inference_benchmark = InferenceBenchmark(config.get_inference_benchmark_config())
+        inference_benchmark.run()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = InferenceBenchmarkPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,30 @@
+from src.config.configurtion import Configuration
+from src.components.model_distillation import ModelDistillation
+from src.components.model_callbacks import ModelCallback
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Knowledge Distillation Stage"
+
+class DistillationPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        model_distillation = ModelDistillation(config.get_distillation_config(), config.get_training_config(mmap_mode="r"))
+        model_callbacks = ModelCallback(config.get_callback_config())
+        callbacks_list = model_callbacks._get_callbacks()
+        model_distillation.run(callbacks_list)
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = DistillationPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,28 @@
+from src.config.configurtion import Configuration
+from src.components.hyperparameter_search import HyperparameterSearch
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Hyperparameter Search Stage"
+
+class HyperparameterSearchPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        get_config_data = config.get_hyperparameter_search_config()
+        hyperparameter_search = HyperparameterSearch(get_config_data)
+        hyperparameter_search.run()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = HyperparameterSearchPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -1,6 +1,7 @@
 from src.config.configurtion import Configuration
 from src.components.model_training import ModelTraining
 from src.components.model_callbacks import ModelCallback
+from src.components.distributed_training import DistributedTraining
 from src.utils.logger import logging
 from pathlib import Path
 STAGE_NAME  = " Model Training Stage"
@@ -12,12 +13,19 @@ class ModelTrainingPipeline:
     def main(self):
 
         config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        distributed_config = config.get_distributed_training_config()
+        if distributed_config.num_workers > 1:
+            # Workers read the datasets themselves (memory-mapped), nothing is loaded here.
+            DistributedTraining(distributed_config).launch()
+            return
+
         get_config_data = config.get_training_config()
         model_training= ModelTraining(get_config_data)
-        model_callbacks=ModelCallback()
+        model_callbacks=ModelCallback(config.get_callback_config())
         callbacks_list=model_callbacks._get_callbacks()
         model_training.get_base_model()
         model_training.train(callbacks_list)
+        model_training.export_inference_model()
         
 if __name__ == "__main__":
     
@@ -0,0 +1,32 @@
+from src.config.configurtion import Configuration
+from src.components.model_export import ModelExport
+from src.components.model_quantization import ModelQuantization
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Model Export Stage"
+
+class ModelExportPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        get_config_data = config.get_model_export_config()
+        model_export = ModelExport(get_config_data)
+        model_export.export()
+        model_quantization = ModelQuantization(config.get_quantization_config())
+        model_quantization.quantize()
+        model_quantization.benchmark()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = ModelExportPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,28 @@
+from src.config.configurtion import Configuration
+from src.components.model_pruning import ModelPruning
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Model Pruning Stage"
+
+class ModelPruningPipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        get_config_data = config.get_pruning_config()
+        model_pruning = ModelPruning(get_config_data)
+        model_pruning.run()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = ModelPruningPipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,27 @@
+from src.config.configurtion import Configuration
+from src.components.regression_gate import RegressionGate
+from src.utils.logger import logging
+from pathlib import Path
+STAGE_NAME  = "Regression Gate Stage"
+
+class RegressionGatePipeline:
+    def __init__(self) -> None:
+        pass
+
+    def main(self):
+
+        config = Configuration(Path("config\config.yaml"),Path("params.yaml"))
+        regression_gate = RegressionGate(config.get_regression_gate_config())
+        regression_gate.run()
+
+if __name__ == "__main__":
+
+    try:
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< started !")
+        obj = RegressionGatePipeline()
+        obj.main()
+        logging.info(f" >>>> stage {STAGE_NAME} <<<< Completed ! \n\n x==================x")
+
+    except Exception as e:
+        logging.exception(e)
+        raise e
@@ -0,0 +1,78 @@
+from contextlib import asynccontextmanager
+from pathlib import Path
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from src.config.configurtion import Configuration
+from src.components.model_serving import DenoisingService
+from src.serving.batching import DynamicBatcher
+from src.utils.logger import logging
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up the model once, before the first request is accepted."""
+    config = Configuration(Path("config\config.yaml"), Path("params.yaml")).get_serving_config()
+    service = DenoisingService(config)
+    service.load()
+    app.state.service = service
+    app.state.batcher = None
+    if config.max_batch_size > 1:
+        app.state.batcher = DynamicBatcher(service.predict, config.max_batch_size, config.max_wait_ms)
+        await app.state.batcher.start()
+    logging.info(f"Denoising service ready (model {config.model_path}, input {service.input_size}).")
+    yield
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+
+
+app = FastAPI(title="Image Denoising API", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.post("/denoise")
+async def denoise(request: Request) -> Response:
+    """
+    Denoise an uploaded image.
+
+    The request body is the raw encoded image (e.g. `curl --data-binary @noisy.png`);
+    the response is the denoised image as PNG, at the size of the upload. Decoding,
+    inference and encoding run in the thread pool so that the event loop keeps accepting
+    requests meanwhile; with dynamic batching, concurrent requests share one model call.
+    """
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty request body, expected an encoded image.")
+    service = request.app.state.service
+    batcher = request.app.state.batcher
+    try:
+        if batcher is None:
+            content = await run_in_threadpool(service.denoise_bytes, data)
+        else:
+            image = await run_in_threadpool(service.decode_image, data)
+            if service.is_tiled(image):
+                # Large images already run as batches of tiles.
+                content = await run_in_threadpool(lambda: service.encode_image(service.denoise(image)))
+            else:
+                model_input = await run_in_threadpool(service.preprocess, image)
+                output = await batcher.submit(model_input)
+                content = await run_in_threadpool(service.finish, output, image.shape)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=content, media_type="image/png")
+
+
+@app.get("/metrics")
+async def metrics(request: Request) -> dict:
+    """Dynamic batching metrics (batch-size histogram, queueing delay)."""
+    batcher = request.app.state.batcher
+    return batcher.metrics() if batcher is not None else {"dynamic_batching": False}
+
+
+if __name__ == "__main__":
+    serving_config = Configuration(Path("config\config.yaml"), Path("params.yaml")).get_serving_config()
+    uvicorn.run(app, host=serving_config.host, port=serving_config.port)
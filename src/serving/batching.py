@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.utils.logger import logging
+
+
+class DynamicBatcher:
+    """
+    Group concurrent inference requests into batched model calls.
+
+    Requests are queued by `submit`; a single background task takes the first waiting
+    request, then keeps collecting until `max_batch_size` requests are gathered or
+    `max_wait_ms` have elapsed since that first request, stacks them into one batch, runs
+    `predict_fn` on it in a dedicated thread (so the event loop keeps accepting requests)
+    and scatters the outputs back to the callers. Requests arriving while a batch is
+    running wait in the queue and form the next batch.
+
+    Inputs of different shapes (native-resolution images with a fully-convolutional
+    model) are split into one model call per shape.
+
+    Attributes:
+        predict_fn: Callable mapping an (N, H, W, C) float32 batch to the outputs.
+        max_batch_size (int): Largest batch sent to the model.
+        max_wait_ms (float): Longest time the first request of a batch waits for others.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int, max_wait_ms: float, history_size: int = 10000) -> None:
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = None
+        self.worker = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batcher")
+        self.batch_sizes = Counter()
+        self.queue_delays = deque(maxlen=history_size)
+        self.batch_latencies = deque(maxlen=history_size)
+        self.num_requests = 0
+
+    async def start(self) -> None:
+        """Start the batching task (must be called from the serving event loop)."""
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self._run())
+        logging.info(f"Dynamic batching started (max_batch_size={self.max_batch_size}, "
+                     f"max_wait_ms={self.max_wait * 1000:.1f}).")
+
+    async def stop(self) -> None:
+        """Cancel the batching task and shut down its thread."""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, item: np.ndarray) -> np.ndarray:
+        """
+        Queue one input and wait for its output.
+
+        Args:
+            item (np.ndarray): One model input, without the batch dimension.
+
+        Returns:
+            np.ndarray: The model output for `item`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for a first request, then gather more until the batch is full or the wait expires."""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        while len(batch) < self.max_batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (client disconnect) are dropped before running the model.
+            batch = [entry for entry in batch if not entry[1].cancelled()]
+            if not batch:
+                continue
+
+            groups = {}
+            for entry in batch:
+                groups.setdefault(entry[0].shape, []).append(entry)
+            for group in groups.values():
+                await self._predict_group(loop, group)
+
+    async def _predict_group(self, loop, batch: list) -> None:
+        """Run one model call on same-shape requests and resolve their futures."""
+        start = time.perf_counter()
+        self.batch_sizes[len(batch)] += 1
+        self.num_requests += len(batch)
+        self.queue_delays.extend(start - enqueued for _, _, enqueued in batch)
+        try:
+            outputs = await loop.run_in_executor(
+                self.executor, self.predict_fn, np.stack([item for item, _, _ in batch])
+            )
+        except Exception as e:
+            logging.error(f"Batched inference failed for {len(batch)} requests: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batch_latencies.append(time.perf_counter() - start)
+
+        for (_, future, _), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    def metrics(self) -> dict:
+        """
+        Batching metrics since startup.
+
+        Returns:
+            dict: Batch-size histogram, mean batch size, and queueing-delay and batch
+            inference latency percentiles (ms) over the most recent requests/batches.
+        """
+        def summary(values) -> dict:
+            if not values:
+                return {}
+            values_ms = np.asarray(values) * 1000.0
+            return {"mean": float(values_ms.mean()), "p50": float(np.percentile(values_ms, 50)),
+                    "p99": float(np.percentile(values_ms, 99)), "max": float(values_ms.max())}
+
+        num_batches = sum(self.batch_sizes.values())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "requests": self.num_requests,
+            "batches": num_batches,
+            "mean_batch_size": self.num_requests / num_batches if num_batches else 0.0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "queue_delay_ms": summary(self.queue_delays),
+            "batch_latency_ms": summary(self.batch_latencies),
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+        }
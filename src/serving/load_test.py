@@ -0,0 +1,126 @@
+"""
+Local load test of the denoising API.
+
+Sends the same image `--requests` times with `--concurrency` concurrent clients and
+reports the latency percentiles and the throughput:
+
+    python -m src.serving.load_test --image noisy.png --requests 200 --concurrency 8
+
+The client only needs the standard library, PyYAML (for the configured report path) and
+the repo's logger: it never imports TensorFlow, so the measurement does not depend on
+(or compete for the GIL with) it.
+"""
+import argparse
+import json
+import time
+import http.client
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import yaml
+from src.utils.logger import logging
+
+
+CONFIG_FILE_PATH = Path("config\config.yaml")
+
+
+def percentile(values: list, q: float) -> float:
+    """Percentile `q` (0-100) of `values`, linearly interpolated."""
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def send_request(url: str, data: bytes, content_type: str, timeout: float) -> tuple:
+    """POST one image and return (latency in ms, success); transport errors count as failures."""
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": content_type}, method="POST")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (OSError, http.client.HTTPException) as e:
+        # URLError/HTTPError, timeouts and dropped connections (ConnectionResetError) are OSErrors.
+        logging.error(f"Request failed: {e}")
+        ok = False
+    return (time.perf_counter() - start) * 1000.0, ok
+
+
+def run_load_test(url: str, data: bytes, num_requests: int, concurrency: int,
+                  content_type: str = "image/png", warmup: int = 5, timeout: float = 60.0) -> dict:
+    """
+    Run the load test and return its report.
+
+    Args:
+        url (str): URL of the /denoise endpoint.
+        data (bytes): Encoded image sent in every request.
+        num_requests (int): Number of measured requests.
+        concurrency (int): Number of concurrent clients.
+        content_type (str): Content-Type of the requests.
+        warmup (int): Requests sent (sequentially, unmeasured) before the test.
+        timeout (float): Per-request timeout in seconds.
+
+    Returns:
+        dict: Latency percentiles (ms), throughput (requests/s) and error count.
+    """
+    for _ in range(warmup):
+        send_request(url, data, content_type, timeout)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: send_request(url, data, content_type, timeout), range(num_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, ok in results if ok]
+    return {
+        "url": url,
+        "requests": num_requests,
+        "concurrency": concurrency,
+        "payload_bytes": len(data),
+        "errors": sum(1 for _, ok in results if not ok),
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else float("nan"),
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else float("nan"),
+        },
+    }
+
+
+def configured_report_path() -> Path:
+    """`serving.load_test_report_path` of config.yaml (read directly: the client does not import TensorFlow)."""
+    with open(CONFIG_FILE_PATH) as f:
+        return Path(yaml.safe_load(f)["serving"]["load_test_report_path"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of the denoising API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/denoise")
+    parser.add_argument("--image", required=True, type=Path, help="Encoded image sent in every request.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Report path (default: serving.load_test_report_path of config.yaml).")
+    args = parser.parse_args()
+    output = args.output or configured_report_path()
+
+    content_type = "image/jpeg" if args.image.suffix.lower() in (".jpg", ".jpeg") else "image/png"
+    report = run_load_test(args.url, args.image.read_bytes(), args.requests, args.concurrency,
+                           content_type=content_type, warmup=args.warmup)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    logging.info(f"Load test: p50 {report['latency_ms']['p50']:.1f} ms, p99 {report['latency_ms']['p99']:.1f} ms, "
+                 f"{report['throughput_rps']:.1f} req/s, {report['errors']} errors. Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
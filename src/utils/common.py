@@ -4,6 +4,9 @@ import yaml
 import sys
 import os
 import json
+import math
+import time
+import hashlib
 import tensorflow as tf
 from tensorflow.keras.models import Model
 import numpy as np
@@ -135,12 +138,14 @@ def read_data(path_list: list, im_size: tuple) -> tuple:
 
 
 @ensure_annotations
-def read_numpy_file(file_path: Path) -> np.ndarray:
+def read_numpy_file(file_path: Path, mmap_mode=None) -> np.ndarray:
     """
     Reads a .npy file and returns the numpy array.
 
     Args:
         file_path (Path): Path to the .npy file.
+        mmap_mode (str, optional): If set (e.g. "r"), the array is memory-mapped
+            instead of being read into memory.
 
     Returns:
         np.ndarray: Data loaded from the .npy file.
@@ -149,7 +154,7 @@ def read_numpy_file(file_path: Path) -> np.ndarray:
         CustomException: If any error occurs during file loading.
     """
     try:
-        data = np.load(file_path) 
+        data = np.load(file_path, mmap_mode=mmap_mode)
         logging.info(f"File loaded successfully from {file_path}")
         return data
     except Exception as e:
@@ -157,15 +162,303 @@ def read_numpy_file(file_path: Path) -> np.ndarray:
         raise CustomException(e, sys)
 
 @ensure_annotations
-def load_model(path: Path ) -> tf.keras.Model :
-                    """
-                    Charge le modèle à partir du chemin spécifié dans la configuration.
-                    """
-                    try:
-                        logging.info(f"Loading model from {path}")
-                        model = tf.keras.models.load_model(path)
-                        logging.info("Model loaded successfully.")
-                        return model
-                    except Exception as e:
-                        logging.error(f"Failed to load the model: {e}")
-                        raise CustomException(e, sys)
+def save_json(path: Path, data: dict):
+    """
+    Saves a dictionary as a JSON file.
+
+    Args:
+        path (Path): Path of the JSON file.
+        data (dict): Data to be saved.
+
+    Raises:
+        CustomException: If the file cannot be written.
+    """
+    try:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+        logging.info(f"JSON file saved at {path}")
+    except Exception as e:
+        logging.error(f"An error occurred while saving the JSON file: {path}")
+        raise CustomException(e, sys)
+
+def memory_usage_mb() -> dict:
+    """
+    Current and peak resident memory of this process, in MB.
+
+    Read from /proc/self/status (VmRSS / VmHWM) where available: unlike `ru_maxrss`, the
+    peak there is not inherited from the parent process, so measurements taken in spawned
+    worker processes are their own. Elsewhere the current RSS comes from psutil and the
+    peak from psutil on Windows (peak working set) or from `ru_maxrss` (in bytes on macOS,
+    in KB on the other Unix systems). A value that cannot be measured is NaN.
+
+    Returns:
+        dict: {"rss_mb": current RSS, "peak_rss_mb": peak RSS}.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return {"rss_mb": int(fields["VmRSS"].split()[0]) / 1024.0,
+                "peak_rss_mb": int(fields["VmHWM"].split()[0]) / 1024.0}
+    except (OSError, KeyError, ValueError):
+        pass
+    rss = peak = float("nan")
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        rss = info.rss / 2 ** 20
+        if hasattr(info, "peak_wset"):
+            peak = info.peak_wset / 2 ** 20
+    except ImportError:
+        pass
+    if math.isnan(peak):
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2 ** 20 if sys.platform == "darwin" else 1024.0)
+        except ImportError:
+            pass
+    return {"rss_mb": peak if math.isnan(rss) else rss, "peak_rss_mb": peak}
+
+
+def reset_peak_memory() -> bool:
+    """
+    Reset the peak resident memory of this process to its current RSS, so that the next
+    `memory_usage_mb` peak is the one of the work done in between (Linux only, through
+    /proc/self/clear_refs).
+
+    Returns:
+        bool: Whether the peak was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+@ensure_annotations
+def load_model(path: Path, compile: bool = True) -> tf.keras.Model:
+    """
+    Loads a model, either a .keras file or an inference artifact (see `save_inference_model`).
+
+    Args:
+        path (Path): Path of the .keras file or of the inference artifact directory.
+        compile (bool): Restore the optimizer and loss of a .keras file. Inference-only
+            callers should pass False: deserializing the optimizer state of a trained model
+            is most of its load time. Inference artifacts are always uncompiled.
+
+    Returns:
+        tf.keras.Model: The loaded model.
+    """
+    try:
+        logging.info(f"Loading model from {path}")
+        start = time.perf_counter()
+        if Path(path).is_dir():
+            model = load_inference_model(Path(path))
+        else:
+            model = tf.keras.models.load_model(path, compile=compile)
+        logging.info(f"Model loaded successfully in {time.perf_counter() - start:.2f}s.")
+        return model
+    except Exception as e:
+        logging.error(f"Failed to load the model: {e}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def save_inference_model(model: tf.keras.Model, path: Path):
+    """
+    Saves a lean inference artifact: the architecture and the weights only.
+
+    The artifact is a directory holding `architecture.json` (the Keras model config and
+    the shape of every weight) and `weights.npy` (all the weights, flattened and
+    concatenated), without optimizer state nor compile configuration. A single .npy file
+    can be memory-mapped at load time, so the weights are paged in from the page cache
+    rather than read into an intermediate buffer.
+
+    Args:
+        model (tf.keras.Model): Model to save.
+        path (Path): Directory of the artifact.
+    """
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+        weights = model.get_weights()
+        architecture = {
+            "model": json.loads(model.to_json()),
+            "weights": [{"shape": list(w.shape), "dtype": str(w.dtype)} for w in weights],
+        }
+        with open(path / "architecture.json", "w") as f:
+            json.dump(architecture, f)
+        flat = np.concatenate([np.asarray(w, dtype=np.float32).ravel() for w in weights]) if weights \
+            else np.zeros(0, dtype=np.float32)
+        np.save(path / "weights.npy", flat)
+        logging.info(f"Inference model saved at {path} ({flat.nbytes / 2 ** 20:.2f} MB of weights).")
+    except Exception as e:
+        logging.error(f"Failed to save the inference model: {e}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def load_inference_model(path: Path, mmap_mode="r") -> tf.keras.Model:
+    """
+    Loads an inference artifact written by `save_inference_model`.
+
+    Args:
+        path (Path): Directory of the artifact.
+        mmap_mode (str, optional): Memory-map the weights file ("r", default) or read it
+            (None).
+
+    Returns:
+        tf.keras.Model: Uncompiled model.
+    """
+    try:
+        with open(path / "architecture.json") as f:
+            architecture = json.load(f)
+        model = tf.keras.models.model_from_json(json.dumps(architecture["model"]))
+        flat = np.load(path / "weights.npy", mmap_mode=mmap_mode)
+        weights, offset = [], 0
+        for spec in architecture["weights"]:
+            size = int(np.prod(spec["shape"]))
+            weights.append(np.asarray(flat[offset:offset + size], dtype=spec["dtype"]).reshape(spec["shape"]))
+            offset += size
+        model.set_weights(weights)
+        return model
+    except Exception as e:
+        logging.error(f"Failed to load the inference model: {e}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def weights_hash(model: tf.keras.Model) -> str:
+    """
+    SHA-256 of the shapes and values of a model's weights.
+
+    It identifies the trained model independently of its file format: the inference
+    artifact and the fully-convolutional export of the same model have the same hash.
+
+    Args:
+        model (tf.keras.Model): Model to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    for weight in model.get_weights():
+        weight = np.ascontiguousarray(weight, dtype=np.float32)
+        digest.update(str(weight.shape).encode())
+        digest.update(weight.tobytes())
+    return digest.hexdigest()
+
+
+@ensure_annotations
+def estimate_flops(model: tf.keras.Model) -> int:
+    """
+    Estimates the floating-point operations of one forward pass on a single image.
+
+    Counts the multiply-adds (2 FLOPs each) of the convolution and dense layers, which
+    dominate the cost of the denoising models; activations, additions and resizes are
+    ignored. The model must have a fixed input size.
+
+    Args:
+        model (tf.keras.Model): Model with a fixed input shape.
+
+    Returns:
+        int: Estimated FLOPs per image.
+
+    Raises:
+        CustomException: If the model has a variable input size.
+    """
+    try:
+        flops = 0
+        for layer in model.layers:
+            if not hasattr(layer, "kernel_size") and not isinstance(layer, tf.keras.layers.Dense):
+                continue
+            input_shape, output_shape = tuple(layer.input.shape), tuple(layer.output.shape)
+            if None in input_shape[1:] or None in output_shape[1:]:
+                raise ValueError(f"Layer {layer.name} has a variable input size, FLOPs cannot be estimated.")
+            if isinstance(layer, tf.keras.layers.Dense):
+                flops += 2 * int(np.prod(input_shape[1:])) * layer.units
+                continue
+            kernel_area = int(np.prod(layer.kernel_size))
+            in_channels, out_channels = input_shape[-1], output_shape[-1]
+            out_pixels = int(np.prod(output_shape[1:3]))
+            if isinstance(layer, tf.keras.layers.SeparableConv2D):
+                flops += 2 * out_pixels * in_channels * layer.depth_multiplier * (kernel_area + out_channels)
+            elif isinstance(layer, tf.keras.layers.DepthwiseConv2D):
+                flops += 2 * out_pixels * in_channels * layer.depth_multiplier * kernel_area
+            elif isinstance(layer, tf.keras.layers.Conv2DTranspose):
+                # Every input pixel is multiplied by the whole kernel.
+                flops += 2 * int(np.prod(input_shape[1:3])) * kernel_area * in_channels * out_channels
+            else:
+                flops += 2 * out_pixels * kernel_area * in_channels * out_channels
+        return int(flops)
+    except Exception as e:
+        logging.error(f"An error occurred while estimating the FLOPs: {e}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def measure_latency(model: tf.keras.Model, input_shape: tuple, batch_size: int = 1, runs: int = 20, warmup: int = 3) -> dict:
+    """
+    Measures the inference latency of a model on random inputs.
+
+    The forward pass is wrapped in a `tf.function` (the serving path) and warmed up
+    before timing.
+
+    Args:
+        model (tf.keras.Model): Model to time.
+        input_shape (tuple): Input shape without the batch dimension.
+        batch_size (int): Number of images per call.
+        runs (int): Number of timed calls.
+        warmup (int): Number of untimed calls before timing.
+
+    Returns:
+        dict: Mean, median and 99th percentile latency per call, in milliseconds.
+    """
+    try:
+        forward = tf.function(lambda x: model(x, training=False))
+        batch = tf.random.uniform((batch_size,) + tuple(input_shape))
+        for _ in range(warmup):
+            forward(batch).numpy()
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            forward(batch).numpy()
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        return {"mean": float(np.mean(latencies)), "p50": float(np.percentile(latencies, 50)),
+                "p99": float(np.percentile(latencies, 99))}
+    except Exception as e:
+        logging.error(f"An error occurred while measuring the latency: {e}")
+        raise CustomException(e, sys)
+
+
+def measure_model(model: tf.keras.Model, x_test: np.ndarray, y_test: np.ndarray, input_shape: tuple,
+                  batch_size: int = 32, latency_runs: int = 20) -> dict:
+    """
+    Measures the cost and quality of a model: parameters, FLOPs, latency and test MSE.
+
+    Args:
+        model (tf.keras.Model): Model to measure.
+        x_test (np.ndarray): Noisy test images (can be memory-mapped, read batch by batch).
+        y_test (np.ndarray): Clean test images.
+        input_shape (tuple): Input shape of the latency measurement, without the batch dimension.
+        batch_size (int): Number of images per prediction of the MSE.
+        latency_runs (int): Number of timed calls of the latency (batch of 1).
+
+    Returns:
+        dict: {"params", "flops", "latency_ms" (see `measure_latency`), "mse"}.
+    """
+    try:
+        squared_error = 0.0
+        for start in range(0, len(x_test), batch_size):
+            batch = slice(start, start + batch_size)
+            prediction = model(np.asarray(x_test[batch], dtype=np.float32), training=False).numpy()
+            squared_error += float(np.sum((prediction - np.asarray(y_test[batch], dtype=np.float32)) ** 2))
+        return {
+            "params": int(model.count_params()),
+            "flops": estimate_flops(model),
+            "latency_ms": measure_latency(model, tuple(input_shape), runs=latency_runs),
+            "mse": squared_error / float(np.prod(y_test.shape)),
+        }
+    except Exception as e:
+        logging.error(f"An error occurred while measuring the model: {e}")
+        raise CustomException(e, sys)
@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+from src.utils.logger import logging
+from src.utils.exception import CustomException
+
+
+# Per-request limits of the MLflow log_batch API.
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+
+
+def set_tracking_store(tracking_uri: str, experiment_name: str) -> None:
+    """
+    Point MLflow at a tracking store and experiment.
+
+    Recent MLflow versions refuse the `file:` backend unless explicitly allowed; the
+    pipeline deliberately uses a local file store so that it works offline.
+    """
+    if tracking_uri.startswith("file:"):
+        os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(experiment_name)
+
+
+def content_hash(path: Path) -> str:
+    """SHA-256 of a file, or of the relative paths and contents of a directory's files."""
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        digest.update(str(file.relative_to(path) if path.is_dir() else file.name).encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BufferedMlflowLogger:
+    """
+    Non-blocking MLflow logging for one run.
+
+    Params and metrics are buffered and sent with `log_batch` (one request per
+    `MAX_*_PER_BATCH` values) when the run is flushed or closed, instead of one request
+    each. Artifacts are uploaded by a background thread, so the caller only waits for them
+    when the run is closed. A model artifact whose content hash was already logged to the
+    experiment is not uploaded again: the run gets its hash and a tag pointing at the run
+    holding it (hashes are cached in `model_cache_path`).
+
+    With a `file:` tracking URI (the default of the pipeline) everything stays local and
+    works offline.
+
+    Usage:
+        with BufferedMlflowLogger(uri, experiment, cache_path) as tracker:
+            tracker.log_params({...}); tracker.log_artifact(path)
+
+    Attributes:
+        tracking_uri (str): MLflow tracking URI.
+        experiment_name (str): MLflow experiment of the run.
+        model_cache_path (Path): JSON file mapping logged model hashes to their run.
+        upload_workers (int): Threads uploading the artifacts.
+    """
+
+    def __init__(self, tracking_uri: str, experiment_name: str, model_cache_path: Path, upload_workers: int = 2) -> None:
+        self.tracking_uri = tracking_uri
+        self.experiment_name = experiment_name
+        self.model_cache_path = Path(model_cache_path)
+        self.upload_workers = upload_workers
+        self.client = None
+        self.run_id = None
+        self._params = {}
+        self._metrics = []
+        self._uploads = []
+        self._tags = []
+        self._pending_models = []
+        self._executor = None
+
+    def __enter__(self):
+        return self.start_run()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(status="FAILED" if exc_type else "FINISHED")
+        return False
+
+    def start_run(self, run_name: str = None):
+        """Create the run (without making it the active fluent-API run) and the upload thread."""
+        try:
+            set_tracking_store(self.tracking_uri, self.experiment_name)
+            self.client = MlflowClient(tracking_uri=self.tracking_uri)
+            experiment = self.client.get_experiment_by_name(self.experiment_name)
+            self.run_id = self.client.create_run(experiment.experiment_id, run_name=run_name).info.run_id
+            self._executor = ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="mlflow-upload")
+            logging.info(f"MLflow run {self.run_id} started in experiment '{self.experiment_name}' ({self.tracking_uri}).")
+            return self
+        except Exception as e:
+            logging.error(f"Failed to start the MLflow run: {e}")
+            raise CustomException(e, sys)
+
+    def log_param(self, key: str, value) -> None:
+        self._params[key] = str(value)
+
+    def log_params(self, params: dict) -> None:
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def log_metric(self, key: str, value: float, step: int = 0) -> None:
+        self._metrics.append(Metric(key, float(value), int(time.time() * 1000), step))
+
+    def log_metrics(self, metrics: dict, step: int = 0) -> None:
+        for key, value in metrics.items():
+            self.log_metric(key, value, step)
+
+    def set_tag(self, key: str, value) -> None:
+        self._tags.append((f"tag {key}", self._executor.submit(self.client.set_tag, self.run_id, key, str(value))))
+
+    def log_artifact(self, path, artifact_path: str = None) -> None:
+        """Upload a file or a directory's content in the background."""
+        path = Path(path)
+        upload = self.client.log_artifacts if path.is_dir() else self.client.log_artifact
+        self._uploads.append((str(path), self._executor.submit(upload, self.run_id, str(path), artifact_path)))
+
+    def log_model(self, model_path: Path, artifact_path: str = "model") -> bool:
+        """
+        Upload a saved model (file or artifact directory) unless the same content was
+        already logged to the experiment, by a run that still holds it (the local cache
+        can outlive deleted runs or a wiped tracking store).
+
+        Returns:
+            bool: Whether the model is uploaded by this run.
+        """
+        model_hash = content_hash(Path(model_path))
+        cache = json.loads(self.model_cache_path.read_text()) if self.model_cache_path.exists() else {}
+        key = f"{self.tracking_uri}|{self.experiment_name}|{model_hash}"
+        self.log_param("model_hash", model_hash)
+        if key in cache and self._holds_artifact(cache[key], artifact_path):
+            self.set_tag("model_logged_in_run", cache[key])
+            logging.info(f"Model {model_path} unchanged (hash {model_hash[:12]}), logged in run {cache[key]}: not uploaded.")
+            return False
+        if key in cache:
+            logging.info(f"Run {cache[key]} no longer holds model {model_hash[:12]}: uploading it again.")
+        self.log_artifact(model_path, artifact_path=artifact_path)
+        # Recorded once the upload succeeded (see `close`).
+        self._pending_models.append(key)
+        return True
+
+    def _holds_artifact(self, run_id: str, artifact_path: str) -> bool:
+        """Whether a cached run still exists (not deleted) and holds `artifact_path`."""
+        try:
+            if self.client.get_run(run_id).info.lifecycle_stage != "active":
+                return False
+            return bool(self.client.list_artifacts(run_id, artifact_path))
+        except MlflowException:
+            return False
+
+    def _record_models(self) -> None:
+        """Add the uploaded model hashes to the cache."""
+        cache = json.loads(self.model_cache_path.read_text()) if self.model_cache_path.exists() else {}
+        cache.update({key: self.run_id for key in self._pending_models})
+        self.model_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_cache_path.write_text(json.dumps(cache, indent=4))
+        self._pending_models = []
+
+    def flush(self) -> None:
+        """Send the buffered params and metrics with `log_batch`."""
+        params = [Param(key, value) for key, value in self._params.items()]
+        metrics, self._params, self._metrics = self._metrics, {}, []
+        while params or metrics:
+            self.client.log_batch(self.run_id, metrics=metrics[:MAX_METRICS_PER_BATCH], params=params[:MAX_PARAMS_PER_BATCH])
+            metrics, params = metrics[MAX_METRICS_PER_BATCH:], params[MAX_PARAMS_PER_BATCH:]
+
+    def close(self, status: str = "FINISHED") -> None:
+        """
+        Flush, wait for the uploads and tags and terminate the run.
+
+        Raises:
+            CustomException: If an upload or a tag failed (the run is terminated as FAILED
+            first), or the run cannot be closed.
+        """
+        if self.run_id is None:
+            return
+        try:
+            self.flush()
+            self._executor.shutdown(wait=True)
+            failed = []
+            for name, request in self._uploads + self._tags:
+                try:
+                    request.result()
+                except Exception as e:
+                    logging.error(f"Failed to send {name} to MLflow: {e}")
+                    failed.append(name)
+            if failed:
+                status = "FAILED"
+            if status == "FINISHED" and self._pending_models:
+                self._record_models()
+            self.client.set_terminated(self.run_id, status=status)
+            logging.info(f"MLflow run {self.run_id} {status.lower()} ({len(self._uploads)} artifacts).")
+            if failed:
+                raise RuntimeError(f"{len(failed)} MLflow request(s) of run {self.run_id} failed: {failed}")
+        except Exception as e:
+            logging.error(f"Failed to close the MLflow run: {e}")
+            raise CustomException(e, sys)
+        finally:
+            self.run_id = None
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+import pytest
+from src.components.regression_gate import RegressionGate
+from src.entity.config_entity import RegressionGateConfig
+
+
+TOLERANCES = {
+    "psnr_drop_db": 0.1,
+    "ssim_drop": 0.005,
+    "mse_increase": 0.05,
+    "latency_increase": 0.15,
+    "throughput_decrease": 0.15,
+    "model_size_increase": 0.05,
+}
+LATENCY = "latency_ms/xla/tall/b1/64x64"
+THROUGHPUT = "images_per_second/xla/tall/b1/64x64"
+
+
+@pytest.fixture
+def gate(tmp_path: Path) -> RegressionGate:
+    return RegressionGate(RegressionGateConfig(
+        baseline_path=tmp_path / "baseline.json",
+        report_path=tmp_path / "report.json",
+        evaluation_report_path=tmp_path / "evaluation.json",
+        benchmark_report_path=tmp_path / "benchmark.json",
+        update_baseline=True,
+        tolerances=TOLERANCES,
+    ))
+
+
+def check(gate: RegressionGate, metric: str, baseline: float, current: float) -> dict:
+    return gate.compare({metric: baseline}, {metric: current})[0]
+
+
+@pytest.mark.parametrize("metric, baseline, current, change", [
+    ("psnr", 30.0, 29.95, 0.05),                   # absolute drop
+    ("psnr", 30.0, 31.0, -1.0),                    # improvement
+    ("ssim", 0.90, 0.89, 0.01),
+    ("mse", 0.010, 0.0104, 0.04),                  # relative increase
+    ("mse", 0.010, 0.008, -0.2),
+    (LATENCY, 10.0, 12.0, 0.2),
+    (THROUGHPUT, 100.0, 80.0, 0.2),                # relative decrease
+    (THROUGHPUT, 100.0, 120.0, -0.2),
+    ("model_size_mb", 4.0, 4.0, 0.0),
+])
+def test_change_is_positive_for_a_regression(gate, metric, baseline, current, change):
+    assert check(gate, metric, baseline, current)["change"] == pytest.approx(change)
+
+
+@pytest.mark.parametrize("metric, baseline, current, passed", [
+    ("psnr", 30.0, 29.95, True),
+    ("psnr", 30.0, 29.8, False),
+    ("ssim", 0.90, 0.89, False),
+    ("mse", 0.010, 0.0104, True),
+    ("mse", 0.010, 0.0106, False),
+    (LATENCY, 10.0, 11.0, True),
+    (LATENCY, 10.0, 12.0, False),
+    (THROUGHPUT, 100.0, 90.0, True),
+    (THROUGHPUT, 100.0, 80.0, False),
+    ("model_size_mb", 4.0, 4.4, False),
+])
+def test_tolerances(gate, metric, baseline, current, passed):
+    result = check(gate, metric, baseline, current)
+    assert result["passed"] is passed
+    assert result["status"] == ("passed" if passed else "regressed")
+
+
+@pytest.mark.parametrize("metric, current, passed", [
+    ("mse", 0.01, False),
+    ("mse", 0.0, True),
+    (THROUGHPUT, 10.0, True),
+])
+def test_relative_change_of_a_zero_baseline(gate, metric, current, passed):
+    result = check(gate, metric, 0.0, current)
+    assert result["kind"] == "absolute"
+    assert result["passed"] is passed
+
+
+def test_missing_metric_fails(gate):
+    checks = gate.compare({"psnr": 30.0, LATENCY: 10.0}, {"psnr": 30.0})
+    missing = [c for c in checks if c["metric"] == LATENCY][0]
+    assert missing["status"] == "missing"
+    assert missing["passed"] is False
+
+
+def test_new_metric_is_not_compared(gate):
+    assert [c["metric"] for c in gate.compare({"psnr": 30.0}, {"psnr": 30.0, LATENCY: 10.0})] == ["psnr"]
+
+
+def test_a_passing_run_becomes_the_baseline(gate):
+    gate.config.evaluation_report_path.write_text(json.dumps({"psnr": 30.0, "mse": 0.010}))
+    gate.run()
+    gate.config.evaluation_report_path.write_text(json.dumps({"psnr": 29.95, "mse": 0.009}))
+    assert gate.run()["status"] == "passed"
+    assert json.loads(gate.config.baseline_path.read_text()) == {"psnr": 29.95, "mse": 0.009}